@@ -0,0 +1,93 @@
+"""
+Benchmark: small-call latency while a large tool result is decoded.
+
+Simulates one session receiving a multi-megabyte result (JSON text or a
+base-64 image) while other sessions on the same event-loop keep issuing
+small calls, and reports the small calls' latency with decoding inline vs.
+offloaded to a thread or process pool (only base-64 payloads ever use the
+process pool, so JSON "process" numbers match "thread").
+
+    uv run python benchmarks/decode_offload.py --size-mb 20
+"""
+
+import argparse
+import asyncio
+import base64
+import json
+import os
+import statistics
+import time
+
+from mcp import types
+
+from llm_mcp.utils import configure_offload, convert_content_async
+
+SMALL = types.TextContent(type="text", text='{"ok": true}')
+
+MODES = {
+    "inline": {"thread_bytes": 1 << 62, "process_bytes": 0},
+    "thread": {"thread_bytes": 256 * 1024, "process_bytes": 0},
+    "process": {"thread_bytes": 256 * 1024, "process_bytes": 1},
+}
+
+
+async def _small_calls(stop: asyncio.Event) -> list[float]:
+    """Issue small calls back to back, recording each one's latency."""
+    latencies = []
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)  # stand-in for a fast server round trip
+        await convert_content_async(SMALL)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def _run(large) -> tuple[list[float], float]:
+    stop = asyncio.Event()
+    ticker = asyncio.create_task(_small_calls(stop))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    await convert_content_async(large)
+    decode = time.perf_counter() - start
+
+    await asyncio.sleep(0.05)
+    stop.set()
+    return await ticker, decode
+
+
+def _report(label: str, latencies: list[float], decode: float) -> None:
+    ms = sorted(x * 1000 for x in latencies)
+    p99 = ms[round(0.99 * (len(ms) - 1))]
+    print(
+        f"  {label:<8} large decode {decode * 1000:7.1f} ms | small calls: "
+        f"n={len(ms):5d} median {statistics.median(ms):6.2f} ms "
+        f"p99 {p99:7.2f} ms max {ms[-1]:7.2f} ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size-mb", type=float, default=20)
+    args = parser.parse_args()
+    size = int(args.size_mb * 1024 * 1024)
+
+    records = [{"id": i, "value": "x" * 10} for i in range(size // 24)]
+    payloads = {
+        "JSON text": types.TextContent(type="text", text=json.dumps(records)),
+        "base-64 image": types.ImageContent(
+            type="image",
+            data=base64.b64encode(os.urandom(size)).decode(),
+            mimeType="image/png",
+        ),
+    }
+
+    for name, large in payloads.items():
+        print(f"{name} ({args.size_mb:g} MiB)")
+        for label, options in MODES.items():
+            configure_offload(**options)
+            _report(label, *asyncio.run(_run(large)))
+
+
+if __name__ == "__main__":
+    main()
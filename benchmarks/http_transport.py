@@ -0,0 +1,130 @@
+"""
+Benchmark: HTTP/1.1 vs HTTP/2 and compression for remote MCP servers.
+
+Starts a local stand-in streamable HTTP server (hypercorn when installed,
+which also speaks HTTP/2, otherwise uvicorn) whose ``rows`` tool returns
+``--rows`` JSON records, then makes ``--calls`` tool calls with
+``--concurrency`` in flight through llm-mcp's HTTP transport for each
+client configuration.  Point ``--url`` at a real server (exposing a
+``rows`` tool) to measure across an actual network instead.
+
+    uv run python benchmarks/http_transport.py --rows 5000 --calls 200
+"""
+
+import argparse
+import asyncio
+import contextlib
+import socket
+import subprocess
+import sys
+import time
+
+from llm_mcp.schema import RemoteServerParameters
+from llm_mcp.transport import http
+
+CONFIGS = {
+    "http/1.1": {"headers": {"Accept-Encoding": "identity"}},
+    "http/1.1 gzip": {"compression": "gzip"},
+    "http/2": {"http2": True, "headers": {"Accept-Encoding": "identity"}},
+    "http/2 gzip": {"http2": True, "compression": "gzip"},
+}
+
+
+def serve(port: int) -> None:
+    from mcp.server.fastmcp import FastMCP
+    from starlette.middleware.gzip import GZipMiddleware
+
+    server = FastMCP("bench", json_response=True, log_level="WARNING")
+
+    @server.tool()
+    def rows(n: int) -> list[dict]:
+        return [
+            {"id": i, "name": f"record {i}", "tags": ["alpha", "beta"]}
+            for i in range(n)
+        ]
+
+    app = GZipMiddleware(server.streamable_http_app(), minimum_size=1024)
+    try:
+        import hypercorn.asyncio
+        from hypercorn.config import Config
+
+        config = Config()
+        config.bind = [f"127.0.0.1:{port}"]
+        config.loglevel = "WARNING"
+        asyncio.run(hypercorn.asyncio.serve(app, config))
+    except ImportError:
+        import uvicorn
+
+        uvicorn.run(app, host="127.0.0.1", port=port, log_level="warning")
+
+
+async def measure(
+    url: str, config: dict, rows: int, calls: int, concurrency: int
+) -> float:
+    params = RemoteServerParameters(url=url, **config)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            result = await http.call_tool(params, "rows", {"n": rows})
+            assert len(result) == rows
+
+    await one()  # warm-up: connect once before timing
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(calls)))
+    return time.perf_counter() - start
+
+
+@contextlib.contextmanager
+def stand_in_server():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(  # noqa: S603
+        [sys.executable, __file__, "--serve", str(port)]
+    )
+    try:
+        for _ in range(100):
+            with (
+                contextlib.suppress(OSError),
+                socket.create_connection(("127.0.0.1", port), timeout=0.1),
+            ):
+                break
+            time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}/mcp/"
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", help="server to measure (default: local)")
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--calls", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(args.serve)
+        return
+
+    with (
+        contextlib.nullcontext(args.url) if args.url else stand_in_server()
+    ) as url:
+        print(
+            f"{args.calls} calls of {args.rows} rows, "
+            f"{args.concurrency} concurrent"
+        )
+        for label, config in CONFIGS.items():
+            elapsed = asyncio.run(
+                measure(url, config, args.rows, args.calls, args.concurrency)
+            )
+            print(
+                f"  {label:<14} {elapsed:7.2f} s  "
+                f"{args.calls / elapsed:8.1f} calls/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
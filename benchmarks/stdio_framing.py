@@ -0,0 +1,91 @@
+"""
+Benchmark: receiving large JSON-RPC messages over stdio.
+
+Spawns a child process that answers every request line with a JSON-RPC
+response of a given size and measures how long the upstream
+``stdio_client`` and llm-mcp's ``buffered_stdio_client`` take to deliver
+it as a parsed message.
+
+    uv run python benchmarks/stdio_framing.py --sizes 1KB 1MB 50MB
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from mcp import types
+from mcp.client.stdio import StdioServerParameters, stdio_client
+from mcp.shared.message import SessionMessage
+
+from llm_mcp.transport.stdio_framing import buffered_stdio_client
+
+CLIENTS = {"upstream": stdio_client, "buffered": buffered_stdio_client}
+
+# answers each request line with a response carrying `size` bytes of data
+CHILD = """
+import json, sys
+size = int(sys.argv[1])
+for line in sys.stdin:
+    request = json.loads(line)
+    payload = {"jsonrpc": "2.0", "id": request["id"],
+               "result": {"data": "x" * size}}
+    sys.stdout.write(json.dumps(payload) + "\\n")
+    sys.stdout.flush()
+"""
+
+UNITS = {"KB": 1024, "MB": 1024 * 1024}
+
+
+def _parse_size(text: str) -> int:
+    for unit, factor in UNITS.items():
+        if text.upper().endswith(unit):
+            return int(float(text[: -len(unit)]) * factor)
+    return int(text)
+
+
+async def _measure(client, size: int, repeat: int) -> list[float]:
+    params = StdioServerParameters(
+        command=sys.executable, args=["-c", CHILD, str(size)]
+    )
+    timings = []
+    async with client(params) as (read, write):
+        for i in range(repeat):
+            request = types.JSONRPCMessage(
+                types.JSONRPCRequest(jsonrpc="2.0", id=i, method="bench")
+            )
+            start = time.perf_counter()
+            await write.send(SessionMessage(request))
+            message = await read.receive()
+            timings.append(time.perf_counter() - start)
+            if isinstance(message, Exception):
+                raise message
+    return timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", nargs="+", default=["1KB", "1MB", "50MB"])
+    parser.add_argument(
+        "--repeat", type=int, default=0, help="messages per size (auto)"
+    )
+    args = parser.parse_args()
+
+    for text in args.sizes:
+        size = _parse_size(text)
+        repeat = args.repeat or max(1, min(200, (20 << 20) // size))
+        print(f"{text} responses (n={repeat})")
+        for label, client in CLIENTS.items():
+            ms = [
+                t * 1000 for t in asyncio.run(_measure(client, size, repeat))
+            ]
+            print(
+                f"  {label:<9} median {statistics.median(ms):9.2f} ms "
+                f"max {max(ms):9.2f} ms  "
+                f"{size * len(ms) / (sum(ms) / 1000) / 2**20:9.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
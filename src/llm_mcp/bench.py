@@ -0,0 +1,249 @@
+"""
+Client-side load generator behind ``llm mcp bench``.
+
+:pyfunc:`run_bench` drives one tool of a registered server through the
+same transport code (:pyfunc:`llm_mcp.transport.dispatch.call_tool`) the
+``llm`` tools use, in one of two modes:
+
+* **closed loop** (default) - ``concurrency`` workers each issue the next
+  call as soon as the previous one returns;
+* **open loop** (``rate``) - calls start on a fixed schedule of ``rate``
+  calls per second, whether or not earlier calls have finished.  Latency
+  is measured from the *scheduled* start, so a server that falls behind
+  shows up as growing latency instead of silently lowering the rate.
+
+Arguments come from one or more templates that are used round-robin; the
+placeholder ``$i`` in any string is replaced by the call number.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from string import Template
+from typing import Any
+
+from .schema import ServerConfig
+from .transport import connections, dispatch
+
+CallTool = Callable[[ServerConfig, str, Mapping[str, Any]], Awaitable[Any]]
+
+PERCENTILES = (50, 90, 99)
+
+
+@dataclass
+class BenchResult:
+    """Outcome of one :pyfunc:`run_bench` run."""
+
+    server: str
+    tool: str
+    concurrency: int | None
+    rate: float | None
+    elapsed: float = 0.0
+    latencies: list[float] = field(default_factory=list)
+    errors: Counter[str] = field(default_factory=Counter)
+    connections: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def calls(self) -> int:
+        return len(self.latencies) + self.errors.total()
+
+    @property
+    def throughput(self) -> float:
+        """Successful calls per second."""
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+    def latency_ms(self) -> dict[str, float]:
+        """Percentiles, mean and max of successful calls in ms."""
+        data = sorted(self.latencies)
+        stats = {f"p{p}": _ms(percentile(data, p)) for p in PERCENTILES}
+        stats["mean"] = _ms(sum(data) / len(data) if data else 0.0)
+        stats["max"] = _ms(data[-1] if data else 0.0)
+        return stats
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "server": self.server,
+            "tool": self.tool,
+            "concurrency": self.concurrency,
+            "rate": self.rate,
+            "elapsed": round(self.elapsed, 3),
+            "calls": self.calls,
+            "ok": len(self.latencies),
+            "throughput": round(self.throughput, 3),
+            "latency_ms": self.latency_ms(),
+            "errors": dict(self.errors.most_common()),
+            **self.connections,
+        }
+
+
+async def run_bench(
+    config: ServerConfig,
+    tool_name: str,
+    argument_sets: Iterable[Mapping[str, Any]] = (),
+    *,
+    concurrency: int | None = None,
+    rate: float | None = None,
+    duration: float = 10.0,
+    max_calls: int | None = None,
+    call: CallTool = dispatch.call_tool,
+) -> BenchResult:
+    """Call *tool_name* for *duration* seconds and measure the outcome.
+
+    Args:
+        config: Registered server to benchmark.
+        tool_name: Tool to call.
+        argument_sets: Argument templates, used round-robin.
+        concurrency: Workers (closed loop) or the cap on calls in flight
+            (open loop, unlimited by default).
+        rate: Target calls per second; selects the open-loop mode.
+        duration: Seconds during which new calls are started.
+        max_calls: Stop starting new calls after this many.
+        call: Coroutine function performing one call.
+    """
+    templates = list(argument_sets) or [{}]
+    if concurrency is not None and concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    if rate is not None and rate <= 0:
+        raise ValueError("rate must be positive")
+    if rate is None and concurrency is None:
+        concurrency = 1
+
+    result = BenchResult(config.name, tool_name, concurrency, rate)
+    numbers = (
+        itertools.count() if max_calls is None else iter(range(max_calls))
+    )
+    before = connections.snapshot()
+    connections.reset_peaks()
+
+    async def one(index: int, started: float) -> None:
+        arguments = render_arguments(templates[index % len(templates)], index)
+        try:
+            await call(config, tool_name, arguments)
+        except Exception as exc:
+            result.errors[_error_key(exc)] += 1
+        else:
+            result.latencies.append(time.perf_counter() - started)
+
+    start = time.perf_counter()
+    deadline = start + duration
+    if rate is None:
+        await _closed_loop(one, numbers, deadline, concurrency or 1)
+    else:
+        await _open_loop(one, numbers, start, deadline, rate, concurrency)
+    result.elapsed = time.perf_counter() - start
+    result.connections = _connection_usage(before, connections.snapshot())
+    return result
+
+
+def render_arguments(template: Any, index: int) -> Any:
+    """Substitute ``$i`` in every string of *template* with *index*.
+
+    A string that is exactly ``"$i"`` becomes the integer itself.
+    """
+    if isinstance(template, str):
+        if template == "$i":
+            return index
+        return Template(template).safe_substitute(i=index)
+    if isinstance(template, Mapping):
+        return {k: render_arguments(v, index) for k, v in template.items()}
+    if isinstance(template, list):
+        return [render_arguments(v, index) for v in template]
+    return template
+
+
+def load_argument_sets(lines: Iterable[str]) -> list[dict[str, Any]]:
+    """Parse JSONL argument sets, skipping blank lines."""
+    sets = []
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        value = json.loads(line)
+        if not isinstance(value, dict):
+            raise TypeError(f"line {number}: expected a JSON object")
+        sets.append(value)
+    return sets
+
+
+def percentile(data: list[float], p: float) -> float:
+    """Nearest-rank percentile of already *sorted* data."""
+    if not data:
+        return 0.0
+    return data[min(len(data) - 1, round(p / 100 * (len(data) - 1)))]
+
+
+# private functions
+
+
+async def _closed_loop(
+    one: Callable[[int, float], Awaitable[None]],
+    numbers: Iterable[int],
+    deadline: float,
+    workers: int,
+) -> None:
+    iterator = iter(numbers)
+
+    async def worker() -> None:
+        for index in iterator:
+            if time.perf_counter() >= deadline:
+                return
+            await one(index, time.perf_counter())
+
+    await asyncio.gather(*[worker() for _ in range(workers)])
+
+
+async def _open_loop(
+    one: Callable[[int, float], Awaitable[None]],
+    numbers: Iterable[int],
+    start: float,
+    deadline: float,
+    rate: float,
+    limit: int | None,
+) -> None:
+    gate = asyncio.Semaphore(limit) if limit else None
+    tasks: set[asyncio.Task[None]] = set()
+
+    async def gated(index: int, scheduled: float) -> None:
+        if gate is None:
+            return await one(index, scheduled)
+        async with gate:
+            return await one(index, scheduled)
+
+    for index in numbers:
+        scheduled = start + index / rate
+        if scheduled >= deadline:
+            break
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+        task = asyncio.create_task(gated(index, scheduled))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+
+
+def _connection_usage(
+    before: dict[str, Any], after: dict[str, Any]
+) -> dict[str, Any]:
+    return {
+        kind: {
+            "opened": after[kind]["opened"] - before[kind]["opened"],
+            "peak": after[kind]["peak"],
+        }
+        for kind in after
+    }
+
+
+def _error_key(exc: BaseException) -> str:
+    message = str(exc).strip().splitlines()
+    text = f"{type(exc).__name__}: {message[0]}" if message else ""
+    return (text or type(exc).__name__)[:120]
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
@@ -0,0 +1,163 @@
+"""
+Stdio server published over streamable HTTP, behind ``llm mcp bridge``.
+
+A registered stdio server only serves the machine it runs on.  The bridge
+publishes its tools, under their own names, at a streamable HTTP endpoint
+so other machines can register it as a remote server and share it:
+
+* calls are spread over a :class:`SessionPool` of up to ``size`` server
+  processes - each call takes the least busy session, and a new process
+  is started only while every open one is busy;
+* a session whose transport fails, which stopped answering after a
+  cancelled call, or whose process outgrew its ``recycle_rss_mb`` is
+  closed and replaced on demand;
+* the server's rate limits and scheduler apply as for ``llm mcp serve``,
+  with each HTTP client session taking turns as its own caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Mapping
+from contextlib import asynccontextmanager
+from typing import Any
+
+from mcp import types
+from mcp.shared.exceptions import McpError
+
+from .schema import ServerConfig, StdioServerParameters
+from .serve import Aggregator
+from .transport import cancellation
+from .transport.pool import PooledSession
+
+logger = logging.getLogger(__name__)
+
+
+class SessionPool:
+    """Up to *size* sessions to one server, handed to the least busy call."""
+
+    def __init__(self, config: ServerConfig, size: int = 4):
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        self.config = config
+        self.size = size
+        self.calls = 0
+        self._sessions: list[PooledSession] = []
+        self._busy: dict[PooledSession, int] = {}
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[PooledSession]:
+        """Borrow a session for one call, opening one if all are busy."""
+        pooled = await self._acquire()
+        self.calls += 1
+        try:
+            yield pooled
+        except McpError:
+            raise
+        except Exception:
+            await self._drop(pooled)
+            raise
+        finally:
+            self._release(pooled)
+
+    async def call_tool(
+        self, name: str, arguments: Mapping[str, Any] | None = None
+    ) -> types.CallToolResult:
+        async with self.session() as pooled:
+            return await cancellation.call_tool(
+                pooled.session, name, dict(arguments or {})
+            )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "sessions": len(self._sessions),
+            "in_flight": sum(self._busy.values()),
+            "calls": self.calls,
+        }
+
+    async def aclose(self) -> None:
+        sessions = list(self._busy)
+        self._sessions.clear()
+        self._busy.clear()
+        await asyncio.gather(*(pooled.close() for pooled in sessions))
+
+    def _pick(self) -> PooledSession:
+        for pooled in list(self._sessions):
+            if pooled.closed or pooled.recycle_due:
+                if pooled.recycle_due:
+                    logger.info("recycling a session to %r", self.config.name)
+                self._sessions.remove(pooled)
+                self._retire(pooled)
+        idle = min(self._sessions, key=self._busy.__getitem__, default=None)
+        if idle is not None and (
+            self._busy[idle] == 0 or len(self._sessions) >= self.size
+        ):
+            return idle
+        pooled = PooledSession(self.config)
+        pooled.start()
+        self._sessions.append(pooled)
+        self._busy[pooled] = 0
+        return pooled
+
+    async def _acquire(self) -> PooledSession:
+        while True:
+            pooled = self._pick()
+            self._busy[pooled] += 1
+            try:
+                await pooled.ready()
+                if await pooled.responsive():
+                    return pooled
+            except Exception:
+                await self._drop(pooled)
+                raise
+            except BaseException:
+                self._release(pooled)
+                raise
+            logger.info("replacing a session to %r", self.config.name)
+            await self._drop(pooled)
+
+    def _release(self, pooled: PooledSession) -> None:
+        if pooled in self._busy:
+            self._busy[pooled] -= 1
+            if pooled not in self._sessions:
+                self._retire(pooled)
+
+    async def _drop(self, pooled: PooledSession) -> None:
+        if pooled in self._sessions:
+            self._sessions.remove(pooled)
+        self._busy.pop(pooled, None)
+        await pooled.close()
+
+    def _retire(self, pooled: PooledSession) -> None:
+        """Close a session taken out of rotation once its calls are done."""
+        if self._busy.get(pooled):
+            return
+        self._busy.pop(pooled, None)
+        task = asyncio.ensure_future(pooled.close())
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+
+class Bridge(Aggregator):
+    """Publish one stdio server's tools with a pool of its processes."""
+
+    def __init__(self, config: ServerConfig, *, size: int = 4):
+        if not isinstance(config.parameters, StdioServerParameters):
+            raise TypeError(f"{config.name!r} is not a stdio server")
+        super().__init__([config.name], namespaced=False)
+        self.pool = SessionPool(config, size)
+
+    async def forward(
+        self, config: ServerConfig, tool_name: str, arguments: dict[str, Any]
+    ) -> types.CallToolResult:
+        return await self.pool.call_tool(tool_name, arguments)
+
+    async def aclose(self) -> None:
+        await self.pool.aclose()
+
+
+# private functions
+
+# keeps the close tasks of recycled sessions alive until they are done
+_closing: set[asyncio.Future[None]] = set()
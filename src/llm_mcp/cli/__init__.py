@@ -1,8 +1,20 @@
 # ruff: noqa: I001
 from .main import mcp
+from . import bench
+from . import bridge
+from . import journal
+from . import monitor
+from . import replay
+from . import serve
 from . import servers
 
 __all__ = [
+    "bench",
+    "bridge",
+    "journal",
     "mcp",
+    "monitor",
+    "replay",
+    "serve",
     "servers",
 ]
@@ -0,0 +1,128 @@
+import asyncio
+import json
+from typing import TextIO
+
+import click
+
+from llm_mcp import bench as load
+from llm_mcp import store
+
+from . import mcp
+
+
+@mcp.command(name="bench")
+@click.argument("server")
+@click.argument("tool")
+@click.option(
+    "--args",
+    "templates",
+    multiple=True,
+    help="JSON arguments (repeatable); $i is replaced by the call number.",
+)
+@click.option(
+    "--args-file",
+    type=click.File("r"),
+    default=None,
+    help="JSONL file with one argument set per line.",
+)
+@click.option(
+    "-c",
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Parallel workers, or max calls in flight with --rate.",
+)
+@click.option(
+    "-r",
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=None,
+    help="Start this many calls per second (open loop).",
+)
+@click.option(
+    "-d",
+    "--duration",
+    type=click.FloatRange(min=0, min_open=True),
+    default=10.0,
+    show_default=True,
+    help="Seconds during which new calls are started.",
+)
+@click.option(
+    "-n",
+    "--requests",
+    "max_calls",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Stop after this many calls.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Output raw JSON.")
+def bench(
+    server: str,
+    tool: str,
+    templates: tuple[str, ...],
+    args_file: TextIO | None,
+    concurrency: int | None,
+    rate: float | None,
+    duration: float,
+    max_calls: int | None,
+    as_json: bool,
+):
+    """Load-test TOOL of the registered SERVER and report the results."""
+    cfg = store.load_server(server)
+    if cfg is None:
+        raise click.ClickException(f"Server {server!r} does not exist")
+    try:
+        cfg.get_tool(tool)
+    except ValueError as e:
+        raise click.ClickException(str(e)) from e
+
+    try:
+        argument_sets = load.load_argument_sets(templates)
+        if args_file is not None:
+            argument_sets += load.load_argument_sets(args_file)
+    except (TypeError, ValueError) as e:
+        raise click.ClickException(f"Invalid arguments: {e}") from e
+
+    result = asyncio.run(
+        load.run_bench(
+            cfg,
+            tool,
+            argument_sets,
+            concurrency=concurrency,
+            rate=rate,
+            duration=duration,
+            max_calls=max_calls,
+        )
+    )
+
+    if as_json:
+        click.echo(json.dumps(result.as_dict(), indent=2))
+    else:
+        _print_result(result)
+
+
+def _print_result(result: load.BenchResult) -> None:
+    mode = (
+        f"{result.rate:g} calls/s"
+        if result.rate is not None
+        else f"concurrency {result.concurrency}"
+    )
+    click.secho(
+        f"{result.server}.{result.tool}: {result.calls} calls in "
+        f"{result.elapsed:.2f}s ({mode})",
+        bold=True,
+    )
+    click.secho(
+        f"  throughput   {result.throughput:.1f} calls/s "
+        f"({len(result.latencies)} ok, {result.errors.total()} errors)"
+    )
+    latency = "  ".join(f"{k} {v:.1f}" for k, v in result.latency_ms().items())
+    click.secho(f"  latency ms   {latency}")
+    for kind, usage in result.connections.items():
+        click.secho(
+            f"  {kind:<12} {usage['opened']} opened, peak {usage['peak']}"
+        )
+    if result.errors:
+        click.secho("  errors", fg="red")
+    for key, count in result.errors.most_common():
+        click.secho(f"    {count:>6}  {key}", fg="red")
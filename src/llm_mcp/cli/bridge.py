@@ -0,0 +1,44 @@
+import click
+
+from llm_mcp import bridge as stdio_bridge
+from llm_mcp import serve, store
+from llm_mcp.schema import StdioServerParameters
+
+from . import mcp
+
+
+@mcp.command(name="bridge")
+@click.argument("name")
+@click.option(
+    "--host",
+    default="127.0.0.1",
+    show_default=True,
+    help="Interface to listen on (0.0.0.0 for other machines).",
+)
+@click.option("--port", type=int, default=8000, show_default=True)
+@click.option(
+    "--sessions",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="Maximum number of server processes calls are spread over.",
+)
+def bridge(name: str, host: str, port: int, sessions: int):
+    """Serve stdio server NAME over streamable HTTP.
+
+    Other machines can then register it as a remote server with
+    `llm mcp servers add http://HOST:PORT/mcp`.
+    """
+    cfg = store.load_server(name)
+    if cfg is None:
+        raise click.ClickException(f"Server {name!r} does not exist")
+    if not isinstance(cfg.parameters, StdioServerParameters):
+        raise click.ClickException(f"Server {name!r} is not a stdio server")
+
+    aggregator = stdio_bridge.Bridge(cfg, size=sessions)
+    click.secho(
+        f"Bridging {name!r} ({len(aggregator.tools())} tools, up to "
+        f"{sessions} processes) at http://{host}:{port}/mcp",
+        err=True,
+    )
+    serve.serve_http(aggregator, host=host, port=port)
@@ -0,0 +1,76 @@
+import json
+import time
+from pathlib import Path
+
+import click
+
+from llm_mcp import journal as call_journal
+
+from . import mcp
+
+
+@mcp.group()
+def journal():
+    """Analyse the journal of tool calls (enabled by LLM_MCP_JOURNAL)."""
+
+
+@journal.command(name="stats")
+@click.argument(
+    "path",
+    required=False,
+    type=click.Path(dir_okay=False, path_type=Path),
+)
+@click.option(
+    "--since",
+    type=float,
+    default=None,
+    help="Only count calls of the last N hours.",
+)
+@click.option("--json", "as_json", is_flag=True, help="Output raw JSON.")
+def stats(path: Path | None, since: float | None, as_json: bool):
+    """Show calls, errors, payload sizes and latency per server and tool.
+
+    PATH defaults to the journal selected by LLM_MCP_JOURNAL; rotated
+    files next to it are included.
+    """
+    path = path or call_journal.journal_path()
+    start = time.time() - since * 3600 if since is not None else None
+    totals = call_journal.stats(path, since=start)
+    rows = sorted(totals.items(), key=lambda item: -item[1].calls)
+    if as_json:
+        data = [
+            {"server": server, "tool": tool, **tool_stats.as_dict()}
+            for (server, tool), tool_stats in rows
+        ]
+        click.echo(json.dumps(data, indent=2))
+        return
+    if not rows:
+        click.secho(f"No journaled calls in {path}.")
+        return
+
+    click.secho(
+        f"{'calls':>8} {'errors':>7} {'args':>9} {'results':>9} "
+        f"{'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}  tool",
+        bold=True,
+    )
+    for (server, tool), tool_stats in rows:
+        click.secho(
+            f"{tool_stats.calls:>8} {tool_stats.errors:>7} "
+            f"{_bytes(tool_stats.arg_bytes):>9} "
+            f"{_bytes(tool_stats.result_bytes):>9} "
+            f"{tool_stats.percentile(0.5):>9.1f} "
+            f"{tool_stats.percentile(0.95):>9.1f} "
+            f"{tool_stats.max_ms:>9.1f}  {server}.{tool}",
+            fg="yellow" if tool_stats.errors else None,
+        )
+
+
+def _bytes(count: int) -> str:
+    if count < 1024:
+        return f"{count} B"
+    size = count / 1024
+    for unit in ("KB", "MB"):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,72 @@
+import json
+import time
+
+import click
+
+from llm_mcp.transport import monitor as loop_monitor
+
+from . import mcp
+
+
+@mcp.command(name="monitor")
+@click.option("--stacks", is_flag=True, help="Show slow callback stacks.")
+@click.option("--json", "as_json", is_flag=True, help="Output raw JSON.")
+@click.option(
+    "--watch",
+    type=float,
+    default=None,
+    help="Refresh every N seconds until interrupted.",
+)
+def monitor(stacks: bool, as_json: bool, watch: float | None):
+    """Show background event-loop health of running llm-mcp processes.
+
+    Processes report only when started with LLM_MCP_LOOP_MONITOR=1.
+    """
+    while True:
+        statuses = loop_monitor.read_status()
+        if as_json:
+            click.echo(json.dumps(statuses, indent=2))
+        elif not statuses:
+            click.secho("No monitored llm-mcp processes are running.")
+        for status in [] if as_json else statuses:
+            _print_status(status, stacks)
+
+        if watch is None:
+            break
+        time.sleep(watch)
+
+
+def _print_status(status: dict, stacks: bool) -> None:
+    click.secho(
+        f"pid {status['pid']}: {status['shard_count']} loop(s), "
+        f"{status['queued']} queued, {status['in_flight']} in flight, "
+        f"{status['submitted']} submitted",
+        bold=True,
+    )
+    for shard in status["shards"]:
+        _print_shard(shard, stacks)
+
+
+def _print_shard(shard: dict, stacks: bool) -> None:
+    click.secho(
+        f"  {shard['thread']}: {shard['queued']} queued, "
+        f"{shard['in_flight']} in flight, {shard['submitted']} submitted"
+    )
+    report = shard.get("monitor")
+    if report is None:
+        return
+
+    lag = report["lag_ms"]
+    slow = report["slow_callbacks"]
+    click.secho(
+        f"    lag ms: last {lag['last']:.1f}  avg {lag['avg']:.1f}  "
+        f"p99 {lag['p99']:.1f}  max {lag['max']:.1f}  "
+        f"({report['pending_tasks']} pending tasks)"
+    )
+    click.secho(
+        f"    slow callbacks: {len(slow)}",
+        fg="yellow" if slow else None,
+    )
+    for record in slow if stacks else []:
+        click.secho(f"    - blocked {record['duration_ms']:.0f} ms")
+        click.echo(record["stack"])
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import uuid
+from pathlib import Path
+
+import click
+
+from llm_mcp import replay as journal
+
+from . import mcp
+
+
+@mcp.group()
+def replay():
+    """Record tool call results and replay them without servers."""
+
+
+@replay.command(
+    name="record", context_settings={"ignore_unknown_options": True}
+)
+@click.argument("path", type=click.Path(dir_okay=False, path_type=Path))
+@click.argument("command", nargs=-1, required=True, type=click.UNPROCESSED)
+@click.option(
+    "--append",
+    is_flag=True,
+    help="Add to an existing journal instead of starting a new one.",
+)
+def record(path: Path, command: tuple[str, ...], append: bool):
+    """Run COMMAND, recording its tool call results to the PATH journal.
+
+    Example: llm mcp replay record calls.db -- llm -T read_file "..."
+    """
+    if not append:
+        journal.remove_journal(path)
+    _run("record", path, command)
+
+
+@replay.command(name="run", context_settings={"ignore_unknown_options": True})
+@click.argument(
+    "path", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.argument("command", nargs=-1, required=True, type=click.UNPROCESSED)
+def run(path: Path, command: tuple[str, ...]):
+    """Run COMMAND, serving its tool calls from the PATH journal.
+
+    Every process of COMMAND shares one run, so repeated calls replay
+    their recorded results in order across processes.
+    """
+    run_id = uuid.uuid4().hex
+    try:
+        _run("replay", path, command, {journal.RUN_ENV_VAR: run_id})
+    finally:
+        replay_journal = journal.Journal(path, run_id)
+        replay_journal.end_run()
+        replay_journal.close()
+
+
+@replay.command(name="stats")
+@click.argument(
+    "path", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+def stats(path: Path):
+    """Show the number of recorded calls per server and tool."""
+    rows = journal.open_journal(path).stats()
+    if not rows:
+        click.secho("No recorded calls.")
+    for server, tool, count in rows:
+        click.secho(f"{count:>8}  {server}.{tool}")
+
+
+def _run(
+    mode: str,
+    path: Path,
+    command: tuple[str, ...],
+    extra_env: dict[str, str] | None = None,
+) -> None:
+    env = {
+        **os.environ,
+        journal.MODE_ENV_VAR: mode,
+        journal.FILE_ENV_VAR: str(path.resolve()),
+        **(extra_env or {}),
+    }
+    try:
+        completed = subprocess.run(command, env=env, check=False)  # noqa: S603
+    except FileNotFoundError as e:
+        raise click.ClickException(f"Command not found: {command[0]}") from e
+    raise SystemExit(completed.returncode)
@@ -0,0 +1,44 @@
+import asyncio
+
+import click
+
+from llm_mcp import serve as aggregate
+from llm_mcp import store
+
+from . import mcp
+
+
+@mcp.command(name="serve")
+@click.option(
+    "-s",
+    "--server",
+    "names",
+    multiple=True,
+    help="Only publish this server's tools (repeatable).",
+)
+@click.option(
+    "--http", is_flag=True, help="Serve streamable HTTP instead of stdio."
+)
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8000, show_default=True)
+def serve(names: tuple[str, ...], http: bool, host: str, port: int):
+    """Serve all registered servers as one MCP server.
+
+    Tools are published as SERVER__TOOL and calls are forwarded over one
+    shared session per backend, so every client shares the same server
+    processes.
+    """
+    missing = sorted(set(names) - set(store.list_servers()))
+    if missing:
+        raise click.ClickException(f"Server {missing[0]!r} does not exist")
+
+    aggregator = aggregate.Aggregator(names or None)
+    if http:
+        click.secho(
+            f"Serving {len(aggregator.tools())} tools at "
+            f"http://{host}:{port}/mcp",
+            err=True,
+        )
+        aggregate.serve_http(aggregator, host=host, port=port)
+    else:
+        asyncio.run(aggregate.serve_stdio(aggregator))
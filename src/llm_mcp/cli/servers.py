@@ -1,6 +1,11 @@
+import json
+import time
+
 import click
 
-from llm_mcp import manager, store
+from llm_mcp import manager, store, utils
+from llm_mcp.schema.shaping import BYTES_PER_TOKEN
+from llm_mcp.transport import processes, server_logs
 
 from . import mcp
 
@@ -16,7 +21,24 @@ def servers():
 @click.option("--name", type=str)
 @click.option("--overwrite", is_flag=True)
 @click.option("--exist-ok", is_flag=True)
-def add_server(param, name, overwrite: bool, exist_ok: bool):
+@click.option(
+    "--resolve",
+    is_flag=True,
+    help="Resolve an npx / uvx command once and launch the server directly.",
+)
+@click.option(
+    "--compact",
+    is_flag=True,
+    help="Compact the tool definitions sent to the model.",
+)
+def add_server(
+    param,
+    name,
+    overwrite: bool,
+    exist_ok: bool,
+    resolve: bool,
+    compact: bool,
+):
     """Register an MCP server locally by storing its Server Config."""
 
     try:
@@ -33,6 +55,10 @@ def add_server(param, name, overwrite: bool, exist_ok: bool):
         f"✔ added server {cfg.name!r} with {len(cfg.tools)} tools",
         fg="green",
     )
+    if resolve:
+        _resolve(cfg)
+    if compact:
+        _compact(cfg)
 
 
 @servers.command(name="list")
@@ -56,6 +82,42 @@ def view_server(name: str, indent: int):
     click.secho(cfg.model_dump_json(indent=indent if indent > 0 else None))
 
 
+@servers.command(name="compact")
+@click.argument("names", nargs=-1)
+def compact_servers(names: tuple[str, ...]):
+    """Compact the tool definitions of servers and show the savings.
+
+    The definitions each server (all servers if no NAMES are given) sends
+    to the model are compacted with the "compaction" settings of its
+    config, or the defaults.
+    """
+    for name in names or store.list_servers():
+        cfg = store.load_server(name)
+        if cfg is None:
+            raise click.ClickException(f"Server {name!r} does not exist")
+        _compact(cfg)
+
+
+@servers.command(name="logs")
+@click.argument("name")
+@click.option("-n", "--lines", type=int, default=50, show_default=True)
+def show_logs(name: str, lines: int):
+    """Show the last stderr lines of a server.
+
+    Lines are written to log files only while LLM_MCP_SERVER_LOGS is set.
+    """
+    if store.load_server(name) is None:
+        raise click.ClickException(f"Server {name!r} does not exist")
+    logged = server_logs.read_log(name, lines)
+    if logged is None:
+        click.secho(
+            f"No logs of {name!r}; set LLM_MCP_SERVER_LOGS=1 to keep them."
+        )
+        return
+    for line in logged:
+        click.echo(line)
+
+
 @servers.command(name="remove")
 @click.argument("name")
 def remove_server(name):
@@ -67,3 +129,78 @@ def remove_server(name):
         raise click.ClickException(f"Server {name!r} does not exist")
 
     click.secho(f"✔ removed server {name!r}.", fg="green")
+
+
+@servers.command(name="processes")
+@click.option("--json", "as_json", is_flag=True, help="Output raw JSON.")
+@click.option(
+    "--watch",
+    type=float,
+    default=None,
+    help="Refresh every N seconds until interrupted.",
+)
+def server_processes(as_json: bool, watch: float | None):
+    """Show memory and CPU use of server processes started by llm-mcp.
+
+    Only servers with "process_limits" in their parameters are tracked.
+    """
+    while True:
+        statuses = processes.read_status()
+        if as_json:
+            click.echo(json.dumps(statuses, indent=2))
+        elif not statuses:
+            click.secho("No tracked server processes are running.")
+        for status in [] if as_json else statuses:
+            _print_processes(status)
+
+        if watch is None:
+            break
+        time.sleep(watch)
+
+
+def _resolve(cfg) -> None:
+    try:
+        timing = manager.resolve_server(cfg)
+    except utils.ResolveError as e:
+        raise click.ClickException(f"could not resolve: {e}") from e
+    if timing is None:
+        click.secho("not an npx / uvx command, nothing to resolve")
+        return
+    before, after = timing
+    click.secho(
+        f"✔ resolved launch: spawn {before:.2f} s -> {after:.2f} s "
+        f"({before - after:.2f} s saved per spawn)",
+        fg="green",
+    )
+
+
+def _print_processes(status: dict) -> None:
+    click.secho(f"llm-mcp pid {status['pid']}:", bold=True)
+    for proc in status["processes"]:
+        click.secho(
+            f"  {proc['server']} (pid {proc['pid']}): "
+            f"rss {_mb(proc['rss'])} MB, peak {_mb(proc['peak_rss'])} MB, "
+            f"cpu {proc['cpu_seconds']:.1f} s",
+            fg="yellow" if proc["recycle_due"] else None,
+        )
+    for name, totals in status["servers"].items():
+        click.secho(
+            f"  {name}: {totals['spawned']} spawned, "
+            f"{totals['exited']} exited ({totals['recycled']} over the "
+            f"recycle limit), peak {_mb(totals['peak_rss'])} MB, "
+            f"cpu {totals['cpu_seconds']:.1f} s"
+        )
+
+
+def _compact(cfg) -> None:
+    before, after = manager.compact_server(cfg)
+    saved = before - after
+    click.secho(
+        f"✔ compacted {cfg.name!r}: {before} -> {after} bytes of tool "
+        f"definitions (~{saved // BYTES_PER_TOKEN} tokens saved per request)",
+        fg="green",
+    )
+
+
+def _mb(size: int | None) -> str:
+    return "?" if size is None else f"{size / 2**20:.1f}"
@@ -0,0 +1,469 @@
+"""
+Append-only journal of tool calls for cost and capacity analysis.
+
+Set ``LLM_MCP_JOURNAL=/path/to/calls.jsonl`` (``1`` selects
+``<mcp_dir>/journal.jsonl``) or call :pyfunc:`enable`, and every tool call
+made through :pyfunc:`llm_mcp.transport.dispatch.call_tool` or served by
+``llm mcp serve`` / ``llm mcp bridge`` is journaled as one line::
+
+    [ts, server, tool, arg_bytes, result_bytes, ms, error]
+
+``ts`` is the Unix time the call finished, ``arg_bytes`` and
+``result_bytes`` the size of the JSON-encoded arguments and result, ``ms``
+the latency seen by the caller and ``error`` the exception class name (or
+``null``).
+
+The calling thread timestamps the call, measures results whose size is
+known without encoding them (strings, bytes, attachments) and hands it to
+a queue, so large results are not kept alive while they wait; a
+background writer thread measures the other payloads as JSON, encodes
+the lines and appends them in batches of up to :data:`BATCH` lines, at
+least every :data:`FLUSH_SECONDS`.  When the file outgrows
+``LLM_MCP_JOURNAL_MAX_MB`` (default 64) it is rotated to ``.1`` ..
+``.<BACKUPS>``.  Each batch is a single append, and a writer reopens the
+journal once another process has rotated it, so processes can share a
+journal.  If the writer falls :data:`MAX_PENDING` lines behind, further
+calls are dropped and counted rather than slowing the caller down.
+
+:pyfunc:`stats` (``llm mcp journal stats``) aggregates the journal and its
+rotated files in one streaming pass, with latency percentiles taken from
+a log-scale histogram so memory stays constant however long it is.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import math
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from collections.abc import Awaitable, Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, TypeVar
+
+from mcp import types
+
+from .utils import BlobAttachment
+
+T = TypeVar("T")
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "LLM_MCP_JOURNAL"
+MAX_MB_ENV_VAR = "LLM_MCP_JOURNAL_MAX_MB"
+
+FIELDS = ("ts", "server", "tool", "arg_bytes", "result_bytes", "ms", "error")
+
+# lines written per append, and how long a line may wait for its batch
+BATCH = 512
+FLUSH_SECONDS = 1.0
+
+# rotated files kept next to the journal
+BACKUPS = 5
+
+# lines queued for the writer before new calls are dropped
+MAX_PENDING = 100_000
+
+
+class CallJournal:
+    """Line-delimited journal file appended to by a background thread."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_bytes: int | None = None,
+        backups: int = BACKUPS,
+        flush_seconds: float = FLUSH_SECONDS,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes if max_bytes is not None else _max_bytes()
+        self.backups = backups
+        self.flush_seconds = flush_seconds
+        self.dropped = 0
+        self._queue: queue.Queue[Any] = queue.Queue(MAX_PENDING)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def record(
+        self,
+        server: str,
+        tool: str,
+        arguments: Mapping[str, Any] | None,
+        result: Any,
+        seconds: float,
+        error: str | None = None,
+    ) -> None:
+        """Queue one call; JSON sizes are measured by the writer thread."""
+        if error is None and getattr(result, "isError", False):
+            error = "ToolError"
+        result_bytes = _known_size(result)
+        if result_bytes is not None:
+            result = None  # not kept while the entry waits
+        entry = (
+            time.time(),
+            server,
+            tool,
+            arguments,
+            result,
+            result_bytes,
+            seconds,
+            error,
+        )
+        self._start()
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued call is written (False on timeout)."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        """Write what is queued and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+        if self.dropped:
+            logger.warning(
+                "%d tool calls were not journaled to %s",
+                self.dropped,
+                self.path,
+            )
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="llm-mcp-journal", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        file: BinaryIO | None = None
+        stop = False
+        while not stop:
+            lines, waiting, stop = self._next_batch()
+            try:
+                if lines:
+                    file = self._append(file, lines)
+            except OSError:
+                logger.exception("could not write the journal %s", self.path)
+                self.dropped += len(lines)
+                file = None
+            for event in waiting:
+                event.set()
+        if file is not None:
+            file.close()
+
+    def _append(self, file: BinaryIO | None, lines: list[bytes]) -> BinaryIO:
+        if file is not None and not _is_file_at(file, self.path):
+            file.close()  # another process rotated the journal
+            file = None
+        if file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            file = self.path.open("ab")
+        file.write(b"".join(lines))
+        file.flush()
+        if file.tell() >= self.max_bytes:
+            current = _is_file_at(file, self.path)
+            file.close()
+            if current:
+                self._rotate()
+            file = self.path.open("ab")
+        return file
+
+    def _next_batch(self) -> tuple[list[bytes], list[threading.Event], bool]:
+        """Lines to append, flushes they satisfy, and whether to stop."""
+        lines: list[bytes] = []
+        waiting: list[threading.Event] = []
+        try:
+            item = self._queue.get(timeout=self.flush_seconds)
+            while True:
+                if item is None:
+                    return lines, waiting, True
+                if isinstance(item, threading.Event):
+                    # everything queued before the flush request is here
+                    waiting.append(item)
+                    return lines, waiting, False
+                line = _encode(item)
+                if line is not None:
+                    lines.append(line)
+                if len(lines) >= BATCH:
+                    break
+                item = self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        return lines, waiting, False
+
+    def _rotate(self) -> None:
+        for n in range(self.backups - 1, 0, -1):
+            older = _rotated(self.path, n)
+            if older.exists():
+                older.replace(_rotated(self.path, n + 1))
+        if self.backups:
+            self.path.replace(_rotated(self.path, 1))
+        else:
+            self.path.unlink()
+
+
+@dataclass
+class ToolStats:
+    """Aggregated journal lines of one ``server.tool``."""
+
+    calls: int = 0
+    errors: int = 0
+    arg_bytes: int = 0
+    result_bytes: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    first: float | None = None
+    last: float | None = None
+    latency: Counter[int] = field(default_factory=Counter)
+
+    def add(self, ts: float, args: int, result: int, ms: float, error: Any):
+        self.calls += 1
+        self.errors += error is not None
+        self.arg_bytes += args
+        self.result_bytes += result
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+        self.first = ts if self.first is None else min(self.first, ts)
+        self.last = ts if self.last is None else max(self.last, ts)
+        self.latency[_bucket(ms)] += 1
+
+    def percentile(self, q: float) -> float:
+        """Latency in ms below which a fraction *q* of calls finished.
+
+        Read from the histogram, so it is within about 10% of the exact
+        value (and never above :attr:`max_ms`).
+        """
+        if not self.calls:
+            return 0.0
+        rank = q * self.calls
+        seen = 0
+        for bucket in sorted(self.latency):
+            seen += self.latency[bucket]
+            if seen >= rank:
+                return min(_bucket_ms(bucket), self.max_ms)
+        return self.max_ms
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "arg_bytes": self.arg_bytes,
+            "result_bytes": self.result_bytes,
+            "avg_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": self.max_ms,
+            "first": self.first,
+            "last": self.last,
+        }
+
+
+def stats(
+    path: Path, *, since: float | None = None
+) -> dict[tuple[str, str], ToolStats]:
+    """Aggregate *path* and its rotated files per ``(server, tool)``.
+
+    Lines older than the Unix time *since* are skipped, as are lines that
+    cannot be parsed (e.g. cut short by a crash).
+    """
+    totals: dict[tuple[str, str], ToolStats] = {}
+    for line in _lines(path):
+        try:
+            ts, server, tool, args, result, ms, error = json.loads(line)
+        except ValueError:
+            continue
+        if since is not None and ts < since:
+            continue
+        key = (server, tool)
+        tool_stats = totals.get(key)
+        if tool_stats is None:
+            tool_stats = totals[key] = ToolStats()
+        tool_stats.add(ts, args, result, ms, error)
+    return totals
+
+
+def journal_path() -> Path:
+    """Journal file from ``LLM_MCP_JOURNAL`` or the default location."""
+    value = os.environ.get(ENV_VAR, "")
+    if value and value.lower() not in ("1", "true", "yes", "on"):
+        return Path(value)
+
+    from . import store
+
+    return store.mcp_dir() / "journal.jsonl"
+
+
+def enable(path: str | os.PathLike[str] | None = None) -> CallJournal:
+    """Start journaling calls to *path* (default :pyfunc:`journal_path`)."""
+    global _journal
+    disable()
+    _journal = CallJournal(Path(path) if path else journal_path())
+    return _journal
+
+
+def disable() -> None:
+    """Stop journaling, writing the calls still queued."""
+    global _journal
+    journal, _journal = _journal, None
+    if journal is not None:
+        journal.close()
+
+
+def enabled() -> bool:
+    return _journal is not None
+
+
+def flush(timeout: float | None = None) -> bool:
+    """Wait until every call journaled so far is on disk."""
+    return _journal.flush(timeout) if _journal is not None else True
+
+
+async def journaled(
+    server: str,
+    tool: str,
+    arguments: Mapping[str, Any] | None,
+    call: Awaitable[T],
+) -> T:
+    """Await *call*, journaling its latency, sizes and outcome."""
+    journal = _journal
+    if journal is None:
+        return await call
+    start = time.perf_counter()
+    try:
+        result = await call
+    except BaseException as e:
+        seconds = time.perf_counter() - start
+        journal.record(
+            server, tool, arguments, None, seconds, type(e).__name__
+        )
+        raise
+    seconds = time.perf_counter() - start
+    journal.record(server, tool, arguments, result, seconds)
+    return result
+
+
+# private functions
+
+
+_journal: CallJournal | None = None
+
+# latency histogram buckets per doubling (about 9% wide)
+_BUCKETS_PER_OCTAVE = 8
+
+
+def _encode(entry: tuple[Any, ...]) -> bytes | None:
+    ts, server, tool, arguments, result, result_bytes, seconds, error = entry
+    if result_bytes is None:
+        try:
+            result_bytes = _size(result)
+        except Exception:
+            logger.exception(
+                "could not measure a result of %s.%s", server, tool
+            )
+            return None
+    line = [
+        round(ts, 3),
+        server,
+        tool,
+        _size(arguments or {}),
+        result_bytes,
+        round(seconds * 1000, 2),
+        error,
+    ]
+    return json.dumps(line, separators=(",", ":")).encode() + b"\n"
+
+
+def _known_size(value: Any) -> int | None:
+    """Size of *value* if it needs no encoding to tell (else None)."""
+    if value is None:
+        return 0
+    if isinstance(value, bytes | bytearray):
+        return len(value)
+    if isinstance(value, BlobAttachment):
+        return value.size
+    if isinstance(value, str):
+        # isascii() reads a flag of the string; others are encoded once
+        return len(value) if value.isascii() else len(value.encode())
+    return None
+
+
+def _size(value: Any) -> int:
+    """Bytes *value* takes as JSON (raw length for strings and bytes)."""
+    known = _known_size(value)
+    if known is not None:
+        return known
+    if isinstance(value, types.CallToolResult):
+        return len(value.model_dump_json(exclude_none=True))
+    try:
+        text = json.dumps(
+            value, separators=(",", ":"), ensure_ascii=False, default=str
+        )
+    except ValueError:  # circular reference
+        return 0
+    return len(text.encode())
+
+
+def _max_bytes() -> int:
+    return int(float(os.environ.get(MAX_MB_ENV_VAR) or 64) * 1024 * 1024)
+
+
+def _is_file_at(file: BinaryIO, path: Path) -> bool:
+    """True if *path* still names the open *file* (it was not rotated)."""
+    try:
+        named = path.stat()
+    except FileNotFoundError:
+        return False
+    opened = os.fstat(file.fileno())
+    return (named.st_dev, named.st_ino) == (opened.st_dev, opened.st_ino)
+
+
+def _rotated(path: Path, n: int) -> Path:
+    return path.with_name(f"{path.name}.{n}")
+
+
+def _lines(path: Path) -> Iterator[bytes]:
+    """Lines of *path* and every rotated file next to it."""
+    rotated = [
+        p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()
+    ]
+    for file in [path, *rotated]:
+        try:
+            with file.open("rb") as f:
+                yield from f
+        except FileNotFoundError:
+            continue
+
+
+def _bucket(ms: float) -> int:
+    return math.ceil(math.log2(max(ms, 0.001)) * _BUCKETS_PER_OCTAVE)
+
+
+def _bucket_ms(bucket: int) -> float:
+    """Upper bound of a latency bucket in ms."""
+    return 2 ** (bucket / _BUCKETS_PER_OCTAVE)
+
+
+if os.environ.get(ENV_VAR):
+    enable()
+
+atexit.register(disable)
@@ -1,7 +1,19 @@
 """Business logic for managing MCP servers."""
 
+import time
+from functools import partial
+
+from mcp.shared.exceptions import McpError
+from mcp.types import INVALID_PARAMS
+
 from . import store, transport, utils
-from .schema import ServerConfig
+from .schema import (
+    MCPTool,
+    SchemaCompaction,
+    ServerConfig,
+    ServerParameters,
+    StdioServerParameters,
+)
 
 
 class DuplicateServer(Exception):
@@ -46,8 +58,93 @@ def add_server(
 
     # fetch and rewrite if config is not loaded
     if cfg is None:
-        tools = transport.list_tools_sync(params)
+        tools = _fetch_tools(name, params)
         cfg = ServerConfig(name=name, parameters=params, tools=tools)
         store.save_server(cfg)
+        store.discard_tools_progress(name)
 
     return cfg
+
+
+def resolve_server(cfg: ServerConfig) -> tuple[float, float] | None:
+    """
+    Resolve the npx / uvx launch of *cfg* once and persist it.
+
+    Returns the measured spawn time (server start and tool listing) of the
+    original and of the resolved command line, or None if *cfg* is not
+    started through npx / uvx.  Raises :class:`utils.ResolveError` if the
+    package manager fails.
+    """
+    params = cfg.parameters
+    if not isinstance(params, StdioServerParameters):
+        return None
+    params = params.model_copy(update={"resolved": None})
+    resolved = utils.resolve_launch(params)
+    if resolved is None:
+        return None
+
+    before = _spawn_seconds(params)
+    params = params.model_copy(update={"resolved": resolved})
+    after = _spawn_seconds(params)
+
+    cfg = cfg.model_copy(update={"parameters": params})
+    store.save_server(cfg)
+    return before, after
+
+
+def compact_server(
+    cfg: ServerConfig, compaction: SchemaCompaction | None = None
+) -> tuple[int, int]:
+    """
+    Compact the tool definitions *cfg* sends to the model and persist it.
+
+    *compaction* replaces the server's settings (the defaults if it has
+    none).  The stored tools stay as the server lists them; only what the
+    model is shown is compacted.  Returns the bytes the tool definitions
+    take in a model request as served and after compaction.
+    """
+    compaction = compaction or cfg.compaction or SchemaCompaction()
+    cfg = cfg.model_copy(update={"compaction": compaction})
+    store.save_server(cfg)
+    before = utils.tools_bytes(cfg.tools)
+    return before, utils.tools_bytes(map(cfg.model_tool, cfg.tools))
+
+
+# private functions
+
+
+def _fetch_tools(name: str, params: ServerParameters) -> list[MCPTool]:
+    """
+    List every tool of *params*, recording each page as it arrives.
+
+    The pages are appended to the server's progress file (see
+    :pyfunc:`store.append_tools_page`) rather than kept in memory, so a
+    listing that fails half way resumes at its last recorded page the
+    next time.  The caller discards the progress once the tools are saved.
+    """
+    progress = store.load_tools_progress(name, params)
+    if progress is not None and progress[2]:
+        return progress[0]
+
+    cursor = progress[1] if progress is not None else None
+    if progress is None:
+        store.start_tools_progress(name, params)
+    on_page = partial(store.append_tools_page, name)
+    try:
+        transport.list_tool_pages_sync(params, on_page, cursor=cursor)
+    except McpError as e:
+        if cursor is None or e.error.code != INVALID_PARAMS:
+            raise
+        # the server no longer accepts the recorded cursor: start over
+        store.start_tools_progress(name, params)
+        transport.list_tool_pages_sync(params, on_page)
+
+    progress = store.load_tools_progress(name, params)
+    assert progress is not None
+    return progress[0]
+
+
+def _spawn_seconds(params: StdioServerParameters) -> float:
+    start = time.perf_counter()
+    transport.list_tools_sync(params)
+    return time.perf_counter() - start
@@ -0,0 +1,286 @@
+"""
+Record and replay tool call results.
+
+With ``LLM_MCP_REPLAY=record`` every successful
+:pyfunc:`llm_mcp.transport.dispatch.call_tool_sync` stores
+``(server, tool, arguments) -> result`` in a journal; with
+``LLM_MCP_REPLAY=replay`` results are served from that journal without
+contacting any server, and a call missing from it raises
+:class:`ReplayMiss`.  ``LLM_MCP_REPLAY_FILE`` selects the journal
+(default ``<mcp_dir>/replay.db``); ``llm mcp replay`` sets both for a
+command it runs.
+
+The journal is a SQLite file indexed by a hash of the call, so a lookup
+reads one row no matter how large the journal grows.  A call made several
+times is stored once per occurrence: the *n*-th identical call of a replay
+gets the *n*-th recorded result (or the last one if it was recorded fewer
+times), so transcripts that poll a changing value replay faithfully.
+Recording appends to an existing journal, numbering occurrences after
+those already in it.  Replay counts occurrences in the journal as well,
+per run: processes sharing ``LLM_MCP_REPLAY_RUN`` (set by ``llm mcp
+replay run``) continue each other's count, so a transcript recorded over
+several ``llm`` invocations replays in order; without it every process
+is a run of its own.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections.abc import Callable, Mapping
+from pathlib import Path
+from typing import Any
+
+from .utils import BlobAttachment
+
+MODE_ENV_VAR = "LLM_MCP_REPLAY"
+FILE_ENV_VAR = "LLM_MCP_REPLAY_FILE"
+RUN_ENV_VAR = "LLM_MCP_REPLAY_RUN"
+MODES = ("record", "replay")
+
+
+class ReplayMiss(LookupError):
+    """A replayed call has no recorded result."""
+
+
+class Journal:
+    """SQLite file mapping tool calls to their recorded results.
+
+    Lookups count occurrences for *run* (a fresh one if not given).
+    """
+
+    def __init__(self, path: Path, run: str | None = None):
+        self.path = path
+        self.run = run or uuid.uuid4().hex
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        with self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._db.execute(statement)
+
+    def record(
+        self,
+        server: str,
+        tool: str,
+        arguments: Mapping[str, Any] | None,
+        result: Any,
+    ) -> None:
+        key = call_key(server, tool, arguments)
+        # the occurrence is numbered in the statement itself, after any
+        # recorded by earlier processes sharing the file
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT INTO calls SELECT ?, COALESCE(MAX(seq), 0) + 1, "
+                "?, ?, ?, ?, ? FROM calls WHERE key = ?",
+                (
+                    key,
+                    server,
+                    tool,
+                    json.dumps(arguments or {}, sort_keys=True, default=str),
+                    json.dumps(_encode(result)),
+                    time.time(),
+                    key,
+                ),
+            )
+
+    def lookup(
+        self,
+        server: str,
+        tool: str,
+        arguments: Mapping[str, Any] | None,
+    ) -> Any:
+        """Return the recorded result or raise :class:`ReplayMiss`."""
+        key = call_key(server, tool, arguments)
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT result FROM calls WHERE key = ? AND seq <= ? "
+                "ORDER BY seq DESC LIMIT 1",
+                (key, self._next_occurrence(key)),
+            ).fetchone()
+        if row is None:
+            raise ReplayMiss(
+                f"no recorded result for {server}.{tool} in {self.path}"
+            )
+        return _decode(json.loads(row[0]))
+
+    def stats(self) -> list[tuple[str, str, int]]:
+        """Recorded ``(server, tool, calls)``, most frequent first."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT server, tool, COUNT(*) FROM calls "
+                "GROUP BY server, tool ORDER BY 3 DESC, 1, 2"
+            ).fetchall()
+
+    def end_run(self) -> None:
+        """Forget the occurrences counted for this journal's run."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM cursors WHERE run = ?", (self.run,))
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def _next_occurrence(self, key: str) -> int:
+        """Number this replayed occurrence of *key* within the run.
+
+        The caller holds ``_lock`` inside a transaction, so the count is
+        written and read back before another process can move it.
+        """
+        self._db.execute(
+            "INSERT INTO cursors VALUES (?, ?, 1) "
+            "ON CONFLICT (run, key) DO UPDATE SET seq = seq + 1",
+            (self.run, key),
+        )
+        (seq,) = self._db.execute(
+            "SELECT seq FROM cursors WHERE run = ? AND key = ?",
+            (self.run, key),
+        ).fetchone()
+        return int(seq)
+
+
+def call_key(
+    server: str, tool: str, arguments: Mapping[str, Any] | None
+) -> str:
+    """Stable hash identifying a call (argument order does not matter)."""
+    text = json.dumps(
+        [server, tool, arguments or {}],
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def mode() -> str | None:
+    """Active mode from ``LLM_MCP_REPLAY``: record, replay or ``None``."""
+    value = (os.environ.get(MODE_ENV_VAR) or "").lower() or None
+    if value is not None and value not in MODES:
+        raise ValueError(f"{MODE_ENV_VAR} must be one of {', '.join(MODES)}")
+    return value
+
+
+def journal_path() -> Path:
+    path = os.environ.get(FILE_ENV_VAR)
+    if path:
+        return Path(path)
+
+    from . import store
+
+    return store.mcp_dir() / "replay.db"
+
+
+def remove_journal(path: Path) -> None:
+    """Delete the journal at *path* with its SQLite side files."""
+    path = path.resolve()
+    with _journals_lock:
+        journal = _journals.pop(path, None)
+    if journal is not None:
+        journal.close()
+    for suffix in ("", "-wal", "-shm"):
+        path.with_name(path.name + suffix).unlink(missing_ok=True)
+
+
+def open_journal(path: Path) -> Journal:
+    """Return the shared :class:`Journal` for *path* (opened lazily)."""
+    path = path.resolve()
+    with _journals_lock:
+        journal = _journals.get(path)
+        if journal is None:
+            run = os.environ.get(RUN_ENV_VAR) or None
+            journal = _journals[path] = Journal(path, run)
+        return journal
+
+
+def call(
+    server: str,
+    tool: str,
+    arguments: Mapping[str, Any] | None,
+    live: Callable[[], Any],
+) -> Any:
+    """Run ``live()`` for a tool call, recording or replaying per mode."""
+    current = mode()
+    if current is None:
+        return live()
+
+    journal = open_journal(journal_path())
+    if current == "replay":
+        return journal.lookup(server, tool, arguments)
+
+    result = live()
+    journal.record(server, tool, arguments, result)
+    return result
+
+
+def close_all() -> None:
+    with _journals_lock:
+        for journal in _journals.values():
+            journal.close()
+        _journals.clear()
+
+
+# private functions
+
+
+_SCHEMA = (
+    """
+CREATE TABLE IF NOT EXISTS calls (
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    server TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    arguments TEXT NOT NULL,
+    result TEXT NOT NULL,
+    created REAL NOT NULL,
+    PRIMARY KEY (key, seq)
+)
+""",
+    # occurrences replayed so far, per run and call
+    """
+CREATE TABLE IF NOT EXISTS cursors (
+    run TEXT NOT NULL,
+    key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    PRIMARY KEY (run, key)
+)
+""",
+)
+
+_journals: dict[Path, Journal] = {}
+_journals_lock = threading.Lock()
+
+# tags of base-64 encoded bytes and attachments inside a stored result
+_BYTES = "$bytes"
+_ATTACHMENT = "$attachment"
+
+
+def _encode(value: Any) -> Any:
+    """Make a tool result JSON-safe (bytes become tagged base-64)."""
+    if isinstance(value, bytes):
+        return {_BYTES: base64.b64encode(value).decode()}
+    if isinstance(value, BlobAttachment):
+        return {_ATTACHMENT: {"type": value.type, "data": value.data}}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _encode(v) for k, v in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, dict):
+        if len(value) == 1 and _BYTES in value:
+            return base64.b64decode(value[_BYTES])
+        if len(value) == 1 and _ATTACHMENT in value:
+            return BlobAttachment(**value[_ATTACHMENT])
+        return {k: _decode(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    return value
@@ -1,17 +1,26 @@
 # ruff: noqa: I001
+from .compaction import SchemaCompaction
+from .limits import CallLimits, ProcessLimits
 from .parameters import (
+    ResolvedLaunch,
     ServerParameters,
     StdioServerParameters,
     RemoteServerParameters,
 )
+from .shaping import OutputShaping
 from .servers import (
     ServerConfig,
     MCPTool,
 )
 
 __all__ = [
+    "CallLimits",
     "MCPTool",
+    "OutputShaping",
+    "ProcessLimits",
     "RemoteServerParameters",
+    "ResolvedLaunch",
+    "SchemaCompaction",
     "ServerConfig",
     "ServerParameters",
     "StdioServerParameters",
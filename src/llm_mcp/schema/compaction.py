@@ -0,0 +1,37 @@
+"""Pydantic schema for compacting tool definitions sent to the model."""
+
+from pydantic import BaseModel, Field
+
+
+class SchemaCompaction(BaseModel):
+    max_tool_description: int | None = Field(
+        default=1000,
+        description="Characters kept of a tool's description (None keeps "
+        "all).",
+        ge=32,
+    )
+    max_description: int | None = Field(
+        default=200,
+        description="Characters kept of each description inside the input "
+        "schema (None keeps all).",
+        ge=16,
+    )
+    drop_titles: bool = Field(
+        default=True,
+        description="Remove 'title' keywords (names repeat the key).",
+    )
+    drop_examples: bool = Field(
+        default=True,
+        description="Remove 'examples' keywords.",
+    )
+    drop_additional_properties: bool = Field(
+        default=True,
+        description="Remove 'additionalProperties: true' keywords (the "
+        "default anyway); false and schemas for extra properties are kept.",
+    )
+    inline_ref_bytes: int = Field(
+        default=512,
+        description="Inline '$ref's to definitions up to this many bytes "
+        "of JSON and drop definitions nobody refers to (0 disables).",
+        ge=0,
+    )
@@ -0,0 +1,60 @@
+"""Pydantic schemas for client-side call and process limits."""
+
+from pydantic import BaseModel, Field
+
+
+class CallLimits(BaseModel):
+    rate: float | None = Field(
+        default=None,
+        description="Sustained calls per second (token bucket, unlimited "
+        "if unset).",
+        gt=0,
+    )
+    burst: int = Field(
+        default=1,
+        description="Calls that may start back-to-back before rate applies.",
+        ge=1,
+        le=10_000,
+    )
+    max_concurrency: int | None = Field(
+        default=None,
+        description="Maximum calls in flight at once (unlimited if unset).",
+        ge=1,
+        le=10_000,
+    )
+    queue_timeout: float = Field(
+        default=60.0,
+        description="Seconds a call may wait for a slot before failing.",
+        gt=0,
+        le=3600,
+    )
+
+
+class ProcessLimits(BaseModel):
+    max_memory_mb: int | None = Field(
+        default=None,
+        description="Address space the server process may map (RLIMIT_AS).",
+        ge=16,
+    )
+    cpu_seconds: int | None = Field(
+        default=None,
+        description="CPU time after which the process is killed (RLIMIT_CPU).",
+        ge=1,
+    )
+    max_open_files: int | None = Field(
+        default=None,
+        description="Maximum open file descriptors (RLIMIT_NOFILE).",
+        ge=16,
+    )
+    nice: int | None = Field(
+        default=None,
+        description="Niceness added to the process' scheduling priority.",
+        ge=0,
+        le=19,
+    )
+    recycle_rss_mb: int | None = Field(
+        default=None,
+        description="Resident memory above which a long-lived server "
+        "process is restarted before its next use.",
+        ge=1,
+    )
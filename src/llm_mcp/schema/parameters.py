@@ -1,15 +1,68 @@
 """Pydantic schemas for MCP server parameters."""
 
 from datetime import timedelta
-from typing import Any
+from typing import Any, Literal
 from urllib.parse import urlparse
 
 from mcp.client.stdio import StdioServerParameters as _StdioServerParameters
 from pydantic import BaseModel, Field, field_validator
 
+from .limits import ProcessLimits
+
+RoutingStrategy = Literal["round_robin", "least_outstanding", "ewma"]
+StdioFraming = Literal["default", "buffered"]
+Compression = Literal["gzip", "br"]
+
 
 class RemoteServerParameters(BaseModel):
     url: str = Field(..., description="URL of remote MCP server.")
+    endpoints: list[str] = Field(
+        default_factory=list,
+        description="Additional replica URLs serving the same MCP server.",
+    )
+    routing: RoutingStrategy = Field(
+        default="round_robin",
+        description="How calls are spread across url and endpoints.",
+    )
+    eject_after: int = Field(
+        default=3,
+        description="Consecutive failures before an endpoint is ejected.",
+        ge=1,
+        le=100,
+    )
+    eject_seconds: int = Field(
+        default=30,
+        description="Seconds an ejected endpoint waits before re-admission.",
+        ge=1,
+        le=3600,
+    )
+    hedge_percentile: float | None = Field(
+        default=None,
+        description="Observed latency percentile after which idempotent "
+        "calls are duplicated to another endpoint (disabled if unset).",
+        gt=0,
+        lt=100,
+    )
+    hedge_budget: float = Field(
+        default=5.0,
+        description="Maximum percentage of calls that may be hedged.",
+        ge=0,
+        le=100,
+    )
+    http2: bool = Field(
+        default=False,
+        description="Multiplex concurrent requests over one HTTP/2 "
+        "connection (needs the h2 package).",
+    )
+    compression: Compression | None = Field(
+        default=None,
+        description="Content encoding preferred for responses.",
+    )
+    compress_requests: bool = Field(
+        default=False,
+        description="Also send large request bodies in the compression "
+        "encoding (the server must accept Content-Encoding).",
+    )
     headers: dict[str, str] = Field(
         default_factory=dict,
         description="Default headers to be provided to MCP server.",
@@ -41,6 +94,12 @@ class RemoteServerParameters(BaseModel):
             raise ValueError(f"Invalid URL: {e}") from e
         return v
 
+    @field_validator("endpoints")
+    @classmethod
+    def validate_endpoints(cls, v: list[str]) -> list[str]:
+        """Validate every replica URL with the same rules as *url*."""
+        return [cls.validate_url(url) for url in v]
+
     @staticmethod
     def _validate_url_parts(result) -> None:
         """Validate URL components."""
@@ -49,17 +108,65 @@ class RemoteServerParameters(BaseModel):
         if result.scheme not in ("http", "https"):
             raise ValueError("URL must use http or https scheme")
 
+    @property
+    def urls(self) -> list[str]:
+        """Primary URL followed by any replica endpoints (deduplicated)."""
+        return list(dict.fromkeys([self.url, *self.endpoints]))
+
     def as_kwargs(self) -> dict[str, Any]:
-        data = self.model_dump(mode="python", exclude={"url"})
+        data = self.model_dump(mode="python", exclude=_LOCAL_FIELDS)
         data["timeout"] = timedelta(seconds=data["timeout"])
         data["sse_read_timeout"] = timedelta(seconds=data["sse_read_timeout"])
         return data
 
 
+# fields consumed by llm-mcp itself and never passed to streamablehttp_client
+_LOCAL_FIELDS = {
+    "url",
+    "endpoints",
+    "routing",
+    "eject_after",
+    "eject_seconds",
+    "hedge_percentile",
+    "hedge_budget",
+    "http2",
+    "compression",
+    "compress_requests",
+}
+
+
+class ResolvedLaunch(BaseModel):
+    """Executable an ``npx`` / ``uvx`` command line resolved to."""
+
+    source: Literal["npx", "uvx"]
+    command: str
+    args: list[str] = Field(default_factory=list)
+    env: dict[str, str] = Field(default_factory=dict)
+    paths: list[str] = Field(
+        default_factory=list,
+        description="Files that must exist to launch the resolved command.",
+    )
+
+
 class StdioServerParameters(_StdioServerParameters):
     """Extended StdioServerParameters with additional validation."""
 
-    pass
+    framing: StdioFraming = Field(
+        default="default",
+        description="How stdout is split into messages: the upstream MCP "
+        "client, or llm-mcp's buffered reader for very large messages.",
+    )
+    process_limits: ProcessLimits | None = Field(
+        default=None,
+        description="Resource caps applied when the server is spawned; "
+        "setting them also enables memory / CPU usage sampling.",
+    )
+    resolved: ResolvedLaunch | None = Field(
+        default=None,
+        description="Executable resolved from an npx / uvx command at "
+        "`servers add --resolve`, launched instead of the package manager "
+        "while it exists.",
+    )
 
 
 ServerParameters = RemoteServerParameters | StdioServerParameters
@@ -1,7 +1,10 @@
 from mcp.types import Tool as MCPTool
 from pydantic import BaseModel, Field
 
+from .compaction import SchemaCompaction
+from .limits import CallLimits
 from .parameters import ServerParameters
+from .shaping import OutputShaping
 
 
 class ServerConfig(BaseModel):
@@ -18,6 +21,26 @@ class ServerConfig(BaseModel):
         default_factory=list,
         description="List of tools provided by the server.",
     )
+    limits: CallLimits | None = Field(
+        default=None,
+        description="Rate and concurrency limits shared by all tool calls.",
+    )
+    tool_limits: dict[str, CallLimits] = Field(
+        default_factory=dict,
+        description="Rate and concurrency limits of individual tools.",
+    )
+    shaping: OutputShaping | None = Field(
+        default=None,
+        description="Size budget applied to the results of all tools.",
+    )
+    tool_shaping: dict[str, OutputShaping] = Field(
+        default_factory=dict,
+        description="Size budgets of individual tools' results.",
+    )
+    compaction: SchemaCompaction | None = Field(
+        default=None,
+        description="Compaction of the tool definitions sent to the model.",
+    )
 
     def get_tool(self, name: str) -> MCPTool:
         for tool in self.tools:
@@ -36,3 +59,11 @@ class ServerConfig(BaseModel):
             # clear all extras
             if tool.annotations and tool.annotations.model_extra:
                 tool.annotations.model_extra.clear()
+
+    def model_tool(self, tool: MCPTool) -> MCPTool:
+        """*tool* as sent to the model (compacted if configured)."""
+        if self.compaction is None:
+            return tool
+        from ..utils import compact_tool
+
+        return compact_tool(tool, self.compaction)
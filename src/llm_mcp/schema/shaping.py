@@ -0,0 +1,49 @@
+"""Pydantic schema for shaping tool results before the model sees them."""
+
+from pydantic import BaseModel, Field
+
+# rough size of a token in bytes of JSON / English text
+BYTES_PER_TOKEN = 4
+
+
+class OutputShaping(BaseModel):
+    max_bytes: int | None = Field(
+        default=None,
+        description="Largest serialized result passed on to the model.",
+        ge=256,
+    )
+    max_tokens: int | None = Field(
+        default=None,
+        description="Token budget, estimated as 4 bytes per token.",
+        ge=64,
+    )
+    max_items: int = Field(
+        default=50,
+        description="Array elements / object keys kept per level at first; "
+        "halved until the result fits the budget.",
+        ge=1,
+    )
+    max_string: int = Field(
+        default=2000,
+        description="Characters kept per string at first; halved until "
+        "the result fits the budget.",
+        ge=16,
+    )
+    spill: bool = Field(
+        default=False,
+        description="Write the full result of a shaped call to a file and "
+        "point the model to it.",
+    )
+
+    @property
+    def budget(self) -> int | None:
+        """Byte budget implied by max_bytes and max_tokens (the lower)."""
+        budgets = [
+            b
+            for b in (
+                self.max_bytes,
+                self.max_tokens and self.max_tokens * BYTES_PER_TOKEN,
+            )
+            if b
+        ]
+        return min(budgets) if budgets else None
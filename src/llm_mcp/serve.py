@@ -0,0 +1,275 @@
+"""
+Aggregated MCP server behind ``llm mcp serve``.
+
+Other MCP clients can share the servers registered with llm-mcp instead of
+each spawning their own copies:
+
+* every registered tool is published as ``<server>__<tool>``; the merged
+  list is built from the stored manifests (no backend is contacted) and
+  rebuilt whenever a manifest changes;
+* calls are forwarded over the pooled session of each backend (see
+  :mod:`llm_mcp.transport.pool`), so all clients share one process or
+  connection per server.  The server's rate limits and scheduler apply as
+  they do for local calls, with each client session taking turns as its
+  own caller, and calls are journaled like local ones (see
+  :mod:`llm_mcp.journal`);
+* the aggregate is served over stdio (:pyfunc:`serve_stdio`) or
+  streamable HTTP (:pyfunc:`serve_http`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from collections.abc import AsyncIterator, Iterable, Mapping, Sequence
+from typing import Any
+
+from mcp import types
+from mcp.server.lowlevel import Server
+from mcp.server.stdio import stdio_server
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.shared.exceptions import McpError
+from starlette.applications import Starlette
+from starlette.routing import Route
+from starlette.types import Receive, Scope, Send
+
+from . import journal, store
+from .schema import ServerConfig
+from .transport import bg_runner, cancellation, pool
+from .transport.limiter import limited
+from .transport.scheduler import scheduled
+
+logger = logging.getLogger(__name__)
+
+SEPARATOR = "__"
+
+Content = types.TextContent | types.ImageContent | types.EmbeddedResource
+
+
+class Aggregator:
+    """MCP server publishing the tools of several registered servers.
+
+    *names* limits the aggregate to some servers (default: all).  Without
+    *namespaced* the tools keep their own names, which only makes sense
+    for a single server.
+    """
+
+    def __init__(
+        self,
+        names: Sequence[str] | None = None,
+        *,
+        namespaced: bool = True,
+    ):
+        self.names = list(names) if names is not None else None
+        self.namespaced = namespaced
+        self.server: Server[Any] = Server("llm-mcp")
+        self.server.list_tools()(self._list_tools)
+        self.server.call_tool()(self._call_tool)
+        self._tools: list[types.Tool] = []
+        self._routes: dict[str, tuple[ServerConfig, str]] = {}
+        self._stamp: tuple[tuple[str, int], ...] | None = None
+        self._forwarded: set[str] = set()  # servers with pooled sessions
+
+    def tools(self) -> list[types.Tool]:
+        """The merged tool list, rebuilt if a manifest changed."""
+        stamp = _manifest_stamp()
+        if stamp != self._stamp:
+            self._build()
+            self._stamp = stamp
+        return self._tools
+
+    def route(self, name: str) -> tuple[ServerConfig, str]:
+        """Server config and backend tool name of published tool *name*."""
+        self.tools()
+        try:
+            return self._routes[name]
+        except KeyError:
+            raise ValueError(f"Unknown tool: {name!r}") from None
+
+    async def call_tool(
+        self,
+        name: str,
+        arguments: Mapping[str, Any] | None = None,
+        *,
+        caller: str | None = None,
+    ) -> types.CallToolResult:
+        """Forward a call of published tool *name* to its backend."""
+        config, tool_name = self.route(name)
+        return await journal.journaled(
+            config.name,
+            tool_name,
+            arguments,
+            self._limited_forward(config, tool_name, arguments, caller),
+        )
+
+    async def forward(
+        self, config: ServerConfig, tool_name: str, arguments: dict[str, Any]
+    ) -> types.CallToolResult:
+        """Send one call to the backend: the server's pooled session."""
+        self._forwarded.add(config.name)
+        future = bg_runner.submit(
+            _pooled_call(config, tool_name, arguments), key=config.name
+        )
+        return await asyncio.wrap_future(future)
+
+    async def aclose(self) -> None:
+        """Close the pooled sessions of the servers calls went to."""
+        names, self._forwarded = self._forwarded, set()
+        await asyncio.gather(
+            *(
+                asyncio.wrap_future(
+                    bg_runner.submit(pool.close(name), key=name)
+                )
+                for name in sorted(names)
+            )
+        )
+
+    async def _limited_forward(
+        self,
+        config: ServerConfig,
+        tool_name: str,
+        arguments: Mapping[str, Any] | None,
+        caller: str | None,
+    ) -> types.CallToolResult:
+        async with (
+            scheduled(config.name, None, caller),
+            limited(config, tool_name),
+        ):
+            return await self.forward(config, tool_name, dict(arguments or {}))
+
+    def _build(self) -> None:
+        names = self.names if self.names is not None else store.list_servers()
+        tools: list[types.Tool] = []
+        routes: dict[str, tuple[ServerConfig, str]] = {}
+        for server in sorted(names):
+            config = store.load_server(server)
+            if config is None:
+                logger.warning("server %r does not exist", server)
+                continue
+            for tool in config.tools:
+                name = self._name(config.name, tool.name)
+                if name in routes:
+                    logger.warning("duplicate tool %r is not published", name)
+                    continue
+                routes[name] = (config, tool.name)
+                shown = config.model_tool(tool)
+                tools.append(
+                    shown.model_copy(
+                        update={
+                            "name": name,
+                            "inputSchema": shown.inputSchema
+                            or {"type": "object"},
+                        }
+                    )
+                )
+        self._tools, self._routes = tools, routes
+
+    def _name(self, server: str, tool: str) -> str:
+        return f"{server}{SEPARATOR}{tool}" if self.namespaced else tool
+
+    async def _list_tools(self) -> list[types.Tool]:
+        return self.tools()
+
+    async def _call_tool(
+        self, name: str, arguments: dict[str, Any]
+    ) -> Iterable[Content]:
+        # each client session is its own caller for the scheduler
+        session = self.server.request_context.session
+        result = await self.call_tool(
+            name, arguments, caller=f"client-{id(session)}"
+        )
+        if result.isError:
+            raise ToolError(_text(result.content))
+        return [c for c in result.content if isinstance(c, Content)]
+
+
+class ToolError(Exception):
+    """A backend reported a failed tool call (``isError``)."""
+
+
+async def serve_stdio(aggregator: Aggregator) -> None:
+    """Serve *aggregator* to one client over stdin / stdout."""
+    server = aggregator.server
+    try:
+        async with stdio_server() as (read, write):
+            await server.run(
+                read, write, server.create_initialization_options()
+            )
+    finally:
+        await aggregator.aclose()
+
+
+def http_app(aggregator: Aggregator, *, path: str = "/mcp") -> Starlette:
+    """ASGI app serving *aggregator* over streamable HTTP at *path*."""
+    manager = StreamableHTTPSessionManager(app=aggregator.server)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Starlette) -> AsyncIterator[None]:
+        try:
+            async with manager.run():
+                yield
+        finally:
+            await aggregator.aclose()
+
+    return Starlette(
+        routes=[Route(path, endpoint=_Endpoint(manager))], lifespan=lifespan
+    )
+
+
+def serve_http(
+    aggregator: Aggregator,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    path: str = "/mcp",
+) -> None:
+    """Serve *aggregator* over streamable HTTP until interrupted."""
+    import uvicorn
+
+    uvicorn.run(
+        http_app(aggregator, path=path),
+        host=host,
+        port=port,
+        log_level="warning",
+    )
+
+
+# private functions
+
+
+class _Endpoint:
+    """ASGI endpoint handing every request to the session manager."""
+
+    def __init__(self, manager: StreamableHTTPSessionManager):
+        self.manager = manager
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await self.manager.handle_request(scope, receive, send)
+
+
+async def _pooled_call(
+    config: ServerConfig, tool_name: str, arguments: dict[str, Any]
+) -> types.CallToolResult:
+    pooled = await pool.get_session(config)
+    try:
+        return await cancellation.call_tool(
+            pooled.session, tool_name, arguments
+        )
+    except McpError:
+        raise
+    except Exception:
+        await pool.discard(pooled)
+        raise
+
+
+def _manifest_stamp() -> tuple[tuple[str, int], ...]:
+    return tuple(
+        (path.name, path.stat().st_mtime_ns)
+        for path in sorted(store.mcp_servers_dir().glob("*.json"))
+    )
+
+
+def _text(content: Sequence[Any]) -> str:
+    parts = [c.text for c in content if isinstance(c, types.TextContent)]
+    return "\n".join(parts) or "tool call failed"
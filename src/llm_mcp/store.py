@@ -1,11 +1,12 @@
 """Filesystem persistence for MCP server configurations."""
 
 import json
+import os
 from pathlib import Path
 
 import llm
 
-from llm_mcp.schema import ServerConfig
+from llm_mcp.schema import MCPTool, ServerConfig, ServerParameters
 
 
 def mcp_dir() -> Path:
@@ -66,9 +67,88 @@ def remove_server(name: str) -> bool:
     except FileNotFoundError:
         success = False
 
+    discard_tools_progress(name)
     return success
 
 
 def list_servers() -> list[str]:
     """List all available server names."""
     return [p.stem for p in mcp_servers_dir().glob("*.json")]
+
+
+# tool listings in progress
+
+
+def tools_progress_path(name: str) -> Path:
+    """File collecting the pages of an unfinished tool listing of *name*."""
+    return mcp_servers_dir() / f"{name}.tools.jsonl"
+
+
+def start_tools_progress(name: str, params: ServerParameters) -> None:
+    """Start recording a tool listing of *params*, dropping any earlier."""
+    header = {"parameters": _params_data(params)}
+    tools_progress_path(name).write_text(json.dumps(header) + "\n")
+
+
+def append_tools_page(
+    name: str, tools: list[MCPTool], next_cursor: str | None
+) -> None:
+    """Append a page of tools and the cursor of the page after it."""
+    page = {
+        "tools": [t.model_dump(mode="json", exclude_none=True) for t in tools],
+        "next": next_cursor,
+    }
+    line = json.dumps(page).encode() + b"\n"
+    with tools_progress_path(name).open("rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        if end:
+            f.seek(end - 1)
+            if f.read(1) != b"\n":
+                # the last write was cut short by a crash
+                line = b"\n" + line
+        f.write(line)
+
+
+def load_tools_progress(
+    name: str, params: ServerParameters
+) -> tuple[list[MCPTool], str | None, bool] | None:
+    """Load the recorded listing of *params* for *name*.
+
+    Returns the tools recorded so far, the cursor of the next page and
+    whether the last page was recorded; None without a recording for
+    these parameters.
+    """
+    path = tools_progress_path(name)
+    if not path.is_file():
+        return None
+    tools: list[MCPTool] = []
+    cursor: str | None = None
+    pages = 0
+    with path.open() as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            return None
+        if header.get("parameters") != _params_data(params):
+            return None
+        for line in f:
+            try:
+                page = json.loads(line)
+            except json.JSONDecodeError:
+                # cut short by a crash; the page was requested again
+                continue
+            tools.extend(MCPTool.model_validate(t) for t in page["tools"])
+            cursor = page["next"]
+            pages += 1
+    return tools, cursor, pages > 0 and cursor is None
+
+
+def discard_tools_progress(name: str) -> None:
+    tools_progress_path(name).unlink(missing_ok=True)
+
+
+# private functions
+
+
+def _params_data(params: ServerParameters) -> dict:
+    return params.model_dump(mode="json", exclude_none=True)
@@ -0,0 +1,204 @@
+"""
+Opt-in timeline tracing in Chrome trace-event format.
+
+Set ``LLM_MCP_TRACE=/path/to/trace.json`` (or call :pyfunc:`enable`) and
+every phase of a tool call - waiting for the background loop, spawning the
+server, the MCP handshake, the server round trip and content conversion -
+is recorded as a complete (``"ph": "X"``) event.  The file is written at
+interpreter exit (or on :pyfunc:`flush`) and opens directly in
+``chrome://tracing`` or https://ui.perfetto.dev.
+
+Concurrent calls share the background loop thread, so each top-level
+operation is drawn on its own *lane* (a synthetic ``tid``) to keep
+overlapping calls readable on the timeline.
+
+When tracing is disabled :pyfunc:`span` returns a shared no-op context
+manager, so instrumented code pays a single attribute lookup.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections.abc import Coroutine, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+ENV_VAR = "LLM_MCP_TRACE"
+
+# hard cap so a long-running host cannot grow the buffer without bound
+MAX_EVENTS = 1_000_000
+
+_path: Path | None = None
+_events: list[dict[str, Any]] = []
+_dropped = 0
+_lock = threading.Lock()
+_lane: contextvars.ContextVar[int | None] = contextvars.ContextVar(
+    "llm_mcp_trace_lane", default=None
+)
+_lane_ids = itertools.count(1)
+_NULL: AbstractContextManager[None] = nullcontext()
+
+
+def enable(path: str | os.PathLike[str]) -> None:
+    """Start recording events, to be written to *path*."""
+    global _path
+    _path = Path(path)
+
+
+def disable() -> None:
+    """Stop recording (already buffered events are kept until flush)."""
+    global _path
+    _path = None
+
+
+def enabled() -> bool:
+    return _path is not None
+
+
+def span(
+    name: str,
+    *,
+    new_lane: bool = False,
+    **args: Any,
+) -> AbstractContextManager[None]:
+    """Record the duration of the ``with`` block as a trace event.
+
+    The first span entered in a context (or any span with *new_lane*)
+    starts a fresh lane; nested spans are drawn on the same lane.
+    """
+    if _path is None:
+        return _NULL
+    return _span(name, new_lane, args)
+
+
+def counter(name: str, **values: float) -> None:
+    """Record the current *values* of a counter track (e.g. memory use)."""
+    if _path is None:
+        return
+    _record({
+        "name": name,
+        "ph": "C",
+        "ts": _now(),
+        "pid": os.getpid(),
+        "args": values,
+    })
+
+
+def traced(coro: Coroutine[Any, Any, T]) -> Coroutine[Any, Any, T]:
+    """Wrap *coro* so the time it waits for the event-loop is recorded."""
+    if _path is None:
+        return coro
+    return _traced(coro, _now(), _lane.get())
+
+
+def flush() -> Path | None:
+    """Write every buffered event to the trace file and return its path."""
+    path = _path
+    if path is None:
+        return None
+    with _lock:
+        events = list(_events)
+        dropped = _dropped
+    data = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"dropped_events": dropped},
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data))
+    return path
+
+
+def clear() -> None:
+    """Forget all buffered events."""
+    global _dropped
+    with _lock:
+        _events.clear()
+        _dropped = 0
+
+
+# private helpers
+
+
+@contextmanager
+def _span(name: str, new_lane: bool, args: dict[str, Any]) -> Iterator[None]:
+    lane = _lane.get()
+    token = None
+    if new_lane or lane is None:
+        lane = _new_lane(name)
+        token = _lane.set(lane)
+    start = _now()
+    try:
+        yield
+    except BaseException as e:
+        args["error"] = type(e).__name__
+        raise
+    finally:
+        _complete(name, start, _now(), lane, args)
+        if token is not None:
+            _lane.reset(token)
+
+
+async def _traced(
+    coro: Coroutine[Any, Any, T], submitted: float, lane: int | None
+) -> T:
+    lane = lane or _new_lane("run_async")
+    _lane.set(lane)
+    _complete("bg_runner.queue", submitted, _now(), lane, {})
+    return await coro
+
+
+def _new_lane(name: str) -> int:
+    lane = next(_lane_ids)
+    _record({
+        "name": "thread_name",
+        "ph": "M",
+        "pid": os.getpid(),
+        "tid": lane,
+        "args": {"name": f"{name} #{lane}"},
+    })
+    return lane
+
+
+def _complete(
+    name: str, start: float, end: float, lane: int, args: dict[str, Any]
+) -> None:
+    _record({
+        "name": name,
+        "cat": name.split(".", 1)[0],
+        "ph": "X",
+        "ts": start,
+        "dur": end - start,
+        "pid": os.getpid(),
+        "tid": lane,
+        "args": {"thread": threading.current_thread().name, **args},
+    })
+
+
+def _record(event: dict[str, Any]) -> None:
+    global _dropped
+    with _lock:
+        if len(_events) < MAX_EVENTS:
+            _events.append(event)
+        else:
+            _dropped += 1
+
+
+def _now() -> float:
+    """Microseconds on a monotonic clock, as expected by trace viewers."""
+    return time.perf_counter_ns() / 1000
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
+
+atexit.register(flush)
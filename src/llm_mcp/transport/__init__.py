@@ -1,13 +1,21 @@
 # ruff: noqa: I001
 from .bg_runner import run_async
-from . import http, stdio
+from . import http, pagination, resources, stdio
 from .convert_tool import convert_tool
-from .dispatch import list_tools_sync
+from .dispatch import (
+    call_tool_sync,
+    list_tool_pages_sync,
+    list_tools_sync,
+)
 
 __all__ = [
+    "call_tool_sync",
     "convert_tool",
     "http",
+    "list_tool_pages_sync",
     "list_tools_sync",
+    "pagination",
+    "resources",
     "run_async",
     "stdio",
 ]
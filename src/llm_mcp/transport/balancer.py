@@ -0,0 +1,232 @@
+"""
+Client-side load balancing across replicated remote MCP endpoints.
+
+A :class:`Balancer` is kept per distinct set of endpoint URLs so that every
+call to the same logical server shares routing state, regardless of which
+thread or event-loop issues it.  All bookkeeping is guarded by a plain
+:class:`threading.Lock` and never awaits, so it is safe to use from the
+background loop, from :pyfunc:`asyncio.run` and from worker threads alike.
+
+Routing strategies
+------------------
+* ``round_robin`` - rotate through the healthy endpoints.
+* ``least_outstanding`` - pick the endpoint with the fewest in-flight calls.
+* ``ewma`` - pick the lowest ``ewma_latency * (outstanding + 1)`` score;
+  endpoints without any observation are tried first.
+
+Health
+------
+An endpoint that fails ``eject_after`` times in a row is ejected for
+``eject_seconds``.  Once that period elapses it is re-admitted on probation:
+one success clears its failure count, another failure ejects it again.
+If every endpoint is ejected the one closest to re-admission is used, so
+the balancer never refuses to route.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Collection, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from mcp.shared.exceptions import McpError
+
+from ..schema import RemoteServerParameters
+
+# weight of the newest latency sample in the moving average
+EWMA_ALPHA = 0.3
+
+# number of recent successful call latencies kept for percentile estimates
+LATENCY_WINDOW = 512
+
+
+@dataclass
+class Endpoint:
+    """Routing statistics for a single replica URL."""
+
+    url: str
+    outstanding: int = 0
+    ewma: float | None = None
+    failures: int = 0
+    ejected_until: float = 0.0
+    requests: int = 0
+    errors: int = 0
+
+    def is_healthy(self, now: float) -> bool:
+        return self.ejected_until <= now
+
+
+class Balancer:
+    """Thread-safe endpoint picker for one replicated remote server."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        *,
+        routing: str = "round_robin",
+        eject_after: int = 3,
+        eject_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if not urls:
+            raise ValueError("Balancer requires at least one endpoint URL")
+        self.endpoints = [Endpoint(url) for url in urls]
+        self.routing = routing
+        self.eject_after = eject_after
+        self.eject_seconds = eject_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._cursor = 0
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+
+    def acquire(self, exclude: Collection[str] = ()) -> Endpoint:
+        """Choose an endpoint and count the call as outstanding on it."""
+        with self._lock:
+            endpoint = self._choose(exclude)
+            endpoint.outstanding += 1
+            endpoint.requests += 1
+            return endpoint
+
+    def release(self, endpoint: Endpoint, elapsed: float, ok: bool) -> None:
+        """Record the outcome of a call started with :meth:`acquire`."""
+        with self._lock:
+            endpoint.outstanding -= 1
+            if ok:
+                self._latencies.append(elapsed)
+                endpoint.failures = 0
+                endpoint.ejected_until = 0.0
+                if endpoint.ewma is None:
+                    endpoint.ewma = elapsed
+                else:
+                    endpoint.ewma += EWMA_ALPHA * (elapsed - endpoint.ewma)
+            else:
+                endpoint.errors += 1
+                endpoint.failures += 1
+                if endpoint.failures >= self.eject_after:
+                    endpoint.ejected_until = self._clock() + self.eject_seconds
+
+    @contextmanager
+    def route(self, exclude: Collection[str] = ()) -> Iterator[str]:
+        """Yield the URL to use and record latency and health on exit.
+
+        MCP protocol errors are answers from a live server, so they do not
+        count against the endpoint's health; anything else (connection
+        errors, timeouts, HTTP failures) does.  Cancellation is neutral.
+        Errors raised inside a session arrive wrapped in the task groups'
+        exception groups and are judged by the single error inside.
+        """
+        endpoint = self.acquire(exclude)
+        start = self._clock()
+        try:
+            yield endpoint.url
+        except BaseException as e:
+            error = _unwrap(e)
+            if isinstance(error, McpError):
+                self.release(endpoint, self._clock() - start, ok=True)
+            elif isinstance(error, _NEUTRAL):
+                self._abandon(endpoint)
+            else:
+                self.release(endpoint, self._clock() - start, ok=False)
+            raise
+        else:
+            self.release(endpoint, self._clock() - start, ok=True)
+
+    def latency_percentile(
+        self, percentile: float, min_samples: int = 20
+    ) -> float | None:
+        """Return the *percentile* of recent call latencies in seconds.
+
+        Returns None until at least *min_samples* calls have completed.
+        """
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < min_samples:
+            return None
+        index = round(percentile / 100 * (len(samples) - 1))
+        return samples[index]
+
+    def snapshot(self) -> list[dict[str, object]]:
+        """Return a copy of the per-endpoint statistics."""
+        now = self._clock()
+        with self._lock:
+            return [
+                {
+                    "url": e.url,
+                    "healthy": e.is_healthy(now),
+                    "outstanding": e.outstanding,
+                    "ewma_ms": None if e.ewma is None else e.ewma * 1000,
+                    "requests": e.requests,
+                    "errors": e.errors,
+                }
+                for e in self.endpoints
+            ]
+
+    # private helpers
+
+    def _abandon(self, endpoint: Endpoint) -> None:
+        with self._lock:
+            endpoint.outstanding -= 1
+
+    def _choose(self, exclude: Collection[str]) -> Endpoint:
+        now = self._clock()
+        candidates = [e for e in self.endpoints if e.url not in exclude]
+        candidates = candidates or self.endpoints
+        healthy = [e for e in candidates if e.is_healthy(now)]
+        if not healthy:
+            return min(candidates, key=lambda e: e.ejected_until)
+
+        # rotate the starting point so ties are spread evenly
+        self._cursor = (self._cursor + 1) % len(healthy)
+        rotated = healthy[self._cursor :] + healthy[: self._cursor]
+
+        if self.routing == "least_outstanding":
+            return min(rotated, key=lambda e: e.outstanding)
+        if self.routing == "ewma":
+            return min(rotated, key=_ewma_score)
+        return rotated[0]
+
+
+def get_balancer(params: RemoteServerParameters) -> Balancer:
+    """Return the shared :class:`Balancer` for *params* (created lazily)."""
+    key = (
+        tuple(params.urls),
+        params.routing,
+        params.eject_after,
+        params.eject_seconds,
+    )
+    balancer = _balancers.get(key)
+    if balancer is None:
+        with _balancers_lock:
+            balancer = _balancers.get(key)
+            if balancer is None:
+                balancer = Balancer(
+                    params.urls,
+                    routing=params.routing,
+                    eject_after=params.eject_after,
+                    eject_seconds=params.eject_seconds,
+                )
+                _balancers[key] = balancer
+    return balancer
+
+
+def _unwrap(error: BaseException) -> BaseException:
+    while isinstance(error, BaseExceptionGroup) and len(error.exceptions) == 1:
+        error = error.exceptions[0]
+    return error
+
+
+def _ewma_score(endpoint: Endpoint) -> float:
+    if endpoint.ewma is None:
+        return -1.0
+    return endpoint.ewma * (endpoint.outstanding + 1)
+
+
+# outcomes that say nothing about the endpoint
+_NEUTRAL = (asyncio.CancelledError, GeneratorExit, KeyboardInterrupt)
+
+_balancers: dict[tuple[object, ...], Balancer] = {}
+_balancers_lock = threading.Lock()
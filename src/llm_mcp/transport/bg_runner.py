@@ -1,20 +1,34 @@
 """
 Background event-loop utilities for *llm-mcp*.
 
-Exactly one private asyncio event-loop is started lazily in a separate
-thread, so *synchronous* code can obtain the result of an *awaitable*
--even when it is already running inside another event-loop-by calling
+Private asyncio event-loops are started lazily in separate threads, so
+*synchronous* code can obtain the result of an *awaitable* -even when it
+is already running inside another event-loop-by calling
 :pyfunc:`run_async`.
 
+By default there is exactly one background loop.  Heavily multi-threaded
+hosts can spread the work over several loop threads ("shards") with
+``LLM_MCP_LOOP_SHARDS=N`` or :pyfunc:`configure`.  Work submitted with a
+``key`` (e.g. the server name) always lands on the same shard, so
+per-server state stays loop-affine; work without a key is spread
+round-robin.
+
 Key guarantees
 --------------
-* **Thread-safe singleton** - the background loop and its thread are
-  created once and reused by every caller.
-* **Transparent teardown** - :pyfunc:`shutdown` stops the loop, joins
-  the thread and sets the globals back to *None*.  It is registered with
-  ``atexit`` and can also be called explicitly from test fixtures.
+* **Thread-safe singletons** - each shard's loop and thread are created
+  once and reused by every caller.
+* **Transparent teardown** - :pyfunc:`shutdown` stops every loop, joins
+  the threads and forgets the shards.  It is registered with ``atexit``
+  and can also be called explicitly from test fixtures.  Resources tied
+  to a loop are released by the finalizers registered with
+  :pyfunc:`add_loop_finalizer`, before a background loop stops and at
+  the end of the temporary loop of :pyfunc:`run_async`.
 * **Dead-simple API** - one public helper (`run_async`) plus the optional
   `shutdown()` for cleanup-sensitive environments such as `pytest -x`.
+* **Observable** - :pyfunc:`stats` reports queued and in-flight
+  submissions per shard; :pyfunc:`enable_monitor` (or
+  ``LLM_MCP_LOOP_MONITOR=1``) adds loop-lag and slow-callback
+  measurements, see :mod:`.monitor`.
 """
 
 from __future__ import annotations
@@ -22,78 +36,318 @@ from __future__ import annotations
 import asyncio
 import atexit
 import concurrent.futures
+import itertools
+import logging
+import os
 import threading
-from collections.abc import Coroutine
+import zlib
+from collections.abc import Awaitable, Callable, Coroutine
+from pathlib import Path
 from typing import Any, TypeVar, cast
 
+from .. import tracing
+from . import cancellation, monitor
+
 T = TypeVar("T")
 
-_bg_loop: asyncio.AbstractEventLoop | None = None
-_bg_thread: threading.Thread | None = None
+logger = logging.getLogger(__name__)
+
+SHARDS_ENV_VAR = "LLM_MCP_LOOP_SHARDS"
+
+
+class _Shard:
+    """One background loop, its thread, counters and optional monitor."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="llm-mcp-bg" if index == 0 else f"llm-mcp-bg-{index}",
+            daemon=True,
+        )
+        self.monitor: monitor.LoopMonitor | None = None
+        # submissions: waiting to start / started but not finished / total
+        self.queued = 0
+        self.in_flight = 0
+        self.submitted = 0
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        self.thread.start()
+        if _monitor_options is not None:
+            self.start_monitor(_monitor_options)
+
+    def stop(self) -> None:
+        self.stop_monitor()
+        if (
+            self.thread.is_alive()
+            and threading.current_thread() is not self.thread
+        ):
+            done = asyncio.run_coroutine_threadsafe(_finalize(), self.loop)
+            try:
+                done.result(timeout=2)
+            except Exception:
+                done.cancel()
+        # Ask the loop to stop, then wait up to ~2 s for the thread.
+        # noinspection PyTypeChecker
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread.is_alive():
+            self.thread.join(timeout=2)
+
+    def start_monitor(self, options: dict[str, Any]) -> None:
+        self.stop_monitor()
+        self.monitor = monitor.LoopMonitor(self.loop, self.thread, **options)
+        self.monitor.start()
+
+    def stop_monitor(self) -> None:
+        if self.monitor is not None:
+            self.monitor.stop()
+            self.monitor = None
+
+    def submit(
+        self, coro: Coroutine[Any, Any, T]
+    ) -> concurrent.futures.Future[T]:
+        self.count(queued=1, submitted=1)
+        return asyncio.run_coroutine_threadsafe(self._tracked(coro), self.loop)
+
+    async def _tracked(self, coro: Coroutine[Any, Any, T]) -> T:
+        """Keep the queued / in-flight counters up to date around *coro*."""
+        self.count(queued=-1, in_flight=1)
+        try:
+            return await coro
+        finally:
+            self.count(in_flight=-1)
+
+    def count(
+        self, queued: int = 0, in_flight: int = 0, submitted: int = 0
+    ) -> None:
+        with self._lock:
+            self.queued += queued
+            self.in_flight += in_flight
+            self.submitted += submitted
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            data: dict[str, Any] = {
+                "index": self.index,
+                "thread": self.thread.name,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "submitted": self.submitted,
+            }
+        if self.monitor is not None:
+            data["monitor"] = self.monitor.snapshot()
+        return data
+
+
+_shard_count = max(1, int(os.environ.get(SHARDS_ENV_VAR) or 1))
+_shards: dict[int, _Shard] = {}
 _bg_lock = threading.Lock()
+_round_robin = itertools.count()
+_monitor_options: dict[str, Any] | None = (
+    {} if monitor.enabled_by_env() else None
+)
+_status_writer: monitor.StatusWriter | None = None
+_finalizers: list[Callable[[], Awaitable[None]]] = []
 
 
-def run_async(coro: Coroutine[Any, Any, T]) -> T:
+def run_async(
+    coro: Coroutine[Any, Any, T],
+    *,
+    key: str | None = None,
+    timeout: float | None = None,
+) -> T:
     """Execute *coro* and return its result, regardless of loop state.
 
     * **No running loop** -> just :pyfunc:`asyncio.run`.
     * **Inside a running loop** -> schedule *coro* on the background
-      loop returned by :pyfunc:`_ensure_loop` and block the *current*
-      thread on :pyfunc:`concurrent.futures.Future.result`.
+      loop returned by :pyfunc:`_ensure_loop` for *key* and block the
+      *current* thread on :pyfunc:`concurrent.futures.Future.result`.
+
+    If the caller stops waiting - after *timeout* seconds
+    (:class:`~.cancellation.DeadlineExceeded`) or on an exception such as
+    ``KeyboardInterrupt`` - *coro* is cancelled too, so it can release its
+    session and tell the server.
     """
-    try:
-        asyncio.get_running_loop()
-    except RuntimeError:
-        return asyncio.run(coro)
+    with tracing.span("run_async"):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(_bounded(coro, timeout))
 
-    loop = _ensure_loop()
-    fut: concurrent.futures.Future[Any] = asyncio.run_coroutine_threadsafe(
-        coro, loop
-    )
-    return cast(T, fut.result())
+        shard = _ensure_shard(key)
+        fut = shard.submit(tracing.traced(coro))
+        try:
+            return cast(T, fut.result(timeout))
+        except concurrent.futures.TimeoutError:
+            fut.cancel()
+            raise cancellation.DeadlineExceeded(
+                f"No result within {timeout:g}s"
+            ) from None
+        except BaseException:
+            fut.cancel()  # no-op if *coro* itself raised
+            raise
 
 
-def shutdown(*_exc: object) -> None:
-    """Stop the background loop and join its thread (idempotent)."""
-    global _bg_loop, _bg_thread
+def submit(
+    coro: Coroutine[Any, Any, T], *, key: str | None = None
+) -> concurrent.futures.Future[T]:
+    """Schedule *coro* on the background loop for *key*.
+
+    Unlike :pyfunc:`run_async` this never uses a temporary loop, so
+    state created by *coro* (e.g. a pooled session) outlives the call.
+    """
+    return _ensure_shard(key).submit(tracing.traced(coro))
+
+
+def configure(*, shards: int) -> None:
+    """Use *shards* background loops from now on.
+
+    Running loops are shut down first; work already submitted to them is
+    not migrated, so call this during start-up.
+    """
+    global _shard_count
+    if shards < 1:
+        raise ValueError("shards must be at least 1")
+    shutdown()
     with _bg_lock:
-        if _bg_loop is None:
-            return
+        _shard_count = shards
 
-        # Ask the loop to stop, then wait up to ~2 s for the thread.
-        # noinspection PyTypeChecker
-        _bg_loop.call_soon_threadsafe(_bg_loop.stop)
-        if _bg_thread is not None and _bg_thread.is_alive():
-            _bg_thread.join(timeout=2)
 
-        _bg_loop = _bg_thread = None
+def stats() -> dict[str, Any]:
+    """Return per-shard counters (and monitor data when enabled)."""
+    with _bg_lock:
+        shards = [_shards[i] for i in sorted(_shards)]
+    per_shard = [shard.stats() for shard in shards]
+    return {
+        "shard_count": _shard_count,
+        "queued": sum(s["queued"] for s in per_shard),
+        "in_flight": sum(s["in_flight"] for s in per_shard),
+        "submitted": sum(s["submitted"] for s in per_shard),
+        "shards": per_shard,
+    }
+
+
+def enable_monitor(
+    *,
+    interval: float = 0.1,
+    slow_threshold: float = 0.25,
+    status_every: float = 5.0,
+    status_path: Path | None = None,
+) -> None:
+    """Monitor every background loop and publish a status file."""
+    global _monitor_options, _status_writer
+    with _bg_lock:
+        _monitor_options = {
+            "interval": interval,
+            "slow_threshold": slow_threshold,
+        }
+        for shard in _shards.values():
+            shard.start_monitor(_monitor_options)
+        previous, _status_writer = (
+            _status_writer,
+            monitor.StatusWriter(
+                status_path or monitor.status_path(), stats, every=status_every
+            ),
+        )
+    _stop_writer(previous)
+    _status_writer.start()
+
+
+def disable_monitor() -> None:
+    """Stop monitoring the background loops (idempotent)."""
+    global _monitor_options, _status_writer
+    with _bg_lock:
+        _monitor_options = None
+        for shard in _shards.values():
+            shard.stop_monitor()
+        previous, _status_writer = _status_writer, None
+    _stop_writer(previous)
+
+
+def add_loop_finalizer(finalizer: Callable[[], Awaitable[None]]) -> None:
+    """Await ``finalizer()`` on every loop of this module before it ends.
+
+    Used to close resources cached per loop, such as shared HTTP clients.
+    """
+    if finalizer not in _finalizers:
+        _finalizers.append(finalizer)
+
+
+def shutdown(*_exc: object) -> None:
+    """Stop every background loop and join its thread (idempotent)."""
+    with _bg_lock:
+        for shard in _shards.values():
+            shard.stop()
+        _shards.clear()
 
 
 # Automatically clean up on interpreter shutdown.
 atexit.register(shutdown)
+atexit.register(disable_monitor)
+
+
+async def _bounded(coro: Coroutine[Any, Any, T], timeout: float | None) -> T:
+    try:
+        with cancellation.deadline(timeout):
+            return await coro
+    finally:
+        # the temporary loop of asyncio.run() closes with this coroutine
+        await _finalize()
+
 
+async def _finalize() -> None:
+    for finalizer in _finalizers:
+        try:
+            await finalizer()
+        except Exception:
+            # a failing finalizer must not mask the result of the loop
+            logger.exception("Loop finalizer %r failed", finalizer)
 
-def _ensure_loop() -> asyncio.AbstractEventLoop:
-    """Return the background loop, creating it on first use (thread-safe)."""
-    global _bg_loop, _bg_thread
+
+def _ensure_loop(key: str | None = None) -> asyncio.AbstractEventLoop:
+    """Return the background loop for *key*, creating it on first use."""
+    return _ensure_shard(key).loop
+
+
+def _ensure_shard(key: str | None) -> _Shard:
+    index = _shard_index(key)
 
     # Fast-path: already initialised - no locking necessary.
-    if _bg_loop is not None:
-        return _bg_loop  # pragma: no cover
+    shard = _shards.get(index)
+    if shard is not None:
+        return shard
 
     # First caller takes the lock and creates the resources.
     with _bg_lock:
-        if _bg_loop is None:
-            _bg_loop = asyncio.new_event_loop()
+        shard = _shards.get(index)
+        if shard is None:
+            shard = _shards[index] = _Shard(index)
+            shard.start()
+            if _monitor_options is not None and _status_writer is None:
+                _start_status_writer()
+        return shard
+
+
+def _start_status_writer() -> None:
+    """Publish stats for ``llm mcp monitor``; caller holds ``_bg_lock``."""
+    global _status_writer
+    _status_writer = monitor.StatusWriter(monitor.status_path(), stats)
+    _status_writer.start()
+
 
-            def _runner() -> None:
-                _bg_loop.run_forever()
+def _stop_writer(writer: monitor.StatusWriter | None) -> None:
+    # outside ``_bg_lock``: a write in progress calls stats(), which takes it
+    if writer is not None:
+        writer.stop()
 
-            _bg_thread = threading.Thread(
-                target=_runner,
-                name="llm-mcp-bg",
-                daemon=True,
-            )
-            _bg_thread.start()
 
-        return _bg_loop
+def _shard_index(key: str | None) -> int:
+    count = _shard_count
+    if count == 1:
+        return 0
+    if key is None:
+        return next(_round_robin) % count
+    # crc32 is stable across processes, unlike the salted built-in hash()
+    return zlib.crc32(key.encode()) % count
@@ -0,0 +1,205 @@
+"""
+Deadlines and cancellation of tool calls.
+
+A caller that stops waiting for a tool call should also stop the work:
+
+* :pyfunc:`deadline` bounds everything inside it - queueing for the
+  scheduler and rate limits, spawning or connecting, the call itself - and
+  raises :class:`DeadlineExceeded` when the time is up;
+* :pyfunc:`llm_mcp.transport.bg_runner.run_async` cancels the background
+  task when the waiting thread gives up (its own timeout, Ctrl-C);
+* :pyfunc:`call_tool` turns the cancellation of a request that already
+  reached the server into an MCP ``notifications/cancelled``, so the
+  server can abort the handler instead of finishing work nobody reads.
+  Per-call sessions are then closed as usual, which ends the spawned
+  process or HTTP session; pooled sessions stay open for other calls.
+
+Some servers stop answering after cancelling a request (the Python SDK's
+low-level server up to at least 1.10 lets the cancellation escape the
+handler).  Long-lived sessions check :pyfunc:`responsive` before they are
+reused, so such a server is replaced instead of hanging later calls.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any
+
+import anyio
+import anyio.lowlevel
+from mcp import types
+from mcp.client.session import ClientSession
+
+from . import sdk_internals
+
+logger = logging.getLogger(__name__)
+
+# how long a cancelled call may spend telling the server it was cancelled
+NOTIFY_SECONDS = 2.0
+
+
+class DeadlineExceeded(TimeoutError):
+    """A tool call did not finish before its deadline."""
+
+
+@contextmanager
+def deadline(timeout: float | None) -> Iterator[None]:
+    """Cancel the block after *timeout* seconds (no limit if None)."""
+    if timeout is None:
+        yield
+        return
+    at = anyio.current_time() + timeout
+    scope = anyio.CancelScope(deadline=at)
+    token = _deadline.set(_Deadline(scope, at, timeout, _deadline.get()))
+    try:
+        with scope:
+            yield
+    finally:
+        _deadline.reset(token)
+    if scope.cancelled_caught:
+        raise _exceeded(timeout)
+
+
+async def call_tool(
+    session: ClientSession,
+    tool_name: str,
+    arguments: dict[str, Any] | None = None,
+) -> types.CallToolResult:
+    """``session.call_tool`` that tells the server when it is abandoned.
+
+    Inside :pyfunc:`deadline` only the wait for the response is cut off
+    at the deadline, so the session's transport is still running to
+    deliver the cancellation; the rest of the block is cancelled after
+    that (or :data:`NOTIFY_SECONDS` later at the latest).
+    """
+    request_id = sdk_internals.next_request_id(session)
+    first = _earliest()
+    with _notify_grace(first):
+        try:
+            with anyio.fail_after(
+                None if first is None else first.at - anyio.current_time()
+            ) as cutoff:
+                return await session.call_tool(tool_name, arguments)
+        except TimeoutError:
+            if first is None or not cutoff.cancelled_caught:
+                raise  # not our deadline: the call failed on its own
+            await _abandon(session, request_id)
+            # unwind as a cancellation: it passes the transport's task
+            # groups cleanly and :pyfunc:`deadline` turns it into
+            # DeadlineExceeded
+            first.scope.cancel()
+            await anyio.lowlevel.checkpoint()
+            raise
+        except asyncio.CancelledError:
+            await _abandon(session, request_id)
+            raise
+
+
+async def responsive(session: ClientSession) -> bool:
+    """False if *session* had a call cancelled and no longer answers."""
+    if session not in _after_cancel:
+        return True
+    with anyio.move_on_after(NOTIFY_SECONDS):
+        try:
+            await session.send_ping()
+        except Exception:
+            return False
+        _after_cancel.discard(session)
+        return True
+    return False
+
+
+async def notify_cancelled(
+    session: ClientSession,
+    request_id: types.RequestId,
+    reason: str = "The client stopped waiting for the result.",
+) -> None:
+    """Send ``notifications/cancelled`` for *request_id*, best effort."""
+    notification = types.CancelledNotification(
+        method="notifications/cancelled",
+        params=types.CancelledNotificationParams(
+            requestId=request_id, reason=reason
+        ),
+    )
+    _after_cancel.add(session)
+    with anyio.CancelScope(shield=True), anyio.move_on_after(NOTIFY_SECONDS):
+        try:
+            await session.send_notification(
+                types.ClientNotification(notification)
+            )
+        except Exception:
+            # the transport may already be gone; nothing left to stop then
+            logger.debug("could not cancel request %s", request_id)
+
+
+# private functions
+
+
+@dataclass
+class _Deadline:
+    scope: anyio.CancelScope
+    at: float
+    timeout: float
+    outer: _Deadline | None
+    calls: int = 0  # calls inside that are waiting for a response
+
+
+async def _abandon(
+    session: ClientSession, request_id: types.RequestId | None
+) -> None:
+    if request_id is not None:
+        await notify_cancelled(session, request_id)
+
+
+def _enclosing() -> Iterator[_Deadline]:
+    current = _deadline.get()
+    while current is not None:
+        yield current
+        current = current.outer
+
+
+def _earliest() -> _Deadline | None:
+    """The first of the enclosing deadlines to expire."""
+    return min(_enclosing(), key=lambda d: d.at, default=None)
+
+
+@contextmanager
+def _notify_grace(first: _Deadline | None) -> Iterator[None]:
+    """Hold off the enclosing deadlines while a call waits for a response.
+
+    They fire :data:`NOTIFY_SECONDS` late for as long as the block runs,
+    so none of them tears down the transport before a call cut off at
+    *first* has told the server; afterwards they are back on time.
+    """
+    if first is None:
+        yield
+        return
+    enclosing = list(_enclosing())
+    for current in enclosing:
+        current.calls += 1
+        current.scope.deadline = current.at + NOTIFY_SECONDS
+    try:
+        yield
+    finally:
+        for current in enclosing:
+            current.calls -= 1
+            if current.calls == 0:
+                current.scope.deadline = current.at
+
+
+# sessions that cancelled a request and have not answered a ping since
+_after_cancel: weakref.WeakSet[ClientSession] = weakref.WeakSet()
+
+_deadline: ContextVar[_Deadline | None] = ContextVar(
+    "llm_mcp_deadline", default=None
+)
+
+
+def _exceeded(timeout: float) -> DeadlineExceeded:
+    return DeadlineExceeded(f"Tool call did not finish within {timeout:g}s")
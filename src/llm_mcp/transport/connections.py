@@ -0,0 +1,64 @@
+"""
+Process-wide counters of open MCP sessions.
+
+Every stdio session owns one server process and every HTTP session one
+connection, so counting sessions per transport tells how many processes
+and connections a workload costs.  The counters are updated by the
+transports' ``_connect`` helpers and read by ``llm mcp bench``.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+
+class ConnectionCounter:
+    """Opened / currently open / peak open sessions of one transport."""
+
+    def __init__(self) -> None:
+        self.opened = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self) -> Iterator[None]:
+        """Count one session for as long as the block runs."""
+        with self._lock:
+            self.opened += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+
+    def reset_peak(self) -> None:
+        with self._lock:
+            self.peak = self.active
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "opened": self.opened,
+                "active": self.active,
+                "peak": self.peak,
+            }
+
+
+stdio = ConnectionCounter()
+http = ConnectionCounter()
+
+
+def snapshot() -> dict[str, Any]:
+    """Counters of both transports (``processes`` are stdio sessions)."""
+    return {"processes": stdio.snapshot(), "connections": http.snapshot()}
+
+
+def reset_peaks() -> None:
+    stdio.reset_peak()
+    http.reset_peak()
@@ -5,8 +5,8 @@ from typing import Any
 from llm import Tool as LLMTool
 from mcp import types as mcp_types
 
-from .. import schema
-from . import http, stdio
+from .. import schema, utils
+from . import dispatch
 
 
 def convert_tool(
@@ -23,49 +23,46 @@ def convert_tool(
     Returns:
         An LLM Tool that can be registered and used
     """
-    # Create the implementation function based on transport type
-    if isinstance(server_config.parameters, schema.RemoteServerParameters):
-        implementation = _create_http_implementation(
-            server_config.parameters, mcp_tool.name
-        )
-    else:  # StdioServerParameters
-        implementation = _create_stdio_implementation(
-            server_config.parameters, mcp_tool.name
-        )
+    implementation = _create_implementation(
+        server_config,
+        mcp_tool.name,
+        utils.compile_validator(mcp_tool.name, mcp_tool.inputSchema),
+    )
 
-    # Create and return the LLM tool
+    # Create and return the LLM tool; the model sees the compacted schema
+    shown = server_config.model_tool(mcp_tool)
     return LLMTool(
         name=mcp_tool.name,
-        description=mcp_tool.description or "",
-        input_schema=mcp_tool.inputSchema or {},
+        description=shown.description or "",
+        input_schema=shown.inputSchema or {},
         implementation=implementation,
         plugin="llm_mcp",
     )
 
 
-def _create_http_implementation(
-    params: schema.RemoteServerParameters,
+def _create_implementation(
+    server_config: schema.ServerConfig,
     tool_name: str,
+    validate: utils.Validator | None = None,
 ) -> Any:
-    """Create an implementation function for HTTP-based MCP tools."""
-
-    def impl(**kwargs: Any) -> Any:
-        return http.call_tool_sync(params, tool_name, kwargs or {})
-
-    # Set a meaningful name for debugging
-    impl.__name__ = f"http_tool_{tool_name}"
-    return impl
-
+    """Create an implementation function that dispatches on transport.
 
-def _create_stdio_implementation(
-    params: schema.StdioServerParameters,
-    tool_name: str,
-) -> Any:
-    """Create an implementation function for stdio-based MCP tools."""
+    Arguments are checked against the precompiled *validate* first, so
+    malformed calls fail locally without spawning or contacting a server.
+    Images and blobs are returned as :class:`utils.BlobAttachment`, which
+    hosts can pass on to a vision model without re-encoding them.
+    """
 
     def impl(**kwargs: Any) -> Any:
-        return stdio.call_tool_sync(params, tool_name, kwargs or {})
+        if validate is not None:
+            validate(kwargs)
+        return dispatch.call_tool_sync(
+            server_config, tool_name, kwargs or {}, attachments=True
+        )
 
     # Set a meaningful name for debugging
-    impl.__name__ = f"stdio_tool_{tool_name}"
+    if isinstance(server_config.parameters, schema.RemoteServerParameters):
+        impl.__name__ = f"http_tool_{tool_name}"
+    else:  # StdioServerParameters
+        impl.__name__ = f"stdio_tool_{tool_name}"
     return impl
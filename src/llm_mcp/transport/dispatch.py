@@ -1,15 +1,26 @@
 """Business logic for managing MCP servers."""
 
+import asyncio
+import os
+from collections.abc import Mapping
+from typing import Any
+
+from .. import journal, replay, tracing, utils
 from ..schema import (
     MCPTool,
     RemoteServerParameters,
+    ServerConfig,
     ServerParameters,
 )
-from . import http, run_async, stdio
+from . import cancellation, http, pagination, run_async, stdio
+from .limiter import limited
+from .scheduler import Priority, current_caller, scheduled
+
+TIMEOUT_ENV_VAR = "LLM_MCP_CALL_TIMEOUT"
 
 
 async def list_tools(params: ServerParameters) -> list[MCPTool]:
-    """Return the remote tool list for *params* (blocking)."""
+    """Return the remote tool list for *params*, every page of it."""
     tools: list[MCPTool]
 
     if isinstance(params, RemoteServerParameters):
@@ -22,3 +33,166 @@ async def list_tools(params: ServerParameters) -> list[MCPTool]:
 
 def list_tools_sync(params: ServerParameters) -> list[MCPTool]:
     return run_async(list_tools(params=params))
+
+
+async def list_tool_pages(
+    params: ServerParameters,
+    on_page: pagination.OnPage,
+    *,
+    cursor: str | None = None,
+) -> int:
+    """Pass every page of the remote tool list to *on_page* as it arrives.
+
+    The listing starts at *cursor* (the first page if None); returns the
+    number of tools listed.  *on_page* runs on the background loop.
+    """
+    if isinstance(params, RemoteServerParameters):
+        return await http.list_tool_pages(params, on_page, cursor=cursor)
+    return await stdio.list_tool_pages(params, on_page, cursor=cursor)
+
+
+def list_tool_pages_sync(
+    params: ServerParameters,
+    on_page: pagination.OnPage,
+    *,
+    cursor: str | None = None,
+) -> int:
+    return run_async(list_tool_pages(params, on_page, cursor=cursor))
+
+
+async def call_tool(
+    config: ServerConfig,
+    tool_name: str,
+    arguments: Mapping[str, Any] | None = None,
+    *,
+    priority: Priority | None = None,
+    caller: str | None = None,
+    timeout: float | None = None,
+    attachments: bool = False,
+) -> Any:
+    """Call *tool_name* on the server described by *config*.
+
+    The call first waits for a slot of the server's scheduler (see
+    :mod:`.scheduler` for *priority* and *caller*), then for the server's
+    and the tool's rate / concurrency limits.  The result is fitted into
+    the tool's output budget, if one is configured.  The call is recorded
+    in the call journal when it is enabled (see :mod:`llm_mcp.journal`).
+
+    *timeout* bounds the whole call, waiting included; when it passes the
+    call is cancelled (see :mod:`.cancellation`) and
+    :class:`~.cancellation.DeadlineExceeded` is raised.
+
+    With *attachments* images and blobs are returned undecoded as
+    :class:`~llm_mcp.utils.BlobAttachment` instead of bytes.
+    """
+    call = _shaped_call(
+        config, tool_name, arguments, priority, caller, timeout, attachments
+    )
+    return await journal.journaled(config.name, tool_name, arguments, call)
+
+
+def call_tool_sync(
+    config: ServerConfig,
+    tool_name: str,
+    arguments: Mapping[str, Any] | None = None,
+    *,
+    priority: Priority | None = None,
+    timeout: float | None = None,
+    attachments: bool = False,
+) -> Any:
+    """Blocking helper; calls for one server always share a loop shard.
+
+    *timeout* defaults to ``LLM_MCP_CALL_TIMEOUT`` seconds (no limit if
+    unset).  Results are recorded or replayed when ``LLM_MCP_REPLAY`` is
+    set, see :mod:`llm_mcp.replay`.
+    """
+    caller = current_caller()
+    if timeout is None:
+        timeout = default_timeout()
+
+    def live() -> Any:
+        coro = call_tool(
+            config,
+            tool_name,
+            arguments,
+            priority=priority,
+            caller=caller,
+            timeout=timeout,
+            attachments=attachments,
+        )
+        return run_async(coro, key=config.name)
+
+    return replay.call(config.name, tool_name, arguments, live)
+
+
+def default_timeout() -> float | None:
+    value = os.environ.get(TIMEOUT_ENV_VAR)
+    return float(value) if value else None
+
+
+async def _shaped_call(
+    config: ServerConfig,
+    tool_name: str,
+    arguments: Mapping[str, Any] | None,
+    priority: Priority | None,
+    caller: str | None,
+    timeout: float | None,
+    attachments: bool,
+) -> Any:
+    with cancellation.deadline(timeout):
+        result = await _call_tool(
+            config, tool_name, arguments, priority, caller, attachments
+        )
+
+    shaping = config.tool_shaping.get(tool_name, config.shaping)
+    if shaping is None:
+        return result
+    with tracing.span("shape_output"):
+        return await asyncio.to_thread(
+            utils.shape_output,
+            result,
+            shaping,
+            label=f"{config.name}.{tool_name}",
+        )
+
+
+async def _call_tool(
+    config: ServerConfig,
+    tool_name: str,
+    arguments: Mapping[str, Any] | None,
+    priority: Priority | None,
+    caller: str | None,
+    attachments: bool,
+) -> Any:
+    params = config.parameters
+    async with (
+        scheduled(config.name, priority, caller),
+        limited(config, tool_name),
+    ):
+        if isinstance(params, RemoteServerParameters):
+            idempotent = _is_idempotent(config, tool_name)
+            return await http.call_tool(
+                params,
+                tool_name,
+                arguments,
+                idempotent=idempotent,
+                attachments=attachments,
+            )
+        return await stdio.call_tool(
+            params,
+            tool_name,
+            arguments,
+            server=config.name,
+            attachments=attachments,
+        )
+
+
+def _is_idempotent(config: ServerConfig, tool_name: str) -> bool:
+    """True if the server marks the tool as safe to call more than once."""
+    try:
+        annotations = config.get_tool(tool_name).annotations
+    except ValueError:
+        return False
+    if annotations is None:
+        return False
+    return bool(annotations.idempotentHint or annotations.readOnlyHint)
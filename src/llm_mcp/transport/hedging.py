@@ -0,0 +1,124 @@
+"""
+Request hedging for idempotent remote tool calls.
+
+If the first attempt has not answered within the configured percentile of
+recently observed latency, a duplicate attempt is started on another
+endpoint (or on a fresh session to the same endpoint when there is only
+one).  Whichever attempt answers first wins and the other is cancelled.
+
+Hedges are paid for from a per-server :class:`HedgeBudget`: every call
+deposits ``budget / 100`` tokens and every hedge spends one, so at most
+``budget`` percent of calls are ever duplicated, even during an outage
+when every call is slow.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import weakref
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from .balancer import Balancer
+
+T = TypeVar("T")
+
+# Attempt factory: receives the set of URLs already in use so the balancer
+# can steer the duplicate towards a different endpoint.
+Attempt = Callable[[set[str]], Awaitable[T]]
+
+# upper bound on saved-up hedges, so a quiet period cannot fund a burst
+MAX_TOKENS = 10.0
+
+
+class HedgeBudget:
+    """Token bucket that limits hedges to a percentage of calls."""
+
+    def __init__(self) -> None:
+        self.tokens = 0.0
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def deposit(self, budget: float) -> None:
+        with self._lock:
+            self.calls += 1
+            self.tokens = min(MAX_TOKENS, self.tokens + budget / 100)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            self.hedges += 1
+            return True
+
+
+def get_budget(balancer: Balancer) -> HedgeBudget:
+    """Return the hedge budget shared by every call routed via *balancer*."""
+    with _budgets_lock:
+        budget = _budgets.get(balancer)
+        if budget is None:
+            budget = _budgets[balancer] = HedgeBudget()
+        return budget
+
+
+async def hedged(
+    attempt: Attempt[T],
+    balancer: Balancer,
+    *,
+    percentile: float,
+    budget: float,
+) -> T:
+    """Run *attempt*, duplicating it once if it is slower than usual."""
+    hedge_budget = get_budget(balancer)
+    hedge_budget.deposit(budget)
+
+    used: set[str] = set()
+    first = asyncio.ensure_future(attempt(used))
+    delay = balancer.latency_percentile(percentile)
+    if delay is None:
+        return await first
+
+    try:
+        done, _ = await asyncio.wait({first}, timeout=delay)
+    except BaseException:
+        first.cancel()
+        raise
+    if done or not hedge_budget.try_spend():
+        return await first
+
+    second = asyncio.ensure_future(attempt(used))
+    return await _first_success([first, second])
+
+
+async def _first_success(tasks: list[asyncio.Future[T]]) -> T:
+    """Return the first successful result, cancelling the other tasks."""
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+        # every attempt failed: surface the first attempt's error
+        return tasks[0].result()
+    finally:
+        for task in pending:
+            task.cancel()
+            task.add_done_callback(_discard)
+
+
+def _discard(task: asyncio.Future[Any]) -> None:
+    """Retrieve a cancelled loser's outcome so asyncio does not warn."""
+    if not task.cancelled():
+        task.exception()
+
+
+_budgets: weakref.WeakKeyDictionary[Balancer, HedgeBudget] = (
+    weakref.WeakKeyDictionary()
+)
+_budgets_lock = threading.Lock()
@@ -1,14 +1,21 @@
 """HTTP transport - synchronous wrapper streamable HTTP MCP servers."""
 
-from collections.abc import Mapping
+from collections.abc import AsyncIterator, Mapping
+from contextlib import AsyncExitStack, asynccontextmanager
+from functools import partial
 from typing import Any
 
 from mcp import types
-from mcp.client.session import ClientSession
+from mcp.client.session import ClientSession, MessageHandlerFnT
 from mcp.client.streamable_http import streamablehttp_client
+from mcp.shared.exceptions import McpError
 
-from .. import schema, utils
+from .. import schema, tracing, utils
+from . import cancellation, connections, pagination
+from .balancer import Balancer, get_balancer
 from .bg_runner import run_async
+from .hedging import hedged
+from .http_client import shared_streamablehttp_client
 
 __all__ = [
     "call_tool_sync",
@@ -21,14 +28,38 @@ __all__ = [
 async def list_tools(
     params: schema.RemoteServerParameters,
 ) -> list[types.Tool]:
-    kw = params.as_kwargs()
-    async with (
-        streamablehttp_client(params.url, **kw) as (reader, writer, _),
-        ClientSession(reader, writer) as session,
+    tools: list[types.Tool] = []
+    await list_tool_pages(params, lambda page, _: tools.extend(page))
+    return tools
+
+
+async def list_tool_pages(
+    params: schema.RemoteServerParameters,
+    on_page: pagination.OnPage,
+    *,
+    cursor: str | None = None,
+) -> int:
+    """Connect and pass every page of the server's tools to *on_page*.
+
+    See :pyfunc:`.pagination.tool_pages`; returns the number of tools.
+    """
+    failure: Exception | None = None
+    with (
+        tracing.span("http.list_tools"),
+        get_balancer(params).route() as url,
     ):
-        await session.initialize()
-        result = await session.list_tools()
-        return result.tools
+        async with _connect(params, url) as session:
+            with tracing.span("session.list_tools"):
+                try:
+                    return await pagination.tool_pages(
+                        session, on_page, cursor=cursor
+                    )
+                except (*pagination.FAILURES, McpError) as e:
+                    failure = e
+        # raised inside the session it would surface as an ExceptionGroup;
+        # raised here the balancer still records it
+        assert failure is not None
+        raise failure
 
 
 # call_tool
@@ -38,23 +69,133 @@ def call_tool_sync(
     params: schema.RemoteServerParameters,
     tool_name: str,
     arguments: Mapping[str, Any] | None = None,
+    *,
+    idempotent: bool = False,
+    timeout: float | None = None,
 ) -> Any:
-    return run_async(call_tool(params, tool_name, arguments))
+    return run_async(
+        call_tool(
+            params,
+            tool_name,
+            arguments,
+            idempotent=idempotent,
+            timeout=timeout,
+        )
+    )
 
 
 async def call_tool(
     params: schema.RemoteServerParameters,
     tool_name: str,
     arguments: Mapping[str, Any] | None = None,
+    *,
+    idempotent: bool = False,
+    timeout: float | None = None,
+    attachments: bool = False,
 ) -> Any:
+    """Call *tool_name*, hedging the request if it is safe to duplicate.
+
+    After *timeout* seconds the call is cancelled (the server is told so)
+    and :class:`~.cancellation.DeadlineExceeded` is raised.  With
+    *attachments* images and blobs are returned as
+    :class:`~llm_mcp.utils.BlobAttachment` instead of bytes.
+    """
     arguments = dict(arguments or {})
+    balancer = get_balancer(params)
 
-    kw = params.as_kwargs()
-    async with (
-        streamablehttp_client(params.url, **kw) as (reader, writer, _),
-        ClientSession(reader, writer) as session,
+    async def attempt(used: set[str]) -> Any:
+        return await _call_tool(
+            params, balancer, tool_name, arguments, used, attachments
+        )
+
+    with (
+        cancellation.deadline(timeout),
+        tracing.span("http.call_tool", tool=tool_name),
+    ):
+        if idempotent and params.hedge_percentile is not None:
+            return await hedged(
+                attempt,
+                balancer,
+                percentile=params.hedge_percentile,
+                budget=params.hedge_budget,
+            )
+        return await attempt(set())
+
+
+async def _call_tool(
+    params: schema.RemoteServerParameters,
+    balancer: Balancer,
+    tool_name: str,
+    arguments: dict[str, Any],
+    used: set[str],
+    attachments: bool = False,
+) -> Any:
+    # hedged attempts run concurrently, so a duplicate gets its own lane
+    with (
+        tracing.span("http.attempt", new_lane=bool(used)),
+        balancer.route(exclude=frozenset(used)) as url,
     ):
-        await session.initialize()
-        call = await session.call_tool(tool_name, arguments)
-        parts = [utils.convert_content(p) for p in call.content]
-        return parts[0] if len(parts) == 1 else parts
+        used.add(url)
+        async with _connect(params, url) as session:
+            with tracing.span("session.call_tool"):
+                call = await cancellation.call_tool(
+                    session, tool_name, arguments
+                )
+            with tracing.span("convert_content"):
+                parts = [
+                    await utils.convert_content_async(
+                        p, attachments=attachments
+                    )
+                    for p in call.content
+                ]
+            return parts[0] if len(parts) == 1 else parts
+
+
+# session
+
+
+@asynccontextmanager
+async def open_session(
+    params: schema.RemoteServerParameters,
+    message_handler: MessageHandlerFnT | None = None,
+) -> AsyncIterator[ClientSession]:
+    """Connect to one endpoint for a session that outlives a request.
+
+    Only the handshake counts towards the endpoint's routing statistics.
+    """
+    async with AsyncExitStack() as stack:
+        with get_balancer(params).route() as url:
+            session = await stack.enter_async_context(
+                _connect(params, url, message_handler)
+            )
+        yield session
+
+
+@asynccontextmanager
+async def _connect(
+    params: schema.RemoteServerParameters,
+    url: str,
+    message_handler: MessageHandlerFnT | None = None,
+) -> AsyncIterator[ClientSession]:
+    """Open a streamable HTTP session to *url* and run the handshake."""
+    kw = params.as_kwargs()
+    client = streamablehttp_client
+    if params.http2 or params.compression:
+        client = partial(
+            shared_streamablehttp_client,
+            http2=params.http2,
+            compression=params.compression,
+            compress_requests=params.compress_requests,
+        )
+    async with AsyncExitStack() as stack:
+        stack.enter_context(connections.http.track())
+        with tracing.span("http.connect", url=url):
+            reader, writer, _ = await stack.enter_async_context(
+                client(url, **kw)
+            )
+            session = await stack.enter_async_context(
+                ClientSession(reader, writer, message_handler=message_handler)
+            )
+        with tracing.span("session.initialize"):
+            await session.initialize()
+        yield session
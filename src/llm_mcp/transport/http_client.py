@@ -0,0 +1,330 @@
+"""
+Streamable HTTP client with HTTP/2 and compression.
+
+Drop-in replacement for
+:pyfunc:`mcp.client.streamable_http.streamablehttp_client`, selected for
+remote servers whose parameters set ``http2`` or ``compression``:
+
+* sessions of one event loop share a single :class:`httpx.AsyncClient`
+  per configuration, so with ``http2`` concurrent MCP requests are
+  multiplexed as streams of one connection (HTTPS negotiates the protocol
+  and falls back to HTTP/1.1; plain ``http://`` URLs assume the server
+  speaks HTTP/2 without TLS);
+* each session's long-lived ``GET`` event stream gets a client of its
+  own, closed with the session; the shared clients are closed when their
+  loop ends (see :pyfunc:`close_clients`);
+* requests on the shared client run in their own task
+  (:class:`ShieldedTransport`): httpcore's HTTP/2 connection loses frames
+  when a task is cancelled while reading, which would break every other
+  stream on the connection - and hedging or session teardown cancel
+  requests routinely;
+* ``compression`` (``gzip`` or ``br``) is preferred in
+  ``Accept-Encoding`` for responses; with ``compress_requests`` request
+  bodies of at least :data:`COMPRESS_MIN_BYTES` are sent in that encoding
+  too, for servers that accept compressed requests.
+
+HTTP/2 needs the ``h2`` package and Brotli the ``brotli`` package
+(``pip install 'llm-mcp[http2,brotli]'``).
+
+The transport is wired up as in mcp 1.9's client, calling methods of
+:class:`~mcp.client.streamable_http.StreamableHTTPTransport` that are not
+public API; ``tests/tdd/test_http_client.py`` checks their signatures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import importlib
+import weakref
+from collections.abc import AsyncIterator, Coroutine
+from contextlib import AsyncExitStack, asynccontextmanager
+from datetime import timedelta
+from typing import Any
+
+import anyio
+import httpx
+from anyio.streams.memory import (
+    MemoryObjectReceiveStream,
+    MemoryObjectSendStream,
+)
+from mcp.client.streamable_http import (
+    GetSessionIdCallback,
+    StreamableHTTPTransport,
+)
+from mcp.shared.message import SessionMessage
+
+from ..schema.parameters import Compression
+from . import bg_runner
+
+# smaller request bodies are not worth compressing
+COMPRESS_MIN_BYTES = 1024
+
+ReadStream = MemoryObjectReceiveStream[SessionMessage | Exception]
+WriteStream = MemoryObjectSendStream[SessionMessage]
+
+
+@asynccontextmanager
+async def shared_streamablehttp_client(
+    url: str,
+    headers: dict[str, Any] | None = None,
+    timeout: timedelta = timedelta(seconds=30),
+    sse_read_timeout: timedelta = timedelta(seconds=60 * 5),
+    terminate_on_close: bool = True,
+    *,
+    http2: bool = False,
+    compression: Compression | None = None,
+    compress_requests: bool = False,
+) -> AsyncIterator[tuple[ReadStream, WriteStream, GetSessionIdCallback]]:
+    """Open a streamable HTTP transport over a shared HTTP client."""
+    transport = StreamableHTTPTransport(
+        url, headers, timeout, sse_read_timeout
+    )
+    http_timeout = httpx.Timeout(
+        timeout.total_seconds(), read=sse_read_timeout.total_seconds()
+    )
+    client = shared_client(
+        http2=http2,
+        compression=compression,
+        compress_requests=compress_requests,
+        plain_http=url.startswith("http://"),
+        timeout=http_timeout,
+    )
+    own_clients = AsyncExitStack()
+
+    read_stream_writer, read_stream = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](0)
+    write_stream, write_stream_reader = anyio.create_memory_object_stream[
+        SessionMessage
+    ](0)
+
+    async with own_clients, anyio.create_task_group() as tg:
+        try:
+
+            def start_get_stream() -> None:
+                get_client = httpx.AsyncClient(
+                    headers=client.headers,
+                    timeout=http_timeout,
+                    follow_redirects=True,
+                )
+                own_clients.push_async_callback(get_client.aclose)
+                tg.start_soon(
+                    transport.handle_get_stream, get_client, read_stream_writer
+                )
+
+            tg.start_soon(
+                transport.post_writer,
+                client,
+                write_stream_reader,
+                read_stream_writer,
+                write_stream,
+                start_get_stream,
+                tg,
+            )
+            try:
+                yield read_stream, write_stream, transport.get_session_id
+            finally:
+                if transport.session_id and terminate_on_close:
+                    await transport.terminate_session(client)
+                tg.cancel_scope.cancel()
+        finally:
+            await read_stream_writer.aclose()
+            await write_stream.aclose()
+
+
+def shared_client(
+    *,
+    http2: bool,
+    compression: Compression | None,
+    compress_requests: bool,
+    plain_http: bool,
+    timeout: httpx.Timeout,
+) -> httpx.AsyncClient:
+    """The running loop's client for this configuration (created once)."""
+    clients = _clients.setdefault(asyncio.get_running_loop(), {})
+    key = (http2, compression, compress_requests, plain_http, repr(timeout))
+    client = clients.get(key)
+    if client is None or client.is_closed:
+        client = clients[key] = _new_client(
+            http2=http2,
+            compression=compression,
+            compress_requests=compress_requests,
+            plain_http=plain_http,
+            timeout=timeout,
+        )
+    return client
+
+
+async def close_clients() -> None:
+    """Close the shared clients of the running loop."""
+    clients = _clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
+
+
+bg_runner.add_loop_finalizer(close_clients)
+
+
+def compress(body: bytes, encoding: Compression) -> bytes:
+    if encoding == "br":
+        compressed: bytes = _brotli().compress(body)
+        return compressed
+    return gzip.compress(body, compresslevel=6)
+
+
+class CompressingTransport(httpx.AsyncBaseTransport):
+    """Compress large request bodies before handing them to *inner*."""
+
+    def __init__(
+        self,
+        inner: httpx.AsyncBaseTransport,
+        encoding: Compression,
+        min_bytes: int = COMPRESS_MIN_BYTES,
+    ):
+        self.inner = inner
+        self.encoding = encoding
+        self.min_bytes = min_bytes
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        if request.method == "POST" and "content-encoding" not in (
+            request.headers
+        ):
+            body = await request.aread()
+            if len(body) >= self.min_bytes:
+                headers = request.headers.copy()
+                headers["Content-Encoding"] = self.encoding
+                del headers["Content-Length"]
+                request = httpx.Request(
+                    request.method,
+                    request.url,
+                    headers=headers,
+                    content=compress(body, self.encoding),
+                    extensions=request.extensions,
+                )
+        return await self.inner.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ShieldedTransport(httpx.AsyncBaseTransport):
+    """Run each request of *inner* in a task its caller cannot cancel.
+
+    A cancelled caller stops waiting at once; the request carries on in
+    the background and its response is closed when it arrives.  Reads of
+    the response body are shielded the same way.
+    """
+
+    def __init__(self, inner: httpx.AsyncBaseTransport):
+        self.inner = inner
+
+    async def handle_async_request(
+        self, request: httpx.Request
+    ) -> httpx.Response:
+        task = asyncio.ensure_future(self.inner.handle_async_request(request))
+        try:
+            response = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            task.add_done_callback(_close_abandoned)
+            raise
+        return httpx.Response(
+            response.status_code,
+            headers=response.headers,
+            stream=_ShieldedStream(response.stream),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+# private functions
+
+
+class _ShieldedStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream | httpx.SyncByteStream):
+        assert isinstance(stream, httpx.AsyncByteStream)
+        self._stream = stream
+        self._step: asyncio.Future[bytes | None] | None = None
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        chunks = aiter(self._stream)
+        while True:
+            self._step = asyncio.ensure_future(anext(chunks, None))
+            chunk = await asyncio.shield(self._step)
+            if chunk is None:
+                return
+            yield chunk
+
+    async def aclose(self) -> None:
+        step = self._step
+        if step is not None and not step.done():
+            # finish the abandoned read before closing the stream
+            step.add_done_callback(lambda _: _spawn(self._stream.aclose()))
+            return
+        await self._stream.aclose()
+
+
+def _close_abandoned(task: asyncio.Future[httpx.Response]) -> None:
+    if not task.cancelled() and task.exception() is None:
+        _spawn(task.result().aclose())
+
+
+# keeps clean-up tasks alive until they are done
+_background: set[asyncio.Future[None]] = set()
+
+
+def _spawn(coro: Coroutine[Any, Any, None]) -> None:
+    task = asyncio.ensure_future(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+
+_clients: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[tuple[Any, ...], httpx.AsyncClient]
+] = weakref.WeakKeyDictionary()
+
+
+def _new_client(
+    *,
+    http2: bool,
+    compression: Compression | None,
+    compress_requests: bool,
+    plain_http: bool,
+    timeout: httpx.Timeout,
+) -> httpx.AsyncClient:
+    transport: httpx.AsyncBaseTransport = ShieldedTransport(
+        httpx.AsyncHTTPTransport(
+            http2=http2,
+            # without TLS there is no protocol negotiation: speak h2 directly
+            http1=not (http2 and plain_http),
+        )
+    )
+    headers = {}
+    if compression is not None:
+        if compression == "br":
+            _brotli()  # httpx only decodes br when brotli is installed
+        headers["Accept-Encoding"] = (
+            "br, gzip" if compression == "br" else "gzip"
+        )
+        if compress_requests:
+            transport = CompressingTransport(transport, compression)
+    return httpx.AsyncClient(
+        transport=transport,
+        headers=headers,
+        timeout=timeout,
+        follow_redirects=True,
+    )
+
+
+def _brotli() -> Any:
+    try:
+        return importlib.import_module("brotli")
+    except ImportError as e:
+        raise ImportError(
+            "Brotli compression needs the 'brotli' package; install it "
+            "with `pip install 'llm-mcp[brotli]'`."
+        ) from e
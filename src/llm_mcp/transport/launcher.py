@@ -0,0 +1,85 @@
+"""
+Apply resource limits, then exec an MCP server in the same process.
+
+Run as a script (``python launcher.py [options] -- command args...``) in
+place of a stdio server's command when its parameters carry
+``process_limits``.  The launcher sets the rlimits and niceness on itself,
+writes its pid to ``--pid-file`` and replaces itself with the server, so
+the server inherits the limits, keeps the launcher's pid and talks to the
+client over the same stdin / stdout.
+
+Only the standard library may be imported here: the script must start
+quickly and without importing llm-mcp.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+# option name -> rlimit name
+LIMITS = {"as": "RLIMIT_AS", "cpu": "RLIMIT_CPU", "nofile": "RLIMIT_NOFILE"}
+
+
+def command(
+    argv: list[str],
+    pid_file: str,
+    *,
+    rlimits: dict[str, int],
+    nice: int | None = None,
+) -> list[str]:
+    """Return the launcher command line that runs *argv* under limits."""
+    options = [f"--pid-file={pid_file}"]
+    options += [f"--{name}={value}" for name, value in rlimits.items()]
+    if nice:
+        options.append(f"--nice={nice}")
+    return [sys.executable, os.path.abspath(__file__), *options, "--", *argv]
+
+
+def main(args: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="llm-mcp-launcher")
+    parser.add_argument("--pid-file", required=True)
+    for name in LIMITS:
+        parser.add_argument(f"--{name}", type=int)
+    parser.add_argument("--nice", type=int, default=0)
+    parser.add_argument("argv", nargs=argparse.REMAINDER)
+    options = parser.parse_args(args)
+    argv = options.argv[1:] if options.argv[:1] == ["--"] else options.argv
+    if not argv:
+        parser.error("missing server command")
+
+    for name, limit in LIMITS.items():
+        value = getattr(options, name)
+        if value is not None and resource is not None:
+            _set_limit(getattr(resource, limit), value)
+    if options.nice:
+        os.nice(options.nice)
+
+    with open(options.pid_file, "w") as f:
+        f.write(str(os.getpid()))
+    try:
+        os.execvp(argv[0], argv)  # noqa: S606
+    except OSError as e:
+        sys.stderr.write(f"llm-mcp-launcher: cannot run {argv[0]!r}: {e}\n")
+        sys.exit(127)
+
+
+# private functions
+
+
+def _set_limit(which: int, value: int) -> None:
+    # a process may lower but never raise its hard limit
+    _, hard = resource.getrlimit(which)
+    if hard != resource.RLIM_INFINITY:
+        value = min(value, hard)
+    resource.setrlimit(which, (value, value))
+
+
+if __name__ == "__main__":
+    main()
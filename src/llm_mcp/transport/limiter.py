@@ -0,0 +1,176 @@
+"""
+Client-side rate and concurrency limits for tool calls.
+
+:class:`Limiter` combines a token bucket (``rate`` calls per second with
+up to ``burst`` calls back-to-back) and a cap on calls in flight.  One
+limiter is kept per server (``ServerConfig.limits``) and per tool
+(``ServerConfig.tool_limits``); :pyfunc:`limited` holds a slot in both
+around a call, *before* anything is spawned or sent.
+
+Callers that find no free slot wait instead of failing.  Waiting ends
+when a token becomes available or another call finishes, or with
+:class:`LimitTimeout` once ``queue_timeout`` has passed.  State is guarded
+by a :class:`threading.Lock` and waiters are woken with
+``call_soon_threadsafe``, so calls issued from different event-loops
+share the same limits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
+
+from ..schema import CallLimits, ServerConfig
+
+
+class LimitTimeout(TimeoutError):
+    """A call waited longer than ``queue_timeout`` for a free slot."""
+
+
+class Limiter:
+    """Token bucket plus concurrency cap, shared across event-loops."""
+
+    def __init__(
+        self,
+        limits: CallLimits,
+        name: str = "",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.limits = limits
+        self.name = name
+        self._clock = clock
+        self._tokens = float(limits.burst)
+        self._updated = clock()
+        self.active = 0
+        self._lock = threading.Lock()
+        self._waiters: set[
+            tuple[asyncio.AbstractEventLoop, asyncio.Future[None]]
+        ] = set()
+
+    async def acquire(self, deadline: float | None = None) -> None:
+        """Wait for a slot; raise :class:`LimitTimeout` after *deadline*."""
+        if deadline is None:
+            deadline = self._clock() + self.limits.queue_timeout
+        loop = asyncio.get_running_loop()
+
+        while True:
+            with self._lock:
+                delay = self._try_take()
+                if delay == 0.0:
+                    return
+                waiter = (loop, loop.create_future())
+                self._waiters.add(waiter)
+
+            remaining = deadline - self._clock()
+            try:
+                if remaining <= 0:
+                    raise LimitTimeout(
+                        f"no free slot for {self.name or 'call'} within "
+                        f"{self.limits.queue_timeout:g}s"
+                    )
+                await asyncio.wait([waiter[1]], timeout=min(delay, remaining))
+            finally:
+                with self._lock:
+                    self._waiters.discard(waiter)
+
+    def release(self) -> None:
+        """Free the concurrency slot taken by :pyfunc:`acquire`."""
+        with self._lock:
+            self.active -= 1
+            waiters = list(self._waiters)
+        for loop, future in waiters:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(_wake, future)
+
+    @asynccontextmanager
+    async def slot(self, deadline: float | None = None) -> AsyncIterator[None]:
+        await self.acquire(deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def _try_take(self) -> float:
+        """Take a slot and return 0, or return how long to wait for one.
+
+        ``math.inf`` means waiting for a running call to finish.
+        """
+        limits = self.limits
+        if limits.max_concurrency and self.active >= limits.max_concurrency:
+            return math.inf
+
+        if limits.rate is not None:
+            now = self._clock()
+            self._tokens = min(
+                float(limits.burst),
+                self._tokens + (now - self._updated) * limits.rate,
+            )
+            self._updated = now
+            if self._tokens < 1.0:
+                return (1.0 - self._tokens) / limits.rate
+            self._tokens -= 1.0
+
+        self.active += 1
+        return 0.0
+
+
+_limiters: dict[tuple[str, str | None], Limiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_limiter(
+    config: ServerConfig, tool_name: str | None = None
+) -> Limiter | None:
+    """Return the shared limiter of the server or of one of its tools."""
+    limits = (
+        config.limits
+        if tool_name is None
+        else config.tool_limits.get(tool_name)
+    )
+    if limits is None:
+        return None
+
+    key = (config.name, tool_name)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None or limiter.limits != limits:
+            name = config.name if tool_name is None else tool_name
+            limiter = _limiters[key] = Limiter(limits, name=name)
+        return limiter
+
+
+@asynccontextmanager
+async def limited(config: ServerConfig, tool_name: str) -> AsyncIterator[None]:
+    """Hold a slot of the tool's and the server's limiter (if any).
+
+    The narrower tool limit is taken first so a call waiting for it does
+    not occupy one of the server's slots meanwhile.
+    """
+    limiters = [
+        limiter
+        for limiter in (
+            get_limiter(config, tool_name),
+            get_limiter(config),
+        )
+        if limiter is not None
+    ]
+    if not limiters:
+        yield
+        return
+
+    deadline = time.monotonic() + min(
+        limiter.limits.queue_timeout for limiter in limiters
+    )
+    async with AsyncExitStack() as stack:
+        for limiter in limiters:
+            await stack.enter_async_context(limiter.slot(deadline))
+        yield
+
+
+def _wake(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,261 @@
+"""
+Event-loop lag and slow-callback monitor for the background runner.
+
+Every coroutine submitted through :pyfunc:`run_async` shares the
+``llm-mcp-bg`` loop, so a single CPU-heavy step stalls all other calls.
+:class:`LoopMonitor` makes such stalls visible:
+
+* a **heartbeat** coroutine on the loop sleeps for ``interval`` seconds and
+  records how late it wakes up (the loop lag) along with the number of
+  pending tasks;
+* a **watchdog** thread notices when the heartbeat has not run for longer
+  than ``slow_threshold`` and captures the loop thread's stack, i.e. the
+  code that is blocking the loop right now;
+* a :class:`StatusWriter` refreshes a status file
+  (``<mcp_dir>/monitor/<pid>.json``) so ``llm mcp monitor`` can inspect a
+  live process.
+
+Enable it with ``LLM_MCP_LOOP_MONITOR=1`` or
+:pyfunc:`llm_mcp.transport.bg_runner.enable_monitor`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+ENV_VAR = "LLM_MCP_LOOP_MONITOR"
+
+# slow callbacks and lag samples kept in memory
+MAX_SLOW_CALLBACKS = 20
+LAG_WINDOW = 600
+
+# frames of the blocking stack kept per slow callback
+STACK_LIMIT = 25
+
+
+def enabled_by_env() -> bool:
+    return os.environ.get(ENV_VAR, "").lower() in ("1", "true", "yes", "on")
+
+
+class LoopMonitor:
+    """Measure lag and capture blocking stacks for one event-loop."""
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        thread: threading.Thread,
+        *,
+        interval: float = 0.1,
+        slow_threshold: float = 0.25,
+    ):
+        self.loop = loop
+        self.thread = thread
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.pending_tasks = 0
+        self.slow_callbacks: deque[dict[str, Any]] = deque(
+            maxlen=MAX_SLOW_CALLBACKS
+        )
+        self._lags: deque[float] = deque(maxlen=LAG_WINDOW)
+        self._max_lag = 0.0
+        self._last_beat = time.monotonic()
+        self._stalled_beat: float | None = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watchdog: threading.Thread | None = None
+        self._heartbeat: asyncio.Future[None] | None = None
+
+    def start(self) -> None:
+        """Start the heartbeat on the loop and the watchdog thread."""
+        self._last_beat = time.monotonic()
+        self.loop.call_soon_threadsafe(self._start_heartbeat)
+        self._watchdog = threading.Thread(
+            target=self._watch,
+            name=f"{self.thread.name}-monitor",
+            daemon=True,
+        )
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        """Stop the heartbeat and the watchdog (idempotent)."""
+        self._stop.set()
+        heartbeat = self._heartbeat
+        if heartbeat is not None and not self.loop.is_closed():
+            self.loop.call_soon_threadsafe(heartbeat.cancel)
+        if self._watchdog is not None and self._watchdog.is_alive():
+            self._watchdog.join(timeout=2)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current measurements as plain, JSON-ready data."""
+        with self._lock:
+            last = self._lags[-1] if self._lags else 0.0
+            lags = sorted(self._lags)
+            slow = list(self.slow_callbacks)
+            max_lag = self._max_lag
+        p99 = lags[round(0.99 * (len(lags) - 1))] if lags else 0.0
+        return {
+            "lag_ms": {
+                "last": _ms(last),
+                "avg": _ms(sum(lags) / len(lags) if lags else 0.0),
+                "p99": _ms(p99),
+                "max": _ms(max_lag),
+            },
+            "pending_tasks": self.pending_tasks,
+            "slow_callbacks": slow,
+        }
+
+    # heartbeat (runs on the monitored loop)
+
+    def _start_heartbeat(self) -> None:
+        self._heartbeat = asyncio.ensure_future(self._beat())
+
+    async def _beat(self) -> None:
+        while not self._stop.is_set():
+            self._last_beat = time.monotonic()
+            self.pending_tasks = len(asyncio.all_tasks())
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - self._last_beat - self.interval)
+            self._record_lag(lag)
+
+    def _record_lag(self, lag: float) -> None:
+        with self._lock:
+            self._lags.append(lag)
+            self._max_lag = max(self._max_lag, lag)
+            # the stall the watchdog reported is over: store its duration
+            if self._stalled_beat is not None:
+                self._stalled_beat = None
+                if self.slow_callbacks:
+                    self.slow_callbacks[-1]["duration_ms"] = _ms(lag)
+
+    # watchdog (runs on its own thread)
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.interval):
+            beat = self._last_beat
+            stalled = time.monotonic() - beat - self.interval
+            if stalled >= self.slow_threshold and self._stalled_beat != beat:
+                self._capture(beat, stalled)
+
+    def _capture(self, beat: float, stalled: float) -> None:
+        frame = sys._current_frames().get(self.thread.ident or -1)
+        stack = (
+            traceback.format_stack(frame, limit=STACK_LIMIT) if frame else []
+        )
+        record = {
+            "time": time.time(),
+            "duration_ms": _ms(stalled),
+            "stack": "".join(stack),
+        }
+        with self._lock:
+            self._stalled_beat = beat
+            self.slow_callbacks.append(record)
+        logger.warning(
+            "llm-mcp event-loop %r blocked for %.0f ms:\n%s",
+            self.thread.name,
+            record["duration_ms"],
+            record["stack"],
+        )
+
+
+class StatusWriter:
+    """Periodically write ``source()`` as JSON to *path* from a thread."""
+
+    def __init__(
+        self,
+        path: Path,
+        source: Callable[[], dict[str, Any]],
+        *,
+        every: float = 5.0,
+    ):
+        self.path = path
+        self.source = source
+        self.every = every
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="llm-mcp-status", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop writing and remove the status file (idempotent)."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2)
+        self.path.unlink(missing_ok=True)
+
+    def _run(self) -> None:
+        while True:
+            self.write()
+            if self._stop.wait(self.every):
+                return
+
+    def write(self) -> None:
+        data = {"pid": os.getpid(), "time": time.time(), **self.source()}
+        try:
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data))
+            tmp.replace(self.path)
+        except OSError:  # pragma: no cover - diagnostics must never fail
+            logger.debug("could not write %s", self.path, exc_info=True)
+
+
+def status_dir(kind: str = "monitor") -> Path:
+    """Directory holding one *kind* status file per monitored process."""
+    from .. import store
+
+    path = store.mcp_dir() / kind
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def status_path(kind: str = "monitor") -> Path:
+    return status_dir(kind) / f"{os.getpid()}.json"
+
+
+def read_status(kind: str = "monitor") -> list[dict[str, Any]]:
+    """Load the status of every live monitored process.
+
+    Files left behind by processes that are no longer running are removed.
+    """
+    statuses = []
+    for path in sorted(status_dir(kind).glob("*.json")):
+        try:
+            data = json.loads(path.read_text())
+        except (OSError, ValueError):
+            continue
+        if _pid_alive(int(data.get("pid", 0))):
+            statuses.append(data)
+        else:
+            path.unlink(missing_ok=True)
+    return statuses
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
@@ -0,0 +1,103 @@
+"""
+Cursor pagination of ``tools/list``.
+
+Servers with large catalogs split ``tools/list`` into pages linked by an
+opaque ``nextCursor``.  :pyfunc:`tool_pages` follows the cursors to the
+last page and hands every page to a callback as soon as it arrives, so
+the caller can persist it and let it go instead of holding the whole
+catalog until the end (see :pyfunc:`llm_mcp.manager.add_server`).  Each
+page has to arrive within ``LLM_MCP_LIST_PAGE_TIMEOUT`` seconds (default
+30, ``0`` for no limit).
+"""
+
+import os
+from collections.abc import Callable
+from typing import cast
+
+import anyio
+from mcp import types
+from mcp.client.session import ClientSession
+
+PAGE_TIMEOUT_ENV_VAR = "LLM_MCP_LIST_PAGE_TIMEOUT"
+
+# pages followed before a server is assumed to be looping
+MAX_PAGES = 100_000
+
+# receives a page of tools and the cursor of the next page (None after the
+# last one)
+OnPage = Callable[[list[types.Tool], str | None], None]
+
+
+class PageTimeout(TimeoutError):
+    """A page of ``tools/list`` did not arrive in time."""
+
+
+class CursorLoop(RuntimeError):
+    """The server handed out a cursor it had already returned."""
+
+
+# failures of a listing, as opposed to failures of the connection
+FAILURES = (PageTimeout, CursorLoop)
+
+
+async def tool_pages(
+    session: ClientSession,
+    on_page: OnPage,
+    *,
+    cursor: str | None = None,
+    timeout: float | None = None,
+) -> int:
+    """Request every page of ``tools/list``, starting at *cursor*.
+
+    *timeout* (default :pyfunc:`page_timeout`) bounds each page on its
+    own.  Returns the number of tools listed.
+    """
+    if timeout is None:
+        timeout = page_timeout()
+    seen = {cursor}
+    count = 0
+    for number in range(1, MAX_PAGES + 1):
+        try:
+            with anyio.fail_after(timeout):
+                result = await session.send_request(
+                    _list_tools_request(cursor), types.ListToolsResult
+                )
+        except TimeoutError:
+            raise PageTimeout(
+                f"Page {number} of tools/list did not arrive within "
+                f"{timeout:g}s"
+            ) from None
+        cursor = result.nextCursor or None
+        if cursor in seen and cursor is not None:
+            raise CursorLoop(f"tools/list returned cursor {cursor!r} twice")
+        seen.add(cursor)
+        count += len(result.tools)
+        on_page(result.tools, cursor)
+        if cursor is None:
+            return count
+    raise CursorLoop(f"tools/list did not end after {MAX_PAGES} pages")
+
+
+def page_timeout() -> float | None:
+    """Seconds a page may take (``LLM_MCP_LIST_PAGE_TIMEOUT``)."""
+    value = float(os.environ.get(PAGE_TIMEOUT_ENV_VAR) or 30)
+    return value if value > 0 else None
+
+
+# private functions
+
+
+class _PageParams(types.RequestParams):
+    cursor: str | None = None
+
+
+class _ListToolsRequest(types.ListToolsRequest):
+    params: _PageParams | None = None
+
+
+def _list_tools_request(cursor: str | None) -> types.ClientRequest:
+    # ClientSession.list_tools (mcp 1.9) sends the cursor beside "params"
+    # instead of inside, where servers look for it
+    params = _PageParams(cursor=cursor) if cursor is not None else None
+    request = _ListToolsRequest(method="tools/list", params=params)
+    return cast(types.ClientRequest, request)
@@ -0,0 +1,205 @@
+"""
+Long-lived MCP sessions shared across requests.
+
+Tool calls open a fresh session per call.  Features that need server-side
+state to outlive a request - such as resource subscriptions - use the one
+pooled session kept per server instead.
+
+A :class:`PooledSession` is owned by a keeper task that opens the
+transport, waits until the session is closed and then tears it down, so
+the transport's task groups are entered and exited by the same task.
+Sessions are bound to the loop that created them; callers reach them
+through :pyfunc:`llm_mcp.transport.bg_runner.submit` with the server name
+as key, which always lands on the same background loop.
+
+Listeners registered with :pyfunc:`add_listener` receive every server
+notification of a pooled session, and ``None`` once it has closed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import concurrent.futures
+import logging
+import threading
+from collections.abc import Callable
+from contextlib import AbstractAsyncContextManager
+from typing import Any
+
+from mcp import types
+from mcp.client.session import ClientSession
+
+from ..schema import RemoteServerParameters, ServerConfig
+from . import cancellation, http, processes, stdio
+
+logger = logging.getLogger(__name__)
+
+Listener = Callable[[str, types.ServerNotification | None], None]
+
+
+class PooledSession:
+    """One long-lived session to a server, owned by a keeper task."""
+
+    def __init__(self, config: ServerConfig):
+        self.config = config
+        self.loop = asyncio.get_running_loop()
+        self.closed = False
+        self.subscriptions: set[str] = set()
+        self.can_subscribe = True
+        self.process: processes.ServerProcess | None = None
+        self._session: ClientSession | None = None
+        self._ready: asyncio.Future[None] = self.loop.create_future()
+        self._closing = asyncio.Event()
+        self._keeper: asyncio.Task[None] | None = None
+
+    @property
+    def session(self) -> ClientSession:
+        if self._session is None:
+            raise RuntimeError(f"session to {self.config.name!r} is closed")
+        return self._session
+
+    @property
+    def recycle_due(self) -> bool:
+        """True if the server process outgrew its ``recycle_rss_mb``."""
+        return self.process is not None and self.process.recycle_due
+
+    async def responsive(self) -> bool:
+        """False if the server exited or no longer answers."""
+        if self._session is None:
+            return True
+        if stdio.exited(self._session):
+            return False
+        return await cancellation.responsive(self._session)
+
+    def start(self) -> None:
+        self._keeper = self.loop.create_task(self._keep())
+
+    async def ready(self) -> None:
+        """Wait until the handshake is done (or raise why it failed)."""
+        await asyncio.shield(self._ready)
+
+    async def close(self) -> None:
+        """Close the session and wait for the transport to shut down."""
+        self._closing.set()
+        if self._keeper is not None:
+            await asyncio.wait([self._keeper], timeout=5)
+
+    async def _keep(self) -> None:
+        params = self.config.parameters
+        opener: AbstractAsyncContextManager[ClientSession]
+        if isinstance(params, RemoteServerParameters):
+            opener = http.open_session(params, self._handle)
+        else:
+            opener = stdio.open_session(
+                params, self._handle, server=self.config.name
+            )
+        try:
+            async with opener as session:
+                self._session = session
+                self.process = stdio.process_of(session)
+                self._ready.set_result(None)
+                await self._closing.wait()
+        except Exception as exc:
+            if self._ready.done():
+                logger.debug("pooled session %r failed", self.config.name)
+            else:
+                self._ready.set_exception(exc)
+        finally:
+            self.closed = True
+            self._session = None
+            if not self._ready.done():  # cancelled during the handshake
+                self._ready.set_exception(
+                    RuntimeError(f"session to {self.config.name!r} closed")
+                )
+            if _pool.get(self.config.name) is self:
+                del _pool[self.config.name]
+            _notify(self.config.name, None)
+
+    async def _handle(self, message: Any) -> None:
+        if isinstance(message, types.ServerNotification):
+            _notify(self.config.name, message)
+
+
+def add_listener(listener: Listener) -> None:
+    with _listeners_lock:
+        _listeners.append(listener)
+
+
+async def get_session(config: ServerConfig) -> PooledSession:
+    """Return the open pooled session of *config*, connecting if needed.
+
+    Must run on the loop that owns the server's sessions (see module doc).
+    """
+    pooled = _pool.get(config.name)
+    if pooled is not None and pooled.recycle_due:
+        logger.info(
+            "recycling %r: server process uses too much memory", config.name
+        )
+    if pooled is not None and (
+        pooled.closed
+        or pooled.recycle_due
+        or pooled.config.parameters != config.parameters
+        or not await pooled.responsive()
+    ):
+        await discard(pooled)
+        pooled = None
+
+    if pooled is None:
+        pooled = _pool[config.name] = PooledSession(config)
+        pooled.start()
+    await pooled.ready()
+    return pooled
+
+
+async def discard(pooled: PooledSession) -> None:
+    """Drop *pooled* from the pool and close it (e.g. after an error)."""
+    if _pool.get(pooled.config.name) is pooled:
+        del _pool[pooled.config.name]
+    await pooled.close()
+
+
+async def close(name: str) -> None:
+    """Close the pooled session of server *name*, if it has one.
+
+    Must run on the loop that owns the server's sessions.
+    """
+    pooled = _pool.get(name)
+    if pooled is not None:
+        await discard(pooled)
+
+
+def sessions() -> list[str]:
+    """Names of the servers that have a pooled session."""
+    return sorted(_pool)
+
+
+@atexit.register
+def close_all() -> None:
+    """Close every pooled session from outside its loop (idempotent)."""
+    futures = [
+        asyncio.run_coroutine_threadsafe(pooled.close(), pooled.loop)
+        for pooled in list(_pool.values())
+        if pooled.loop.is_running()
+    ]
+    concurrent.futures.wait(futures, timeout=5)
+
+
+# private functions
+
+
+_pool: dict[str, PooledSession] = {}
+_listeners: list[Listener] = []
+_listeners_lock = threading.Lock()
+
+
+def _notify(
+    server: str, notification: types.ServerNotification | None
+) -> None:
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for listener in listeners:
+        try:
+            listener(server, notification)
+        except Exception:  # pragma: no cover - listeners must not break IO
+            logger.exception("pool listener failed")
@@ -0,0 +1,233 @@
+"""
+Resource limits and usage accounting of spawned stdio servers.
+
+Servers whose parameters carry ``process_limits`` are started through
+:mod:`.launcher`, which applies the limits and reports the server's pid.
+While a session to such a server is open its process is *tracked*: a
+status thread samples the resident memory and CPU time of every tracked
+process every ``LLM_MCP_PROCESS_SAMPLE_SECONDS`` (default 5) seconds,
+records them as trace counters when tracing is enabled and writes them to
+a status file read by ``llm mcp servers processes``.
+
+A process whose resident memory exceeds ``recycle_rss_mb`` is flagged
+:pyattr:`ServerProcess.recycle_due`; the session pool closes and respawns
+it before its next use, so calls in flight are never cut off.
+"""
+
+from __future__ import annotations
+
+import atexit
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .. import tracing
+from ..schema import ProcessLimits, StdioServerParameters
+from . import launcher, monitor
+
+SAMPLE_ENV_VAR = "LLM_MCP_PROCESS_SAMPLE_SECONDS"
+
+STATUS_KIND = "processes"
+
+MB = 1024 * 1024
+
+
+@dataclass
+class ServerProcess:
+    """Latest resource usage of one tracked server process."""
+
+    pid: int
+    server: str
+    recycle_rss: int | None = None
+    started: float = field(default_factory=time.time)
+    rss: int | None = None
+    peak_rss: int = 0
+    cpu_seconds: float = 0.0
+
+    @property
+    def recycle_due(self) -> bool:
+        """True once resident memory went above the recycle threshold."""
+        if self.recycle_rss is None or self.rss is None:
+            return False
+        return self.rss > self.recycle_rss
+
+    def sample(self) -> bool:
+        """Refresh the usage figures; False if the process is gone."""
+        usage = read_usage(self.pid)
+        if usage is None:
+            return False
+        self.rss, self.cpu_seconds = usage
+        self.peak_rss = max(self.peak_rss, self.rss)
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "recycle_due": self.recycle_due}
+
+
+def launch_params(
+    params: StdioServerParameters, pid_file: Path
+) -> StdioServerParameters:
+    """Return *params* rewritten to start the server through the launcher."""
+    limits = params.process_limits or ProcessLimits()
+    rlimits = {
+        "as": limits.max_memory_mb and limits.max_memory_mb * MB,
+        "cpu": limits.cpu_seconds,
+        "nofile": limits.max_open_files,
+    }
+    argv = launcher.command(
+        [params.command, *params.args],
+        str(pid_file),
+        rlimits={k: v for k, v in rlimits.items() if v is not None},
+        nice=limits.nice,
+    )
+    return params.model_copy(update={"command": argv[0], "args": argv[1:]})
+
+
+@contextmanager
+def pid_file() -> Iterator[Path]:
+    """Temporary file the launcher writes the server's pid to."""
+    fd, name = tempfile.mkstemp(prefix="llm-mcp-", suffix=".pid")
+    os.close(fd)
+    path = Path(name)
+    try:
+        yield path
+    finally:
+        path.unlink(missing_ok=True)
+
+
+@contextmanager
+def track(
+    pid: int, server: str, limits: ProcessLimits
+) -> Iterator[ServerProcess]:
+    """Sample *pid* until the ``with`` block (the session) ends."""
+    recycle_rss = limits.recycle_rss_mb and limits.recycle_rss_mb * MB
+    process = ServerProcess(pid, server, recycle_rss=recycle_rss)
+    process.sample()
+    with _lock:
+        _live[pid] = process
+        _totals[server]["spawned"] += 1
+    _start_writer()
+    try:
+        yield process
+    finally:
+        process.sample()  # last reading, the process is still running
+        with _lock:
+            _live.pop(pid, None)
+            totals = _totals[server]
+            totals["exited"] += 1
+            totals["recycled"] += process.recycle_due
+            totals["cpu_seconds"] += process.cpu_seconds
+            totals["peak_rss"] = max(totals["peak_rss"], process.peak_rss)
+
+
+def snapshot() -> dict[str, Any]:
+    """Live processes plus per-server totals of the exited ones."""
+    with _lock:
+        return {
+            "processes": [p.as_dict() for p in _live.values()],
+            "servers": {name: dict(t) for name, t in _totals.items()},
+        }
+
+
+def sample_all() -> dict[str, Any]:
+    """Sample every tracked process and return the new :pyfunc:`snapshot`."""
+    with _lock:
+        live = list(_live.values())
+    for process in live:
+        if process.sample() and tracing.enabled():
+            tracing.counter(
+                f"{process.server} pid {process.pid}",
+                rss_mb=round((process.rss or 0) / MB, 1),
+                cpu_seconds=process.cpu_seconds,
+            )
+    return snapshot()
+
+
+def read_usage(pid: int) -> tuple[int, float] | None:
+    """Resident bytes and CPU seconds used by *pid*, None if it is gone."""
+    try:
+        if sys.platform == "linux":
+            return _proc_usage(pid)
+        return _ps_usage(pid)
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def sample_seconds() -> float:
+    return float(os.environ.get(SAMPLE_ENV_VAR) or 5)
+
+
+def read_status() -> list[dict[str, Any]]:
+    """Snapshots written by every running llm-mcp process."""
+    return monitor.read_status(STATUS_KIND)
+
+
+# private functions
+
+
+_live: dict[int, ServerProcess] = {}
+_totals: defaultdict[str, dict[str, Any]] = defaultdict(
+    lambda: {
+        "spawned": 0,
+        "exited": 0,
+        "recycled": 0,
+        "cpu_seconds": 0.0,
+        "peak_rss": 0,
+    }
+)
+_lock = threading.Lock()
+_writer: monitor.StatusWriter | None = None
+
+
+def _start_writer() -> None:
+    global _writer
+    with _lock:
+        if _writer is not None:
+            return
+        _writer = monitor.StatusWriter(
+            monitor.status_path(STATUS_KIND),
+            sample_all,
+            every=sample_seconds(),
+        )
+    _writer.start()
+    atexit.register(_writer.stop)
+
+
+def _proc_usage(pid: int) -> tuple[int, float] | None:
+    stat = Path(f"/proc/{pid}/stat").read_text()
+    # fields after the command name, which may itself contain spaces
+    fields = stat.rpartition(")")[2].split()
+    if fields[0] == "Z":
+        return None
+    ticks = int(fields[11]) + int(fields[12])  # utime + stime
+    pages = int(fields[21])
+    return (
+        pages * os.sysconf("SC_PAGE_SIZE"),
+        ticks / os.sysconf("SC_CLK_TCK"),
+    )
+
+
+def _ps_usage(pid: int) -> tuple[int, float] | None:
+    result = subprocess.run(  # noqa: S603
+        ["ps", "-o", "rss=,time=", "-p", str(pid)],  # noqa: S607
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    rss_kb, cpu_time = result.stdout.split()
+    days, _, clock = cpu_time.rpartition("-")
+    seconds = 0.0
+    for part in clock.split(":"):
+        seconds = seconds * 60 + float(part)
+    return int(rss_kb) * 1024, seconds + int(days or 0) * 86400
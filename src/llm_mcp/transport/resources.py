@@ -0,0 +1,165 @@
+"""
+MCP resources: ``resources/list`` and cached ``resources/read``.
+
+Resources are requested over the server's pooled session (see
+:mod:`.pool`).  Before a URI is read for the first time the client
+subscribes to it; as long as the subscription holds, the contents are
+kept in a cache keyed by ``(server, uri)`` and later reads are answered
+locally.  A ``notifications/resources/updated`` for the URI, or the pooled
+session closing, drops the entry so the next read fetches it again.
+Servers that do not support subscriptions are read every time, because
+nothing would tell the client that a cached copy went stale.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import Counter
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+from mcp import types
+from mcp.shared.exceptions import McpError
+from pydantic import AnyUrl
+
+from ..schema import ServerConfig
+from . import bg_runner, pool
+
+T = TypeVar("T")
+
+ResourceContents = types.TextResourceContents | types.BlobResourceContents
+
+
+async def list_resources(config: ServerConfig) -> list[types.Resource]:
+    """Return every resource published by the server (all pages)."""
+    return await _on_server_loop(config, _list(config))
+
+
+async def read_resource(
+    config: ServerConfig, uri: str
+) -> list[ResourceContents]:
+    """Return the contents of *uri*, from the cache when still valid."""
+    return await _on_server_loop(config, _read(config, uri))
+
+
+def list_resources_sync(config: ServerConfig) -> list[types.Resource]:
+    return bg_runner.submit(_list(config), key=config.name).result()
+
+
+def read_resource_sync(
+    config: ServerConfig, uri: str
+) -> list[ResourceContents]:
+    return bg_runner.submit(_read(config, uri), key=config.name).result()
+
+
+def cache_stats() -> dict[str, int]:
+    """Cached entries plus cache hits and misses since start-up."""
+    with _cache_lock:
+        return {"entries": len(_cache), **_counts}
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        for server in {server for server, _ in _cache}:
+            _epochs[server] += 1
+        _cache.clear()
+
+
+# private functions
+
+
+_cache: dict[tuple[str, str], list[ResourceContents]] = {}
+_cache_lock = threading.Lock()
+# bumped on every invalidation, so a read that raced one is not cached
+_epochs: Counter[str] = Counter()
+_counts: Counter[str] = Counter(hits=0, misses=0)
+
+
+async def _on_server_loop(
+    config: ServerConfig, coro: Coroutine[Any, Any, T]
+) -> T:
+    return await asyncio.wrap_future(bg_runner.submit(coro, key=config.name))
+
+
+async def _list(config: ServerConfig) -> list[types.Resource]:
+    pooled = await pool.get_session(config)
+    resources: list[types.Resource] = []
+    cursor = None
+    try:
+        while True:
+            result = await pooled.session.list_resources(cursor)
+            resources.extend(result.resources)
+            cursor = result.nextCursor
+            if not cursor:
+                return resources
+    except McpError:
+        raise
+    except Exception:
+        await pool.discard(pooled)
+        raise
+
+
+async def _read(config: ServerConfig, uri: str) -> list[ResourceContents]:
+    url = AnyUrl(uri)
+    key = (config.name, str(url))
+    with _cache_lock:
+        cached = _cache.get(key)
+        _counts["hits" if cached is not None else "misses"] += 1
+    if cached is not None:
+        return cached
+
+    pooled = await pool.get_session(config)
+    try:
+        subscribed = await _subscribe(pooled, url)
+        with _cache_lock:
+            epoch = _epochs[config.name]
+        result = await pooled.session.read_resource(url)
+    except McpError:
+        raise
+    except Exception:
+        await pool.discard(pooled)
+        raise
+
+    with _cache_lock:
+        if subscribed and not pooled.closed and epoch == _epochs[config.name]:
+            _cache[key] = result.contents
+    return result.contents
+
+
+async def _subscribe(pooled: pool.PooledSession, url: AnyUrl) -> bool:
+    """Subscribe to *url* once per session; False if the server can't."""
+    uri = str(url)
+    if uri in pooled.subscriptions:
+        return True
+    if not pooled.can_subscribe:
+        return False
+    try:
+        await pooled.session.subscribe_resource(url)
+    except McpError as exc:
+        if exc.error.code == types.METHOD_NOT_FOUND:
+            pooled.can_subscribe = False
+        return False
+    pooled.subscriptions.add(uri)
+    return True
+
+
+def _invalidate(
+    server: str, notification: types.ServerNotification | None
+) -> None:
+    """Pool listener: drop entries a notification (or close) made stale."""
+    if notification is None:
+        stale = None
+    elif isinstance(notification.root, types.ResourceUpdatedNotification):
+        stale = str(notification.root.params.uri)
+    else:
+        return
+
+    with _cache_lock:
+        _epochs[server] += 1
+        for key in list(_cache):
+            if key[0] == server and stale in (None, key[1]):
+                del _cache[key]
+
+
+pool.add_listener(_invalidate)
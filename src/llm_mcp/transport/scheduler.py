@@ -0,0 +1,270 @@
+"""
+Priority-aware admission control for tool calls.
+
+Every server gets a :class:`Scheduler` that lets at most
+``max_in_flight`` calls run at once.  Further calls wait in one queue per
+priority class:
+
+* ``interactive`` - a person is waiting for the answer (chat tool calls);
+* ``normal`` - the default;
+* ``batch`` - bulk work that should never delay the other two.
+
+A free slot always goes to the highest non-empty priority class; within a
+class, callers take turns so one caller submitting hundreds of calls
+cannot starve another submitting a few.  Unless a call names its caller,
+that is the one set by :pyfunc:`acting_as` (inherited by the tasks it
+spawns), else the asyncio task making the call, else the thread for
+blocking calls.  A queue that already holds ``max_queued`` calls rejects
+new ones immediately with :class:`Overloaded` instead of letting latency
+grow without bound.
+
+Defaults come from ``LLM_MCP_MAX_IN_FLIGHT`` (32) and
+``LLM_MCP_MAX_QUEUED`` (256), or :pyfunc:`configure`; the default priority
+of a process comes from ``LLM_MCP_PRIORITY``.  Like the limiter, state is
+guarded by a :class:`threading.Lock` so calls from every event-loop share
+one scheduler per server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+from collections import deque
+from collections.abc import AsyncIterator, Iterator
+from contextlib import (
+    AbstractAsyncContextManager,
+    asynccontextmanager,
+    contextmanager,
+)
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Literal, cast, get_args
+
+Priority = Literal["interactive", "normal", "batch"]
+PRIORITIES: tuple[Priority, ...] = get_args(Priority)
+
+PRIORITY_ENV_VAR = "LLM_MCP_PRIORITY"
+MAX_IN_FLIGHT_ENV_VAR = "LLM_MCP_MAX_IN_FLIGHT"
+MAX_QUEUED_ENV_VAR = "LLM_MCP_MAX_QUEUED"
+
+
+class Overloaded(RuntimeError):
+    """A call was rejected because the server's queue is full."""
+
+
+@dataclass(eq=False)
+class _Ticket:
+    loop: asyncio.AbstractEventLoop
+    future: asyncio.Future[None]
+    granted: bool = False
+
+
+@dataclass
+class _Queue:
+    """Waiting tickets of one priority class, grouped by caller."""
+
+    callers: dict[str, deque[_Ticket]] = field(default_factory=dict)
+    size: int = 0
+
+    def push(self, caller: str, ticket: _Ticket) -> None:
+        self.callers.setdefault(caller, deque()).append(ticket)
+        self.size += 1
+
+    def pop(self) -> _Ticket:
+        """Next ticket of the caller whose turn it is (round-robin)."""
+        caller, tickets = next(iter(self.callers.items()))
+        ticket = tickets.popleft()
+        del self.callers[caller]
+        if tickets:  # back of the line
+            self.callers[caller] = tickets
+        self.size -= 1
+        return ticket
+
+    def remove(self, ticket: _Ticket) -> None:
+        for caller, tickets in self.callers.items():
+            if ticket in tickets:
+                tickets.remove(ticket)
+                if not tickets:
+                    del self.callers[caller]
+                self.size -= 1
+                return
+
+
+class Scheduler:
+    """Admission control and priority queues of one server."""
+
+    def __init__(self, name: str, max_in_flight: int, max_queued: int):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queued = max_queued
+        self.active = 0
+        self.rejected = 0
+        self._queues = {priority: _Queue() for priority in PRIORITIES}
+        self._lock = threading.Lock()
+
+    async def acquire(self, priority: Priority, caller: str) -> None:
+        """Wait for a slot or raise :class:`Overloaded` right away."""
+        loop = asyncio.get_running_loop()
+        queue = self._queues.get(priority)
+        if queue is None:
+            raise ValueError(f"Unknown priority {priority!r}")
+        with self._lock:
+            if self.active < self.max_in_flight and not self._waiting():
+                self.active += 1
+                return
+            if queue.size >= self.max_queued:
+                self.rejected += 1
+                raise Overloaded(
+                    f"server {self.name!r} is overloaded: {queue.size} "
+                    f"{priority} calls already queued"
+                )
+            ticket = _Ticket(loop, loop.create_future())
+            queue.push(caller, ticket)
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            with self._lock:
+                if ticket.granted:
+                    self._release()
+                else:
+                    queue.remove(ticket)
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            self._release()
+
+    @asynccontextmanager
+    async def slot(
+        self, priority: Priority, caller: str
+    ) -> AsyncIterator[None]:
+        await self.acquire(priority, caller)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "active": self.active,
+                "queued": {p: q.size for p, q in self._queues.items()},
+                "rejected": self.rejected,
+            }
+
+    def _waiting(self) -> bool:
+        return any(queue.size for queue in self._queues.values())
+
+    def _release(self) -> None:
+        """Free a slot and hand it on; caller holds ``_lock``."""
+        self.active -= 1
+        while self.active < self.max_in_flight:
+            queue = next((q for q in self._queues.values() if q.size), None)
+            if queue is None:
+                return
+            ticket = queue.pop()
+            if ticket.loop.is_closed():
+                continue
+            ticket.granted = True
+            self.active += 1
+            ticket.loop.call_soon_threadsafe(_grant, ticket.future)
+
+
+_max_in_flight = int(os.environ.get(MAX_IN_FLIGHT_ENV_VAR) or 32)
+_max_queued = int(os.environ.get(MAX_QUEUED_ENV_VAR) or 256)
+_schedulers: dict[str, Scheduler] = {}
+_schedulers_lock = threading.Lock()
+_caller: ContextVar[str | None] = ContextVar("llm_mcp_caller", default=None)
+
+
+def configure(
+    *,
+    max_in_flight: int | None = None,
+    max_queued: int | None = None,
+) -> None:
+    """Change the limits of schedulers created from now on."""
+    global _max_in_flight, _max_queued
+    if max_in_flight is not None:
+        if max_in_flight < 1:
+            raise ValueError("max_in_flight must be at least 1")
+        _max_in_flight = max_in_flight
+    if max_queued is not None:
+        if max_queued < 0:
+            raise ValueError("max_queued must not be negative")
+        _max_queued = max_queued
+    with _schedulers_lock:
+        _schedulers.clear()
+
+
+def default_priority() -> Priority:
+    value = os.environ.get(PRIORITY_ENV_VAR) or "normal"
+    if value not in PRIORITIES:
+        raise ValueError(
+            f"{PRIORITY_ENV_VAR} must be one of {', '.join(PRIORITIES)}"
+        )
+    return cast(Priority, value)
+
+
+@contextmanager
+def acting_as(caller: str) -> Iterator[None]:
+    """Make calls in this block, and in tasks it spawns, those of *caller*."""
+    token = _caller.set(caller)
+    try:
+        yield
+    finally:
+        _caller.reset(token)
+
+
+def current_caller() -> str:
+    """Default caller identity (see :pyfunc:`acting_as`).
+
+    Falls back to the running task, as async calls all run on the
+    background loop threads, and else to the calling thread.
+    """
+    caller = _caller.get()
+    if caller is not None:
+        return caller
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:  # no running loop
+        task = None
+    if task is not None:
+        return f"task-{id(task)}"
+    return f"thread-{threading.get_ident()}"
+
+
+def get_scheduler(name: str) -> Scheduler:
+    """Return the shared scheduler of server *name* (created lazily)."""
+    with _schedulers_lock:
+        scheduler = _schedulers.get(name)
+        if scheduler is None:
+            scheduler = _schedulers[name] = Scheduler(
+                name, _max_in_flight, _max_queued
+            )
+        return scheduler
+
+
+def stats() -> dict[str, dict[str, Any]]:
+    """Active, queued and rejected calls of every server."""
+    with _schedulers_lock:
+        schedulers = list(_schedulers.values())
+    return {s.name: s.stats() for s in schedulers}
+
+
+def scheduled(
+    name: str,
+    priority: Priority | None = None,
+    caller: str | None = None,
+) -> AbstractAsyncContextManager[None]:
+    """Async context manager holding a slot of server *name*'s scheduler."""
+    return get_scheduler(name).slot(
+        priority or default_priority(),
+        caller or current_caller(),
+    )
+
+
+def _grant(future: asyncio.Future[None]) -> None:
+    if not future.done():
+        future.set_result(None)
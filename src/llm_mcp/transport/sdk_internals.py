@@ -0,0 +1,65 @@
+"""
+Private parts of the MCP Python SDK that llm-mcp relies on.
+
+The SDK offers no public way to learn the id of a request before it is
+sent, which is what a ``notifications/cancelled`` has to name, nor to
+fail the requests of a session whose server has died (up to 1.9 they
+wait forever).  Every such reach into SDK internals lives here, checks
+that the attribute still looks the way it did in the versions tested
+(mcp 1.9) and degrades instead of failing when it does not;
+``tests/tdd/test_sdk_internals.py`` fails loudly on an SDK that changed
+them.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+
+import anyio
+from mcp import types
+from mcp.client.session import ClientSession
+
+logger = logging.getLogger(__name__)
+
+
+def next_request_id(session: ClientSession) -> types.RequestId | None:
+    """The id *session* gives its next request, or None if unknown.
+
+    ``send_request`` takes it from ``_request_id`` before its first await.
+    """
+    request_id = getattr(session, "_request_id", None)
+    if not isinstance(request_id, int):
+        _changed("ClientSession._request_id")
+        return None
+    return request_id
+
+
+def fail_pending(session: ClientSession, error: types.ErrorData) -> None:
+    """Answer every request *session* is still waiting for with *error*.
+
+    Each waiting ``send_request`` owns a stream in ``_response_streams``,
+    keyed by request id, on which its response is delivered.
+    """
+    streams = getattr(session, "_response_streams", None)
+    if not isinstance(streams, dict):
+        _changed("ClientSession._response_streams")
+        return
+    for request_id in list(streams):
+        stream = streams.pop(request_id)
+        with contextlib.suppress(anyio.WouldBlock, anyio.BrokenResourceError):
+            stream.send_nowait(
+                types.JSONRPCError(jsonrpc="2.0", id=request_id, error=error)
+            )
+
+
+# private functions
+
+
+_reported: set[str] = set()
+
+
+def _changed(name: str) -> None:
+    if name not in _reported:
+        _reported.add(name)
+        logger.warning("%s is missing: this mcp version is unsupported", name)
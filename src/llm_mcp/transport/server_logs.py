@@ -0,0 +1,207 @@
+"""
+Capture of what stdio servers write to stderr.
+
+A server's stderr used to be inherited, so chatty servers flooded the
+terminal of whoever ran ``llm``.  Now every spawned server gets a pipe
+instead (POSIX only; Windows servers still inherit stderr):
+
+* the event loop drains the pipe whenever it is readable (no thread per
+  server, and a server can never stall on a full pipe buffer);
+* lines are kept in a bounded ring buffer per server, the last
+  ``LLM_MCP_STDERR_LINES`` (default 500) of them, read with
+  :pyfunc:`tail`;
+* the last :data:`ERROR_LINES` lines of a server process are added to the
+  error of the calls it leaves unanswered when it exits (see
+  :pyfunc:`with_stderr`);
+* with ``LLM_MCP_SERVER_LOGS`` set to a directory (``1`` selects
+  ``<mcp_dir>/logs``) the lines of registered servers are also appended to
+  ``<server>.log`` there, rotated at ``LLM_MCP_SERVER_LOGS_MAX_MB``
+  (default 4) - ``llm mcp servers logs NAME`` shows them.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+from collections import deque
+from collections.abc import Callable
+from pathlib import Path
+from typing import TextIO
+
+LINES_ENV_VAR = "LLM_MCP_STDERR_LINES"
+LOGS_ENV_VAR = "LLM_MCP_SERVER_LOGS"
+LOGS_MAX_MB_ENV_VAR = "LLM_MCP_SERVER_LOGS_MAX_MB"
+
+# lines of a failed server process quoted in its error
+ERROR_LINES = 20
+
+# longer lines are cut so one runaway line cannot exhaust the buffer
+MAX_LINE = 2000
+
+# rotated log files kept per server
+LOG_BACKUPS = 2
+
+
+class StderrCapture:
+    """Pipe standing in for the stderr of one server process."""
+
+    def __init__(self, server: str, *, named: bool = False):
+        self.server = server
+        self.recent: deque[str] = deque(maxlen=ERROR_LINES)
+        self._buffer = _buffer(server)
+        self._sink = _sink(server) if named else None
+        self._partial = b""
+        self._on_exit: Callable[[], None] | None = None
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        self._fd: int | None = read_fd
+        self.errlog: TextIO | None = os.fdopen(write_fd, "w")
+
+    def spawned(self) -> None:
+        """Start draining once the server holds the write end of the pipe."""
+        if self.errlog is not None:
+            self.errlog.close()
+            self.errlog = None
+        if self._fd is not None:
+            asyncio.get_running_loop().add_reader(self._fd, self._read)
+
+    def on_exit(self, callback: Callable[[], None]) -> None:
+        """Call *callback* on the loop once the server closed its stderr.
+
+        That normally means the process exited.
+        """
+        self._on_exit = callback
+
+    def close(self) -> None:
+        """Stop capturing (the server could not be started)."""
+        if self.errlog is not None:
+            self.errlog.close()
+            self.errlog = None
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _read(self) -> None:
+        assert self._fd is not None
+        try:
+            chunk = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            chunk = b""
+        if not chunk:  # every writer is gone
+            asyncio.get_running_loop().remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+            if self._partial:
+                self._add(self._partial)
+            if self._on_exit is not None:
+                self._on_exit()
+            return
+        *lines, self._partial = (self._partial + chunk).split(b"\n")
+        for line in lines:
+            self._add(line)
+        if len(self._partial) > MAX_LINE:
+            self._add(self._partial)
+            self._partial = b""
+
+    def _add(self, raw: bytes) -> None:
+        line = raw[:MAX_LINE].decode(errors="replace").rstrip()
+        if not line:
+            return
+        self.recent.append(line)
+        self._buffer.append(line)
+        if self._sink is not None:
+            self._sink.handle(logging.makeLogRecord({"msg": line}))
+
+
+def capture(server: str, *, named: bool = False) -> StderrCapture | None:
+    """A new capture for a process of *server* (None on Windows)."""
+    if sys.platform == "win32":  # pragma: no cover
+        return None
+    return StderrCapture(server, named=named)
+
+
+def tail(server: str, lines: int | None = None) -> list[str]:
+    """The last *lines* (default all kept) stderr lines of *server*."""
+    buffer = list(_buffers.get(server, ()))
+    if lines is None:
+        return buffer
+    return buffer[-lines:] if lines > 0 else []
+
+
+def with_stderr(message: str, captured: StderrCapture) -> str:
+    """*message* followed by the last stderr lines of the process."""
+    if not captured.recent:
+        return message
+    lines = "\n".join(captured.recent)
+    return f"{message}\nstderr of {captured.server!r} (last lines):\n{lines}"
+
+
+def logs_dir() -> Path:
+    """Directory of the server log files (see ``LLM_MCP_SERVER_LOGS``)."""
+    value = os.environ.get(LOGS_ENV_VAR, "")
+    if value and value.lower() not in ("1", "true", "yes", "on"):
+        return Path(value)
+
+    from .. import store
+
+    return store.mcp_dir() / "logs"
+
+
+def read_log(server: str, lines: int) -> list[str] | None:
+    """The last *lines* of the log files of *server* (None if it has none)."""
+    path = logs_dir() / f"{server}.log"
+    files = [_rotated(path, n) for n in range(LOG_BACKUPS, 0, -1)] + [path]
+    files = [file for file in files if file.exists()]
+    if not files:
+        return None
+    kept: deque[str] = deque(maxlen=lines)
+    for file in files:
+        with file.open(encoding="utf-8", errors="replace") as f:
+            kept.extend(line.rstrip("\n") for line in f)
+    return list(kept)
+
+
+# private functions
+
+
+_buffers: dict[str, deque[str]] = {}
+_sinks: dict[Path, logging.Handler] = {}
+_lock = threading.Lock()
+
+
+def _buffer(server: str) -> deque[str]:
+    with _lock:
+        buffer = _buffers.get(server)
+        if buffer is None:
+            size = int(os.environ.get(LINES_ENV_VAR) or 500)
+            buffer = _buffers[server] = deque(maxlen=size)
+        return buffer
+
+
+def _sink(server: str) -> logging.Handler | None:
+    if not os.environ.get(LOGS_ENV_VAR):
+        return None
+    path = logs_dir() / f"{server}.log"
+    with _lock:
+        sink = _sinks.get(path)
+        if sink is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            max_mb = float(os.environ.get(LOGS_MAX_MB_ENV_VAR) or 4)
+            sink = _sinks[path] = logging.handlers.RotatingFileHandler(
+                path,
+                maxBytes=int(max_mb * 1024 * 1024),
+                backupCount=LOG_BACKUPS,
+                encoding="utf-8",
+            )
+            sink.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        return sink
+
+
+def _rotated(path: Path, n: int) -> Path:
+    return path.with_name(f"{path.name}.{n}")
@@ -2,15 +2,38 @@
 STDIO transport - synchronous wrapper around *stdio* MCP servers.
 """
 
-from collections.abc import Mapping
+import asyncio
+import sys
+import weakref
+from collections.abc import AsyncIterator, Mapping
+from contextlib import (
+    AbstractAsyncContextManager,
+    AsyncExitStack,
+    asynccontextmanager,
+)
+from functools import partial
 from typing import Any
 
 from mcp import types
-from mcp.client.session import ClientSession
+from mcp.client.session import ClientSession, MessageHandlerFnT
 from mcp.client.stdio import stdio_client
+from mcp.shared.exceptions import McpError
 
-from .. import schema, utils
+from .. import schema, tracing, utils
+from . import (
+    cancellation,
+    connections,
+    pagination,
+    processes,
+    sdk_internals,
+    server_logs,
+)
 from .bg_runner import run_async
+from .stdio_framing import (
+    MessageTooLarge,
+    buffered_stdio_client,
+    too_large,
+)
 
 __all__ = [
     "call_tool_sync",
@@ -20,13 +43,36 @@ __all__ = [
 
 
 async def list_tools(params: schema.StdioServerParameters) -> list[types.Tool]:
-    async with (
-        stdio_client(params) as (reader, writer),
-        ClientSession(reader, writer) as session,
-    ):
-        await session.initialize()
-        result: types.ListToolsResult = await session.list_tools()
-        return result.tools
+    tools: list[types.Tool] = []
+    await list_tool_pages(params, lambda page, _: tools.extend(page))
+    return tools
+
+
+async def list_tool_pages(
+    params: schema.StdioServerParameters,
+    on_page: pagination.OnPage,
+    *,
+    cursor: str | None = None,
+) -> int:
+    """Spawn the server and pass every page of its tools to *on_page*.
+
+    See :pyfunc:`.pagination.tool_pages`; returns the number of tools.
+    """
+    failure: Exception | None = None
+    with tracing.span("stdio.list_tools"):
+        async with _connect(params) as session:
+            with tracing.span("session.list_tools"):
+                try:
+                    return await pagination.tool_pages(
+                        session, on_page, cursor=cursor
+                    )
+                except (*pagination.FAILURES, McpError) as e:
+                    if exited(session):
+                        raise  # reported by _connect, with stderr
+                    failure = e
+    # raised inside the session it would surface as an ExceptionGroup
+    assert failure is not None
+    raise failure
 
 
 # call_tool
@@ -36,23 +82,175 @@ async def call_tool(
     params: schema.StdioServerParameters,
     tool_name: str,
     arguments: Mapping[str, Any] | None = None,
+    *,
+    server: str | None = None,
+    timeout: float | None = None,
+    attachments: bool = False,
 ) -> Any:
-    async with (
-        stdio_client(params) as (reader, writer),
-        ClientSession(reader, writer) as session,
+    """Spawn the server, call *tool_name* and convert the result.
+
+    After *timeout* seconds the call is cancelled (the server is told so)
+    and :class:`~.cancellation.DeadlineExceeded` is raised.  With
+    *attachments* images and blobs are returned as
+    :class:`~llm_mcp.utils.BlobAttachment` instead of bytes.
+    """
+    with (
+        cancellation.deadline(timeout),
+        tracing.span("stdio.call_tool", tool=tool_name),
     ):
-        await session.initialize()
-        call: types.CallToolResult = await session.call_tool(
-            tool_name, dict(arguments or {})
-        )
-        parts = [utils.convert_content(p) for p in call.content]
-        return parts[0] if len(parts) == 1 else parts
+        async with _connect(params, server=server) as session:
+            with tracing.span("session.call_tool"):
+                call = await cancellation.call_tool(
+                    session, tool_name, dict(arguments or {})
+                )
+            with tracing.span("convert_content"):
+                parts = [
+                    await utils.convert_content_async(
+                        p, attachments=attachments
+                    )
+                    for p in call.content
+                ]
+            return parts[0] if len(parts) == 1 else parts
 
 
 def call_tool_sync(
     params: schema.StdioServerParameters,
     tool_name: str,
     arguments: Mapping[str, Any] | None = None,
+    *,
+    timeout: float | None = None,
 ) -> Any:
     """Blocking helper - call *tool_name* with *arguments*."""
-    return run_async(call_tool(params, tool_name, arguments))
+    return run_async(call_tool(params, tool_name, arguments, timeout=timeout))
+
+
+# session
+
+
+def open_session(
+    params: schema.StdioServerParameters,
+    message_handler: MessageHandlerFnT | None = None,
+    *,
+    server: str | None = None,
+) -> AbstractAsyncContextManager[ClientSession]:
+    """Spawn the server for a session that outlives a single request."""
+    return _connect(params, message_handler, server=server)
+
+
+def process_of(session: ClientSession) -> processes.ServerProcess | None:
+    """The tracked server process behind *session* (see ``process_limits``)."""
+    return _processes.get(session)
+
+
+def exited(session: ClientSession) -> bool:
+    """True if the server process behind *session* has exited."""
+    return session in _exited
+
+
+_processes: weakref.WeakKeyDictionary[
+    ClientSession, processes.ServerProcess
+] = weakref.WeakKeyDictionary()
+_exited: weakref.WeakSet[ClientSession] = weakref.WeakSet()
+
+
+@asynccontextmanager
+async def _connect(
+    params: schema.StdioServerParameters,
+    message_handler: MessageHandlerFnT | None = None,
+    *,
+    server: str | None = None,
+) -> AsyncIterator[ClientSession]:
+    """Spawn the server process and run the MCP handshake.
+
+    A resolved ``npx`` / ``uvx`` executable is launched directly.  With
+    ``process_limits`` the server is started through the launcher and
+    its process is tracked for as long as the session is open.  The
+    server's stderr is captured (see :mod:`.server_logs`); if the process
+    exits, calls still waiting for it fail with its last stderr lines
+    instead of hanging.
+    """
+    label = server or params.command
+    limits = params.process_limits
+    params = utils.resolved_params(params)
+    failure: McpError | MessageTooLarge | None = None
+    try:
+        async with AsyncExitStack() as stack:
+            stack.enter_context(connections.stdio.track())
+            pid_file = None
+            if limits is not None and sys.platform != "win32":
+                pid_file = stack.enter_context(processes.pid_file())
+                params = processes.launch_params(params, pid_file)
+            captured = server_logs.capture(label, named=server is not None)
+            with tracing.span("stdio.spawn", command=params.command):
+                client = (
+                    buffered_stdio_client
+                    if params.framing == "buffered"
+                    else stdio_client
+                )
+                errlog = captured.errlog if captured else None
+                try:
+                    reader, writer = await stack.enter_async_context(
+                        client(params, errlog or sys.stderr)
+                    )
+                except BaseException:
+                    if captured is not None:
+                        captured.close()
+                    raise
+                session = await stack.enter_async_context(
+                    ClientSession(
+                        reader, writer, message_handler=message_handler
+                    )
+                )
+            if captured is not None:
+                captured.spawned()
+                captured.on_exit(partial(_server_exited, session, captured))
+            try:
+                with tracing.span("session.initialize"):
+                    await session.initialize()
+                if limits is not None and pid_file is not None:
+                    pid = int(pid_file.read_text())
+                    _processes[session] = stack.enter_context(
+                        processes.track(pid, label, limits)
+                    )
+                yield session
+            except McpError as e:
+                if exited(session) and e.error.code == _CONNECTION_CLOSED:
+                    failure = e
+                else:
+                    failure = too_large(e)
+                raise
+    except Exception as e:
+        # tearing down after the server died can fail too (the transport
+        # cannot terminate a process that is gone); report the death
+        if failure is None or e is failure:
+            raise
+        raise failure from None
+
+
+# JSON-RPC error code of requests cut off by a closed connection
+_CONNECTION_CLOSED = -32000
+
+# time the last response of an exiting server has to arrive
+_EXIT_GRACE = 0.5
+
+
+def _server_exited(
+    session: ClientSession, captured: server_logs.StderrCapture
+) -> None:
+    """Fail the calls still waiting on *session*, whose server is gone."""
+    _exited.add(session)
+    asyncio.get_running_loop().call_later(
+        _EXIT_GRACE, _fail_pending, session, captured
+    )
+
+
+def _fail_pending(
+    session: ClientSession, captured: server_logs.StderrCapture
+) -> None:
+    error = types.ErrorData(
+        code=_CONNECTION_CLOSED,
+        message=server_logs.with_stderr(
+            "Connection closed: the server process exited", captured
+        ),
+    )
+    sdk_internals.fail_pending(session, error)
@@ -0,0 +1,273 @@
+"""
+Buffered stdio client for servers that send very large messages.
+
+Drop-in replacement for :pyfunc:`mcp.client.stdio.stdio_client`, selected
+with ``"framing": "buffered"`` in a server's stdio parameters.  The
+upstream client decodes every 64 KiB chunk to text and re-splits
+``buffer + chunk`` until a newline arrives, so a message of *n* bytes costs
+O(n²) copying.  Here:
+
+* stdout is read in chunks of up to :data:`READ_CHUNK` bytes into one
+  :class:`bytearray`;
+* :class:`LineFramer` only scans bytes it has not scanned before, copies
+  each complete message out exactly once and compacts the buffer once per
+  chunk;
+* messages are validated straight from bytes (no intermediate ``str``);
+* a message larger than ``LLM_MCP_STDIO_MAX_MESSAGE_BYTES`` (default
+  256 MiB) is dropped instead of growing the buffer without bound.  If it
+  was a response, its request fails with a JSON-RPC error of code
+  :data:`MESSAGE_TOO_LARGE` (the request id is read from the start or the
+  end of the message), which :pyfunc:`too_large` turns back into
+  :class:`MessageTooLarge`; anything else is reported to the session as
+  that exception.
+
+Windows uses the upstream client, which knows how to spawn processes there.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import TextIO, cast
+
+import anyio
+import anyio.lowlevel
+from anyio.abc import ByteReceiveStream
+from anyio.streams.memory import (
+    MemoryObjectReceiveStream,
+    MemoryObjectSendStream,
+)
+from mcp import types
+from mcp.client.stdio import (
+    StdioServerParameters,
+    get_default_environment,
+    stdio_client,
+)
+from mcp.shared.exceptions import McpError
+from mcp.shared.message import SessionMessage
+
+MAX_MESSAGE_ENV_VAR = "LLM_MCP_STDIO_MAX_MESSAGE_BYTES"
+
+# bytes requested from the pipe per read
+READ_CHUNK = 1 << 20
+
+# JSON-RPC error code of a response that was dropped for its size
+MESSAGE_TOO_LARGE = -32001
+
+# bytes kept from each end of a dropped message to find its request id
+_PEEK = 256
+
+_ID = rb'"id"\s*:\s*(-?\d+|"(?:[^"\\]|\\.)*")'
+_LEADING_ID = re.compile(rb'^\s*\{\s*(?:"jsonrpc"\s*:\s*"2\.0"\s*,\s*)?' + _ID)
+_TRAILING_ID = re.compile(
+    _ID + rb'\s*(?:,\s*"jsonrpc"\s*:\s*"2\.0"\s*)?\}\s*$'
+)
+
+_UTF8 = {"utf-8", "utf8"}
+
+ReadStream = MemoryObjectReceiveStream[SessionMessage | Exception]
+WriteStream = MemoryObjectSendStream[SessionMessage]
+
+
+class MessageTooLarge(ValueError):
+    """A message exceeded the per-message size limit and was dropped.
+
+    *request_id* is the id of the request it answered, if it was found.
+    """
+
+    def __init__(
+        self, message: str, request_id: types.RequestId | None = None
+    ):
+        super().__init__(message)
+        self.request_id = request_id
+
+
+class LineFramer:
+    """Split a byte stream into newline-terminated frames."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._buffer = bytearray()
+        self._scanned = 0  # bytes of the buffer known to hold no newline
+        self._discarding = False  # inside an oversized message
+        self._head = b""  # start of the oversized message
+        self._tail = b""  # end of it seen so far
+
+    def feed(self, chunk: bytes) -> list[bytes | MessageTooLarge]:
+        """Add *chunk*; return the frames (or errors) it completed."""
+        buffer = self._buffer
+        buffer += chunk
+        frames: list[bytes | MessageTooLarge] = []
+        start = 0
+        with memoryview(buffer) as view:
+            while (end := buffer.find(b"\n", max(start, self._scanned))) >= 0:
+                if self._discarding:
+                    self._keep_tail(view[start:end])
+                    frames.append(self._too_large())
+                elif end - start > self.max_bytes:
+                    self._head = bytes(view[start : min(end, start + _PEEK)])
+                    self._tail = bytes(view[max(start, end - _PEEK) : end])
+                    frames.append(self._too_large())
+                elif end > start:
+                    frame = bytes(view[start:end])  # the only copy made
+                    if not frame.isspace():
+                        frames.append(frame)
+                start = end + 1
+            rest = len(buffer) - start
+            if self._discarding:
+                self._keep_tail(view[start:])
+            elif rest > self.max_bytes:
+                self._head = bytes(view[start : start + _PEEK])
+                self._tail = bytes(view[max(start, len(buffer) - _PEEK) :])
+                self._discarding = True
+        if self._discarding:
+            buffer.clear()
+        elif start:
+            del buffer[:start]
+        self._scanned = len(buffer)
+        return frames
+
+    def _keep_tail(self, data: memoryview) -> None:
+        self._tail = (self._tail + bytes(data[-_PEEK:]))[-_PEEK:]
+
+    def _too_large(self) -> MessageTooLarge:
+        request_id = _request_id(self._head, self._tail)
+        self._discarding = False
+        self._head = self._tail = b""
+        return MessageTooLarge(
+            f"stdio message exceeds {self.max_bytes} bytes; "
+            f"set {MAX_MESSAGE_ENV_VAR} to allow larger ones",
+            request_id,
+        )
+
+
+def max_message_bytes() -> int:
+    return int(os.environ.get(MAX_MESSAGE_ENV_VAR) or 256 * 1024 * 1024)
+
+
+def too_large(error: McpError) -> MessageTooLarge | None:
+    """The :class:`MessageTooLarge` behind *error*, if it is one."""
+    if error.error.code != MESSAGE_TOO_LARGE:
+        return None
+    return MessageTooLarge(error.error.message)
+
+
+@asynccontextmanager
+async def buffered_stdio_client(
+    server: StdioServerParameters,
+    errlog: TextIO = sys.stderr,
+) -> AsyncIterator[tuple[ReadStream, WriteStream]]:
+    """Spawn *server* and exchange newline-delimited JSON-RPC messages."""
+    if sys.platform == "win32":  # pragma: no cover
+        async with stdio_client(server, errlog) as streams:
+            yield streams
+        return
+
+    read_writer, read_stream = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](0)
+    write_stream, write_reader = anyio.create_memory_object_stream[
+        SessionMessage
+    ](0)
+    env = get_default_environment()
+    if server.env is not None:
+        env.update(server.env)
+    process = await anyio.open_process(
+        [server.command, *server.args],
+        env=env,
+        stderr=errlog,
+        cwd=server.cwd,
+    )
+
+    async def stdout_reader() -> None:
+        assert process.stdout, "Opened process is missing stdout"
+        try:
+            async with read_writer:
+                async for item in _read_messages(process.stdout, server):
+                    await read_writer.send(item)
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async def stdin_writer() -> None:
+        assert process.stdin, "Opened process is missing stdin"
+        try:
+            async with write_reader:
+                async for message in write_reader:
+                    data = message.message.model_dump_json(
+                        by_alias=True, exclude_none=True
+                    )
+                    await process.stdin.send(
+                        (data + "\n").encode(
+                            server.encoding, server.encoding_error_handler
+                        )
+                    )
+        except anyio.ClosedResourceError:
+            await anyio.lowlevel.checkpoint()
+
+    async with anyio.create_task_group() as tg, process:
+        tg.start_soon(stdout_reader)
+        tg.start_soon(stdin_writer)
+        try:
+            yield read_stream, write_stream
+        finally:
+            process.terminate()
+            await read_stream.aclose()
+            await write_stream.aclose()
+
+
+async def _read_messages(
+    stdout: ByteReceiveStream, server: StdioServerParameters
+) -> AsyncIterator[SessionMessage | Exception]:
+    framer = LineFramer(max_message_bytes())
+    utf8 = server.encoding.lower() in _UTF8
+    while True:
+        try:
+            chunk = await stdout.receive(READ_CHUNK)
+        except (anyio.EndOfStream, anyio.ClosedResourceError):
+            return
+        for frame in framer.feed(chunk):
+            if isinstance(frame, MessageTooLarge):
+                yield _dropped(frame)
+                continue
+            try:
+                message = types.JSONRPCMessage.model_validate_json(
+                    frame
+                    if utf8
+                    else frame.decode(
+                        server.encoding, server.encoding_error_handler
+                    )
+                )
+            except Exception as exc:
+                yield exc
+                continue
+            yield SessionMessage(message)
+
+
+def _dropped(error: MessageTooLarge) -> SessionMessage | Exception:
+    # the session ignores exceptions, so a request waiting for the dropped
+    # response is answered with an error instead
+    if error.request_id is None:
+        return error
+    return SessionMessage(
+        types.JSONRPCMessage(
+            types.JSONRPCError(
+                jsonrpc="2.0",
+                id=error.request_id,
+                error=types.ErrorData(
+                    code=MESSAGE_TOO_LARGE, message=str(error)
+                ),
+            )
+        )
+    )
+
+
+def _request_id(head: bytes, tail: bytes) -> types.RequestId | None:
+    match = _LEADING_ID.match(head) or _TRAILING_ID.search(tail)
+    if match is None:
+        return None
+    request_id = json.loads(match.group(1))
+    return cast(types.RequestId, request_id)
@@ -1,9 +1,39 @@
-from .convert_content import convert_content
+from .compact_schema import (
+    compact_schema,
+    compact_tool,
+    tools_bytes,
+)
+from .convert_content import (
+    BlobAttachment,
+    configure_offload,
+    convert_content,
+    convert_content_async,
+)
 from .generate_server_name import generate_server_name
 from .parse_params import parse_params
+from .resolve_launch import ResolveError, resolve_launch, resolved_params
+from .shape_output import shape_output
+from .validate_arguments import (
+    InvalidArguments,
+    Validator,
+    compile_validator,
+)
 
 __all__ = [
+    "BlobAttachment",
+    "InvalidArguments",
+    "ResolveError",
+    "Validator",
+    "compact_schema",
+    "compact_tool",
+    "compile_validator",
+    "configure_offload",
     "convert_content",
+    "convert_content_async",
     "generate_server_name",
     "parse_params",
+    "resolve_launch",
+    "resolved_params",
+    "shape_output",
+    "tools_bytes",
 ]
@@ -0,0 +1,209 @@
+"""Shrink tool definitions before they are sent to the model every turn."""
+
+import json
+from collections.abc import Iterable
+from typing import Any
+
+from ..schema import MCPTool, SchemaCompaction
+
+# keywords whose value maps names to schemas
+_SCHEMA_MAPS = (
+    "properties",
+    "patternProperties",
+    "dependentSchemas",
+    "$defs",
+    "definitions",
+)
+# keywords whose value is a schema or a list of schemas
+_SCHEMA_VALUES = (
+    "items",
+    "prefixItems",
+    "additionalItems",
+    "contains",
+    "not",
+    "if",
+    "then",
+    "else",
+    "anyOf",
+    "allOf",
+    "oneOf",
+    "propertyNames",
+    "unevaluatedItems",
+    "unevaluatedProperties",
+    "additionalProperties",
+)
+_DEFS = ("$defs", "definitions")
+
+
+def compact_tool(tool: MCPTool, compaction: SchemaCompaction) -> MCPTool:
+    """Return *tool* with a shortened description and input schema."""
+    description = tool.description
+    if description and compaction.max_tool_description:
+        description = shorten(description, compaction.max_tool_description)
+    return tool.model_copy(
+        update={
+            "description": description,
+            "inputSchema": compact_schema(tool.inputSchema, compaction),
+        }
+    )
+
+
+def compact_schema(
+    schema: dict[str, Any], compaction: SchemaCompaction
+) -> dict[str, Any]:
+    """Return a compacted copy of the JSON *schema* (idempotent).
+
+    Titles, examples, ``additionalProperties: true`` and ``$schema`` are
+    removed, descriptions shortened, references to small non-recursive
+    definitions replaced by the definition and unused definitions dropped.
+    The result is only meant for the model: arguments are still validated
+    against the full schema.
+    """
+    if not schema:
+        return schema
+    inline = _inlinable(schema, compaction.inline_ref_bytes)
+    compacted: dict[str, Any] = _compact(schema, compaction, inline)
+    used = _refs(compacted)
+    for key in _DEFS:
+        defs = compacted.get(key)
+        if isinstance(defs, dict):
+            kept = {n: d for n, d in defs.items() if f"#/{key}/{n}" in used}
+            if kept:
+                compacted[key] = kept
+            else:
+                del compacted[key]
+    return compacted
+
+
+def tools_bytes(tools: Iterable[MCPTool]) -> int:
+    """Bytes of JSON the definitions of *tools* take in a model request."""
+    return sum(
+        len(
+            json.dumps(
+                {
+                    "name": tool.name,
+                    "description": tool.description or "",
+                    "input_schema": tool.inputSchema or {},
+                },
+                separators=(",", ":"),
+                ensure_ascii=False,
+            ).encode()
+        )
+        for tool in tools
+    )
+
+
+def shorten(text: str, limit: int) -> str:
+    """Cut *text* to *limit* characters, at a sentence or word if possible."""
+    text = text.strip()
+    if len(text) <= limit:
+        return text
+    cut = text[: limit - 1]
+    sentence = max(cut.rfind(". "), cut.rfind(".\n"))
+    if sentence >= limit // 2:
+        return cut[: sentence + 1]
+    word = cut.rfind(" ")
+    if word >= limit // 2:
+        cut = cut[:word]
+    return cut.rstrip(" ,;:") + "…"
+
+
+# private functions
+
+
+def _compact(
+    node: Any, compaction: SchemaCompaction, inline: dict[str, Any]
+) -> Any:
+    if isinstance(node, list):
+        return [_compact(item, compaction, inline) for item in node]
+    if not isinstance(node, dict):
+        return node
+
+    ref = node.get("$ref")
+    if isinstance(ref, str) and ref in inline:
+        siblings = {k: v for k, v in node.items() if k != "$ref"}
+        node = {**inline[ref], **siblings}
+
+    compacted: dict[str, Any] = {}
+    for key, value in node.items():
+        if _dropped(key, value, compaction):
+            continue
+        if key in _SCHEMA_MAPS and isinstance(value, dict):
+            value = {
+                name: _compact(sub, compaction, inline)
+                for name, sub in value.items()
+            }
+        elif key in _SCHEMA_VALUES:
+            value = _compact(value, compaction, inline)
+        elif (
+            key == "description"
+            and isinstance(value, str)
+            and compaction.max_description
+        ):
+            value = shorten(value, compaction.max_description)
+        compacted[key] = value
+    return compacted
+
+
+def _dropped(key: str, value: Any, compaction: SchemaCompaction) -> bool:
+    if key == "$schema":
+        return True
+    if key == "title":
+        return compaction.drop_titles and isinstance(value, str)
+    if key == "examples":
+        return compaction.drop_examples
+    if key == "additionalProperties":
+        return compaction.drop_additional_properties and value is True
+    return False
+
+
+def _inlinable(schema: dict[str, Any], max_bytes: int) -> dict[str, Any]:
+    """Definitions small enough to inline, by their ``$ref``.
+
+    A definition qualifies once every reference inside it can be inlined
+    too, so recursive definitions never do.
+    """
+    if not max_bytes:
+        return {}
+    pending = {
+        f"#/{key}/{name}": definition
+        for key in _DEFS
+        if isinstance(schema.get(key), dict)
+        for name, definition in schema[key].items()
+    }
+    inline: dict[str, Any] = {}
+    progress = True
+    while progress:
+        progress = False
+        for ref, definition in list(pending.items()):
+            if not _refs(definition) <= inline.keys():
+                continue
+            del pending[ref]
+            expanded = _expand(definition, inline)
+            size = len(json.dumps(expanded, separators=(",", ":")))
+            if size <= max_bytes:
+                inline[ref] = expanded
+                progress = True
+    return inline
+
+
+def _expand(node: Any, inline: dict[str, Any]) -> Any:
+    if isinstance(node, list):
+        return [_expand(item, inline) for item in node]
+    if not isinstance(node, dict):
+        return node
+    ref = node.get("$ref")
+    if isinstance(ref, str) and ref in inline:
+        siblings = {k: v for k, v in node.items() if k != "$ref"}
+        return {**inline[ref], **_expand(siblings, inline)}
+    return {key: _expand(value, inline) for key, value in node.items()}
+
+
+def _refs(node: Any) -> set[str]:
+    """Every ``$ref`` value anywhere inside *node*."""
+    if isinstance(node, list):
+        return set().union(*(_refs(item) for item in node))
+    if not isinstance(node, dict):
+        return set()
+    found = {node["$ref"]} if isinstance(node.get("$ref"), str) else set()
+    return found.union(*(_refs(value) for value in node.values()))
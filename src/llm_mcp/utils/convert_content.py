@@ -1,35 +1,279 @@
 """Conversion utility files."""
 
+import asyncio
+import atexit
 import base64
+import hashlib
 import json
+import os
+import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass
 from typing import Any
 
+import llm
+from llm.utils import mimetype_from_string
 from mcp import types
 
 ContentType = types.TextContent | types.ImageContent | types.EmbeddedResource
 
+# Payloads at least this large (in characters) are decoded in a worker
+# thread so the event-loop keeps serving other sessions meanwhile.  Base-64
+# payloads of at least *process_bytes* go to a process pool instead (0
+# disables that tier); decoded JSON would have to be unpickled in this
+# process, which blocks as long as decoding it here, so it never does.
+THREAD_BYTES_ENV_VAR = "LLM_MCP_OFFLOAD_BYTES"
+PROCESS_BYTES_ENV_VAR = "LLM_MCP_PROCESS_OFFLOAD_BYTES"
 
-def convert_content(part: ContentType) -> Any:
-    """Best-effort conversion of an MCP *content type* to a Python value."""
+_thread_bytes = int(os.environ.get(THREAD_BYTES_ENV_VAR) or 256 * 1024)
+_process_bytes = int(os.environ.get(PROCESS_BYTES_ENV_VAR) or 0)
+_thread_pool: ThreadPoolExecutor | None = None
+_process_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
 
-    output: Any = None
 
+@dataclass(repr=False)
+class BlobAttachment(llm.Attachment):
+    """An image or blob part, kept as the base-64 text the server sent.
+
+    :pymeth:`base64_content` returns that text as is, so handing the part
+    to a vision model needs no decoding and re-encoding; the bytes are
+    decoded (and not kept) only when :pymeth:`content_bytes` is called.
+    """
+
+    data: str = ""
+
+    @property
+    def size(self) -> int:
+        """Number of decoded bytes."""
+        return len(self.data) * 3 // 4 - self.data[-2:].count("=")
+
+    def content_bytes(self) -> bytes:
+        return self.content or base64.b64decode(self.data)
+
+    def base64_content(self) -> str:
+        return self.data
+
+    def id(self) -> str:
+        if self._id is None:
+            self._id = hashlib.sha256(self.content_bytes()).hexdigest()
+        return self._id
+
+    def resolve_type(self) -> str | None:
+        return self.type or mimetype_from_string(self.content_bytes())
+
+    def __repr__(self) -> str:
+        # llm passes tool results to the model as JSON with repr() fallback
+        return f"<{self.type or 'binary'} attachment, {self.size} bytes>"
+
+
+def convert_content(part: ContentType, *, attachments: bool = False) -> Any:
+    """Best-effort conversion of an MCP *content type* to a Python value.
+
+    Images and blobs are decoded to bytes, or with *attachments* returned
+    undecoded as :class:`BlobAttachment`.
+    """
+    payload, kind = _payload(part)
+    if payload is None:
+        return None
+    if attachments and kind == "base64":
+        return BlobAttachment(type=_mime_type(part), data=payload)
+    return _INLINE[kind](payload)
+
+
+async def convert_content_async(
+    part: ContentType, *, attachments: bool = False
+) -> Any:
+    """Like :pyfunc:`convert_content`, offloading large payloads.
+
+    Small payloads are decoded inline: handing them to a pool would cost
+    more than decoding them.  Large ones are decoded in slices by a worker,
+    so the GIL is released between slices and the event-loop keeps
+    serving other sessions meanwhile.
+    """
+    payload, kind = _payload(part)
+    if payload is None:
+        return None
+    if attachments and kind == "base64":
+        return BlobAttachment(type=_mime_type(part), data=payload)
+    if len(payload) < _thread_bytes:
+        return _INLINE[kind](payload)
+
+    loop = asyncio.get_running_loop()
+    executor = _executor(len(payload), kind)
+    return await loop.run_in_executor(executor, _SLICED[kind], payload)
+
+
+def configure_offload(
+    *,
+    thread_bytes: int | None = None,
+    process_bytes: int | None = None,
+) -> None:
+    """Change the payload sizes above which decoding leaves the loop."""
+    global _thread_bytes, _process_bytes
+    if thread_bytes is not None:
+        _thread_bytes = thread_bytes
+    if process_bytes is not None:
+        _process_bytes = process_bytes
+
+
+# private functions
+
+
+def _payload(part: ContentType) -> tuple[str | None, str]:
+    """Return the raw payload of *part* and how it is encoded."""
     if isinstance(part, types.TextContent) or (
         hasattr(part, "text") and isinstance(part.text, str)
     ):
-        try:
-            output = json.loads(part.text)
-        except ValueError:
-            output = part.text
+        return part.text, "json"
 
-    elif isinstance(part, types.ImageContent):
-        output = base64.b64decode(part.data)
+    if isinstance(part, types.ImageContent):
+        return part.data, "base64"
 
-    elif isinstance(part, types.EmbeddedResource):
+    if isinstance(part, types.EmbeddedResource):
         res = part.resource
         if isinstance(res, types.TextResourceContents):
-            output = res.text
-        else:
-            output = base64.b64decode(res.blob)
+            return res.text, "text"
+        return res.blob, "base64"
+
+    return None, "text"
+
+
+def _mime_type(part: ContentType) -> str | None:
+    if isinstance(part, types.EmbeddedResource):
+        return getattr(part.resource, "mimeType", None)
+    return getattr(part, "mimeType", None)
+
+
+def _decode_text(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _decode_text_sliced(text: str) -> Any:
+    """Decode JSON one top-level element at a time (same result)."""
+    try:
+        return _loads_sliced(text)
+    except ValueError:
+        return _decode_text(text)
+
+
+def _loads_sliced(text: str) -> Any:
+    start = _skip(text, 0)
+    opener = text[start : start + 1]
+    if opener == "[":
+        items: list[Any] = []
+        end = _scan_elements(text, start, lambda _, v: items.append(v))
+        result: Any = items
+    elif opener == "{":
+        members: dict[str, Any] = {}
+        end = _scan_elements(text, start, members.__setitem__, is_object=True)
+        result = members
+    else:
+        return json.loads(text)
+
+    if _skip(text, end) != len(text):
+        raise ValueError("Extra data")
+    return result
+
+
+def _scan_elements(
+    text: str,
+    idx: int,
+    add: Callable[[Any, Any], None],
+    is_object: bool = False,
+) -> int:
+    """Decode the members of the container opening at *idx* via *add*."""
+    closer = "}" if is_object else "]"
+    idx = _skip(text, idx + 1)
+    if text[idx : idx + 1] == closer:
+        return idx + 1
+
+    key = None
+    while True:
+        if is_object:
+            key, idx = _scan_key(text, idx)
+        value, idx = _DECODER.raw_decode(text, idx)
+        add(key, value)
+        idx = _skip(text, idx)
+        delimiter = text[idx : idx + 1]
+        idx = _skip(text, idx + 1)
+        if delimiter == closer:
+            return idx
+        if delimiter != ",":
+            raise ValueError("Expecting ',' delimiter")
+
+
+def _scan_key(text: str, idx: int) -> tuple[str, int]:
+    key, idx = _DECODER.raw_decode(text, idx)
+    idx = _skip(text, idx)
+    if not isinstance(key, str) or text[idx : idx + 1] != ":":
+        raise ValueError("Expecting property name and ':' delimiter")
+    return key, _skip(text, idx + 1)
+
+
+def _skip(text: str, idx: int) -> int:
+    """Return the index of the first non-whitespace character at *idx*."""
+    match = _WS(text, idx)
+    return match.end() if match else idx
+
+
+def _b64decode_sliced(data: str) -> bytes:
+    """Decode base-64 in slices (whole 4-character groups at a time)."""
+    if len(data) % 4 or any(c in data for c in " \t\r\n"):
+        return base64.b64decode(data)
+    return b"".join(
+        base64.b64decode(data[i : i + _SLICE])
+        for i in range(0, len(data), _SLICE)
+    )
+
+
+_DECODER = json.JSONDecoder()
+_WS = re.compile(r"[ \t\n\r]*").match
+
+# characters decoded per base-64 slice (a multiple of 4)
+_SLICE = 1 << 20
+
+_INLINE: dict[str, Callable[[str], Any]] = {
+    "json": _decode_text,
+    "base64": base64.b64decode,
+    "text": str,
+}
+_SLICED: dict[str, Callable[[str], Any]] = {
+    "json": _decode_text_sliced,
+    "base64": _b64decode_sliced,
+    "text": str,
+}
+
+
+def _executor(size: int, kind: str) -> Executor:
+    """Return the (lazily created) pool suited to a payload of *size*."""
+    global _thread_pool, _process_pool
+    with _pool_lock:
+        if kind == "base64" and _process_bytes and size >= _process_bytes:
+            if _process_pool is None:
+                _process_pool = ProcessPoolExecutor(max_workers=2)
+            return _process_pool
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=4, thread_name_prefix="llm-mcp-decode"
+            )
+        return _thread_pool
+
 
-    return output
+@atexit.register
+def _shutdown_pools() -> None:
+    global _thread_pool, _process_pool
+    with _pool_lock:
+        for pool in (_thread_pool, _process_pool):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        _thread_pool = _process_pool = None
@@ -14,6 +14,9 @@ def parse_params(param_str: str) -> ServerParameters | None:
         >>> parse_params("https://example.com/api")
         RemoteServerParameters(url='https://example.com/api', ...)
 
+        >>> parse_params("https://a.example.com/mcp https://b.example.com/mcp")
+        RemoteServerParameters(url='https://a.example.com/mcp', endpoints=['https://b.example.com/mcp'], ...)
+
         >>> parse_params("npx -y @modelcontextprotocol/server-filesystem /path")
         StdioServerParameters(command='npx', args=['-y', '@modelcontextprotocol/server-filesystem', '/path'])
 
@@ -28,9 +31,11 @@ def parse_params(param_str: str) -> ServerParameters | None:
     # Check if it's a URL
     if param_str.startswith(("http://", "https://")):
         # Extract headers if present (simple format: url --header Key=Value)
+        # and any replica URLs listed after the first one.
         parts = param_str.split()
         url = parts[0]
         headers = {}
+        endpoints = []
 
         i = 1
         while i < len(parts):
@@ -41,9 +46,13 @@ def parse_params(param_str: str) -> ServerParameters | None:
                     headers[key] = val
                 i += 2
             else:
+                if parts[i].startswith(("http://", "https://")):
+                    endpoints.append(parts[i])
                 i += 1
 
-        return RemoteServerParameters(url=url, headers=headers or {})
+        return RemoteServerParameters(
+            url=url, headers=headers or {}, endpoints=endpoints
+        )
 
     # Parse as stdio command
     env_vars, cmd_parts = _parse_command_line(param_str)
@@ -0,0 +1,248 @@
+"""
+Resolve ``npx`` / ``uvx`` command lines to the executable they launch.
+
+``npx -y @scope/server-x`` and ``uvx mcp-server-y`` check the package
+cache (and often the registry) on every start before the server runs.
+:pyfunc:`resolve_launch` asks the package manager once where the server's
+executable lives; :pyfunc:`resolved_params` then starts it directly and
+falls back to the original command line when the resolved files are gone
+(e.g. after the package cache was cleaned).
+"""
+
+import json
+import logging
+import os
+import subprocess
+from collections.abc import Sequence
+from pathlib import Path
+
+from mcp.client.stdio import get_default_environment
+
+from ..schema import ResolvedLaunch, StdioServerParameters
+
+logger = logging.getLogger(__name__)
+
+# seconds the package manager may take to install and resolve the package
+RESOLVE_TIMEOUT = 300
+
+
+class ResolveError(RuntimeError):
+    """The package manager could not tell where the server lives."""
+
+
+def resolve_launch(params: StdioServerParameters) -> ResolvedLaunch | None:
+    """Resolve the executable behind an ``npx`` or ``uvx`` command line.
+
+    Returns None for other commands and command lines this does not
+    understand (e.g. ``npx -c``); raises :class:`ResolveError` if the
+    package manager fails.
+    """
+    tool = Path(params.command).name.lower().removesuffix(".cmd")
+    tool = tool.removesuffix(".exe")
+    if tool == "npx":
+        return _resolve_npx(params)
+    if tool == "uvx":
+        return _resolve_uvx(params)
+    return None
+
+
+def resolved_params(params: StdioServerParameters) -> StdioServerParameters:
+    """*params* launching the resolved executable, if it still exists."""
+    resolved = params.resolved
+    if resolved is None:
+        return params
+    missing = [path for path in resolved.paths if not os.path.exists(path)]
+    if missing:
+        logger.info(
+            "resolved %s target %s is gone, launching %r",
+            resolved.source,
+            missing[0],
+            params.command,
+        )
+        return params
+    update: dict = {"command": resolved.command, "args": resolved.args}
+    if resolved.env:
+        update["env"] = {**(params.env or {}), **resolved.env}
+    return params.model_copy(update=update)
+
+
+# private functions
+
+# npx options that take a value
+_NPX_VALUE_OPTIONS = {"-p", "--package", "--registry", "--cache"}
+
+# prints the package bins of the npx environment the script runs in
+_NPX_SCRIPT = """
+const fs = require("fs"), path = require("path");
+const binDir = process.env.PATH.split(path.delimiter)[0];
+const root = path.dirname(path.dirname(binDir));
+const read = (p) => JSON.parse(fs.readFileSync(p, "utf8"));
+const deps = Object.keys(read(path.join(root, "package.json")).dependencies);
+const bins = {};
+for (const dep of deps) {
+  const dir = path.join(root, "node_modules", dep);
+  const pkg = read(path.join(dir, "package.json"));
+  let bin = pkg.bin || {};
+  if (typeof bin === "string") bin = {[pkg.name.split("/").pop()]: bin};
+  for (const [name, file] of Object.entries(bin)) {
+    bins[name] = path.resolve(dir, file);
+  }
+}
+console.log(JSON.stringify({node: process.execPath, bins}));
+"""
+
+
+def _resolve_npx(params: StdioServerParameters) -> ResolvedLaunch | None:
+    options, packages, rest = _split_npx(params.args)
+    if not rest:
+        return None
+    command, *args = rest
+    if not packages:
+        packages = [command]
+    argv = [params.command, *options]
+    if "-y" not in options and "--yes" not in options:
+        argv.append("-y")
+    for package in packages:
+        argv += ["--package", package]
+    argv += ["--", "node", "-e", _NPX_SCRIPT]
+    found = json.loads(_run(argv, params).splitlines()[-1])
+    bins: dict[str, str] = found["bins"]
+
+    if command in bins:
+        script = bins[command]
+    elif command in packages and len(bins) == 1:
+        script = next(iter(bins.values()))
+    elif command in packages and _package_name(command) in bins:
+        script = bins[_package_name(command)]
+    else:
+        raise ResolveError(f"no executable {command!r} in {packages}")
+    return ResolvedLaunch(
+        source="npx",
+        command=found["node"],
+        args=[script, *args],
+        paths=[found["node"], script],
+    )
+
+
+def _split_npx(
+    args: Sequence[str],
+) -> tuple[list[str], list[str], list[str]]:
+    """Split npx arguments into options, ``--package`` specs and the rest."""
+    options: list[str] = []
+    packages: list[str] = []
+    i = 0
+    while i < len(args) and args[i].startswith("-"):
+        arg = args[i]
+        if arg == "--":
+            i += 1
+            break
+        if arg in ("-c", "--call"):
+            return [], [], []
+        name, eq, value = arg.partition("=")
+        if name in _NPX_VALUE_OPTIONS and not eq:
+            value = args[i + 1] if i + 1 < len(args) else ""
+            i += 1
+        if name in ("-p", "--package"):
+            packages.append(value)
+        elif name in _NPX_VALUE_OPTIONS:
+            options.append(f"{name}={value}")
+        else:
+            options.append(arg)
+        i += 1
+    return options, packages, list(args[i:])
+
+
+def _package_name(spec: str) -> str:
+    """Bin name npx picks for *spec*: ``@scope/name@1.0`` -> ``name``."""
+    name = spec.rpartition("/")[2] if spec.startswith("@") else spec
+    return name.partition("@")[0]
+
+
+# uvx options that take a value
+_UVX_VALUE_OPTIONS = {
+    "--from",
+    "--with",
+    "--with-editable",
+    "--with-requirements",
+    "--python",
+    "-p",
+    "--index",
+    "--index-url",
+    "--extra-index-url",
+    "--default-index",
+    "--constraints",
+    "-c",
+    "--overrides",
+    "--directory",
+}
+
+_UVX_SCRIPT = "import sys; print(sys.executable)"
+
+
+def _resolve_uvx(params: StdioServerParameters) -> ResolvedLaunch | None:
+    args = list(params.args)
+    options: list[str] = []
+    source = None
+    i = 0
+    while i < len(args) and args[i].startswith("-"):
+        name, eq, value = args[i].partition("=")
+        if name == "--":
+            i += 1
+            break
+        if name in _UVX_VALUE_OPTIONS and not eq:
+            value = args[i + 1] if i + 1 < len(args) else ""
+            i += 1
+        if name == "--from":
+            source = value
+        elif name in _UVX_VALUE_OPTIONS:
+            options.append(f"{name}={value}")
+        else:
+            options.append(args[i])
+        i += 1
+    if i >= len(args):
+        return None
+    command, *rest = args[i:]
+    # `uvx name@1.0` runs the `name` executable of that version
+    executable = command.partition("@")[0]
+    for marker in ("==", ">=", "<=", "~=", "["):
+        executable = executable.partition(marker)[0]
+    argv = [
+        params.command,
+        *options,
+        "--from",
+        source or command,
+        "python",
+        "-c",
+        _UVX_SCRIPT,
+    ]
+    python = Path(_run(argv, params).splitlines()[-1].strip())
+    for candidate in (executable, f"{executable}.exe"):
+        path = python.parent / candidate
+        if path.exists():
+            return ResolvedLaunch(
+                source="uvx",
+                command=str(path),
+                args=rest,
+                paths=[str(path), str(python)],
+            )
+    raise ResolveError(f"no executable {executable!r} in {python.parent}")
+
+
+def _run(argv: list[str], params: StdioServerParameters) -> str:
+    env = {**get_default_environment(), **(params.env or {})}
+    try:
+        result = subprocess.run(  # noqa: S603
+            argv,
+            capture_output=True,
+            text=True,
+            env=env,
+            cwd=params.cwd,
+            timeout=RESOLVE_TIMEOUT,
+            check=False,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise ResolveError(f"{params.command} failed: {e}") from e
+    if result.returncode != 0 or not result.stdout.strip():
+        detail = result.stderr.strip().splitlines()[-1:] or ["no output"]
+        raise ResolveError(f"{params.command} failed: {detail[0]}")
+    return result.stdout
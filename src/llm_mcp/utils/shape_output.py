@@ -0,0 +1,116 @@
+"""Fit tool results into a size budget while keeping their structure."""
+
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from ..schema import OutputShaping
+
+SPILL_DIR_ENV_VAR = "LLM_MCP_SPILL_DIR"
+
+# bytes of the budget kept free for the truncation note
+NOTE_RESERVE = 200
+
+MIN_STRING = 16
+
+
+def shape_output(
+    result: Any, shaping: OutputShaping, *, label: str = "tool"
+) -> Any:
+    """Return *result*, trimmed to ``shaping.budget`` bytes of JSON.
+
+    Long strings are cut and long arrays / objects keep their first
+    elements, with a marker saying how much was left out; the limits are
+    halved until the result fits.  A note is added to trimmed results,
+    pointing to the full result when ``shaping.spill`` is set.
+    """
+    budget = shaping.budget
+    if budget is None:
+        return result
+    size = _size(result)
+    if size <= budget:
+        return result
+
+    target = max(budget - NOTE_RESERVE, MIN_STRING)
+    items, chars = shaping.max_items, shaping.max_string
+    shaped = _trim(result, items, chars)
+    while _size(shaped) > target and (items > 1 or chars > MIN_STRING):
+        items, chars = max(1, items // 2), max(MIN_STRING, chars // 2)
+        shaped = _trim(result, items, chars)
+    if _size(shaped) > target:  # too many levels: fall back to plain text
+        shaped = _trim(_dumps(shaped), 1, target)
+
+    note = f"result trimmed from {size} bytes to fit a {budget} byte budget"
+    if shaping.spill:
+        note += f"; full result saved to {spill(result, label)}"
+    return _annotate(shaped, note)
+
+
+def spill(result: Any, label: str) -> Path:
+    """Write *result* in full to the spill directory and return the path."""
+    directory = Path(os.environ.get(SPILL_DIR_ENV_VAR) or _default_dir())
+    directory.mkdir(parents=True, exist_ok=True)
+    stem = f"{re.sub(r'[^A-Za-z0-9_.-]', '_', label)}-{time.time_ns()}"
+
+    if isinstance(result, bytes):
+        path = directory / f"{stem}.bin"
+        path.write_bytes(result)
+    elif isinstance(result, str):
+        path = directory / f"{stem}.txt"
+        path.write_text(result)
+    else:
+        path = directory / f"{stem}.json"
+        path.write_text(_dumps(result))
+    return path
+
+
+# private functions
+
+
+def _trim(value: Any, items: int, chars: int) -> Any:
+    if isinstance(value, str):
+        if len(value) <= chars:
+            return value
+        return f"{value[:chars]}... [{len(value) - chars} more characters]"
+    if isinstance(value, bytes):
+        return value if len(value) <= chars else f"<{len(value)} bytes>"
+    if isinstance(value, list):
+        kept = [_trim(v, items, chars) for v in value[:items]]
+        if len(value) > items:
+            kept.append(f"... [{len(value) - items} more items]")
+        return kept
+    if isinstance(value, dict):
+        keys = list(value)
+        trimmed = {k: _trim(value[k], items, chars) for k in keys[:items]}
+        if len(keys) > items:
+            trimmed["..."] = f"[{len(keys) - items} more keys]"
+        return trimmed
+    return value
+
+
+def _annotate(shaped: Any, note: str) -> Any:
+    if isinstance(shaped, dict):
+        return {**shaped, "_shaped": note}
+    if isinstance(shaped, list):
+        return [*shaped, {"_shaped": note}]
+    return f"{shaped}\n[{note}]"
+
+
+def _size(value: Any) -> int:
+    if isinstance(value, str):
+        return len(value.encode())
+    return len(_dumps(value).encode())
+
+
+def _dumps(value: Any) -> str:
+    # same fallback llm uses when it serializes a tool result
+    return json.dumps(value, ensure_ascii=False, default=repr)
+
+
+def _default_dir() -> Path:
+    from .. import store
+
+    return store.mcp_dir() / "spill"
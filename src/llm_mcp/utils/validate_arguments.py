@@ -0,0 +1,81 @@
+"""Client-side validation of tool arguments against ``inputSchema``."""
+
+import json
+import logging
+from collections.abc import Callable, Mapping
+from functools import lru_cache
+from typing import Any
+
+from jsonschema import exceptions, validators
+
+logger = logging.getLogger(__name__)
+
+Validator = Callable[[Mapping[str, Any]], None]
+
+# errors listed in the message sent back to the model
+MAX_ERRORS = 3
+
+
+class InvalidArguments(ValueError):
+    """Tool arguments do not match the tool's ``inputSchema``."""
+
+
+def compile_validator(
+    tool_name: str, schema: Mapping[str, Any] | None
+) -> Validator | None:
+    """Compile *schema* once into a function raising InvalidArguments.
+
+    Returns None when there is nothing to check (empty schema) or the
+    server published a schema that is itself invalid; the server remains
+    the judge of those calls.
+    """
+    if not schema:
+        return None
+    checker = _checker(json.dumps(schema, sort_keys=True))
+    if checker is None:
+        return None
+
+    def validate(arguments: Mapping[str, Any]) -> None:
+        # fast path: a valid call never builds error objects
+        if checker.is_valid(arguments):
+            return
+        errors = sorted(
+            checker.iter_errors(arguments), key=exceptions.relevance
+        )
+        raise InvalidArguments(_message(tool_name, errors))
+
+    return validate
+
+
+# private functions
+
+
+@lru_cache(maxsize=1024)
+def _checker(schema_json: str) -> Any:
+    """Compiled validator for a schema (shared by identical schemas)."""
+    schema = json.loads(schema_json)
+    cls = validators.validator_for(schema)
+    try:
+        cls.check_schema(schema)
+    except exceptions.SchemaError as e:
+        logger.debug("not validating against invalid schema: %s", e.message)
+        return None
+    return cls(schema)
+
+
+def _message(tool_name: str, errors: list[exceptions.ValidationError]) -> str:
+    lines = [f"Invalid arguments for tool {tool_name!r}:"]
+    for error in errors[:MAX_ERRORS]:
+        lines.append(f"- {_location(error)}: {error.message}")
+    if len(errors) > MAX_ERRORS:
+        lines.append(f"- ... and {len(errors) - MAX_ERRORS} more")
+    lines.append("Fix the arguments and call the tool again.")
+    return "\n".join(lines)
+
+
+def _location(error: exceptions.ValidationError) -> str:
+    path = "".join(
+        f"[{part}]" if isinstance(part, int) else f".{part}"
+        for part in error.absolute_path
+    )
+    return f"arguments{path}"
@@ -1,8 +1,13 @@
 import os
+import socket
+import threading
+import time
 from pathlib import Path
 
 import llm
 import pytest
+import uvicorn
+from mcp.server.fastmcp import FastMCP
 
 
 @pytest.fixture(scope="module")
@@ -23,3 +28,28 @@ def llm_user_dir(tmp_path_factory):
     os.environ["LLM_USER_PATH"] = str(llm_user_dir)
     assert llm.user_dir() == llm_user_dir, "Failed to set LLM_USER_PATH"
     return llm_user_dir
+
+
+@pytest.fixture(scope="module")
+def live_url():
+    """URL of a streamable HTTP server running in a thread."""
+    server = FastMCP("live")
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        return a + b
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    config = uvicorn.Config(
+        server.streamable_http_app(), port=port, log_level="error"
+    )
+    runner = uvicorn.Server(config)
+    thread = threading.Thread(target=runner.run, daemon=True)
+    thread.start()
+    while not runner.started:
+        time.sleep(0.05)
+    yield f"http://127.0.0.1:{port}/mcp"
+    runner.should_exit = True
+    thread.join(timeout=10)
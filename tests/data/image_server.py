@@ -0,0 +1,40 @@
+"""Stdio MCP server returning an image and a blob."""
+
+import base64
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("images")
+
+# 1x1 transparent PNG
+PIXEL = base64.b64decode(
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAjCB0C8AAAAASUVORK5CYII="
+)
+
+
+@server.tool()
+def pixel() -> types.ImageContent:
+    """A 1x1 PNG image."""
+    return types.ImageContent(
+        type="image",
+        data=base64.b64encode(PIXEL).decode(),
+        mimeType="image/png",
+    )
+
+
+@server.tool()
+def blob(size: int) -> types.EmbeddedResource:
+    """*size* zero bytes as an embedded blob resource."""
+    return types.EmbeddedResource(
+        type="resource",
+        resource=types.BlobResourceContents(
+            uri="mem://zeros",
+            blob=base64.b64encode(bytes(size)).decode(),
+            mimeType="application/octet-stream",
+        ),
+    )
+
+
+if __name__ == "__main__":
+    server.run()
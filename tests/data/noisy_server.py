@@ -0,0 +1,29 @@
+"""Stdio MCP server that writes to stderr and can crash."""
+
+import os
+import sys
+
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("noisy")
+
+
+@server.tool()
+def shout(lines: int, width: int = 100) -> str:
+    """Write *lines* numbered lines of *width* characters to stderr."""
+    for n in range(lines):
+        print(f"line {n} ".ljust(width, "."), file=sys.stderr)
+    sys.stderr.flush()
+    return "ok"
+
+
+@server.tool()
+def crash() -> str:
+    """Report a fatal error on stderr and exit without answering."""
+    print("fatal: disk on fire", file=sys.stderr, flush=True)
+    os._exit(3)
+
+
+if __name__ == "__main__":
+    print("noisy server starting", file=sys.stderr, flush=True)
+    server.run()
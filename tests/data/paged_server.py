@@ -0,0 +1,78 @@
+"""Stdio MCP server listing its tools in pages, used by the tdd tests.
+
+Usage: ``paged_server.py TOOLS PAGE_SIZE [--log FILE] [--crash-once FILE]
+[--slow PAGE] [--loop]``.  Cursors are tool offsets; every cursor asked
+for is appended to the ``--log`` file.  With ``--crash-once`` the server
+exits while serving the third page if FILE does not exist yet (and
+creates it), ``--slow`` stalls on the given page and ``--loop`` always
+returns the same cursor.
+
+It speaks JSON-RPC directly: the Python SDK's server (1.9) does not pass
+the ``tools/list`` cursor on to its handlers.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+parser = argparse.ArgumentParser()
+parser.add_argument("tools", type=int)
+parser.add_argument("page_size", type=int)
+parser.add_argument("--log", type=Path)
+parser.add_argument("--crash-once", type=Path)
+parser.add_argument("--slow", type=int)
+parser.add_argument("--loop", action="store_true")
+args = parser.parse_args()
+
+
+def list_tools(cursor: str | None) -> dict:
+    if args.log is not None:
+        with args.log.open("a") as f:
+            f.write(f"{cursor}\n")
+    start = int(cursor or 0)
+    page = start // args.page_size + 1
+    if page == 3 and args.crash_once and not args.crash_once.exists():
+        args.crash_once.touch()
+        os._exit(1)
+    if page == args.slow:
+        time.sleep(60)
+    end = min(start + args.page_size, args.tools)
+    result: dict = {
+        "tools": [
+            {"name": f"tool_{n}", "inputSchema": {"type": "object"}}
+            for n in range(start, end)
+        ]
+    }
+    if args.loop:
+        result["nextCursor"] = "0"
+    elif end < args.tools:
+        result["nextCursor"] = str(end)
+    return result
+
+
+def main() -> None:
+    for line in sys.stdin:
+        message = json.loads(line)
+        if "id" not in message:
+            continue
+        params = message.get("params") or {}
+        if message["method"] == "initialize":
+            result = {
+                "protocolVersion": params["protocolVersion"],
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": "paged", "version": "1"},
+            }
+        elif message["method"] == "tools/list":
+            result = list_tools(params.get("cursor"))
+        else:
+            result = {}
+        response = {"jsonrpc": "2.0", "id": message["id"], "result": result}
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
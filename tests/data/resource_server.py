@@ -0,0 +1,50 @@
+"""Minimal stdio MCP server publishing resources, used by the tdd tests.
+
+``memo://counter`` reports how often it was read; subscribing to it makes
+the server announce an update shortly afterwards.  ``memo://static`` does
+not support subscriptions.
+"""
+
+import asyncio
+
+import anyio
+from mcp import types
+from mcp.server.lowlevel import Server
+from mcp.server.stdio import stdio_server
+from pydantic import AnyUrl
+
+server = Server("resources")
+reads = {"memo://counter": 0, "memo://static": 0}
+
+
+@server.list_resources()
+async def list_resources() -> list[types.Resource]:
+    return [types.Resource(uri=AnyUrl(uri), name=uri[7:]) for uri in reads]
+
+
+@server.read_resource()
+async def read_resource(uri: AnyUrl) -> str:
+    reads[str(uri)] += 1
+    return f"{uri} read {reads[str(uri)]} times"
+
+
+@server.subscribe_resource()
+async def subscribe(uri: AnyUrl) -> None:
+    if str(uri) != "memo://counter":
+        raise ValueError("subscriptions are not supported")
+    session = server.request_context.session
+
+    async def announce() -> None:
+        await asyncio.sleep(0.5)
+        await session.send_resource_updated(uri)
+
+    asyncio.get_running_loop().create_task(announce())
+
+
+async def main() -> None:
+    async with stdio_server() as (read, write):
+        await server.run(read, write, server.create_initialization_options())
+
+
+if __name__ == "__main__":
+    anyio.run(main)
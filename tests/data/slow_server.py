@@ -0,0 +1,25 @@
+"""Stdio MCP server with a tool that reports being cancelled."""
+
+import os
+from pathlib import Path
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("slow")
+
+
+@server.tool()
+async def sleep(seconds: float, marker: str) -> str:
+    """Sleep, writing "cancelled" to *marker* if the call is cancelled."""
+    Path(marker).write_text(f"started {os.getpid()}")
+    try:
+        await anyio.sleep(seconds)
+    except anyio.get_cancelled_exc_class():
+        Path(marker).write_text("cancelled")
+        raise
+    return "done"
+
+
+if __name__ == "__main__":
+    server.run()
@@ -0,0 +1,29 @@
+"""Stdio MCP server with a few tools, used by the tests."""
+
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+server = FastMCP("tools")
+
+
+@server.tool()
+def add(a: int, b: int) -> int:
+    """Add two numbers."""
+    return a + b
+
+
+@server.tool()
+def pid() -> int:
+    """Process id of the server."""
+    return os.getpid()
+
+
+@server.tool()
+def fail(message: str) -> str:
+    """Always fails with *message*."""
+    raise ValueError(message)
+
+
+if __name__ == "__main__":
+    server.run()
@@ -0,0 +1,92 @@
+import base64
+import json
+import sys
+
+from mcp import types
+
+from llm_mcp import replay
+from llm_mcp.schema import MCPTool, ServerConfig, StdioServerParameters
+from llm_mcp.transport.convert_tool import convert_tool
+from llm_mcp.utils import BlobAttachment, convert_content
+
+PIXEL = (
+    "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAQAAAC1HAwCAAAAC0lEQVR42mNkYAAAAAYAAj"
+    "CB0C8AAAAASUVORK5CYII="
+)
+
+
+def test_image_keeps_its_base64():
+    part = types.ImageContent(type="image", data=PIXEL, mimeType="image/png")
+    attachment = convert_content(part, attachments=True)
+
+    assert isinstance(attachment, BlobAttachment)
+    assert attachment.base64_content() is part.data
+    assert attachment.resolve_type() == "image/png"
+    assert attachment.content_bytes() == base64.b64decode(PIXEL)
+    assert attachment.size == len(base64.b64decode(PIXEL))
+    assert (
+        repr(attachment) == f"<image/png attachment, {attachment.size} bytes>"
+    )
+    # without the flag the bytes are still decoded, as before
+    assert convert_content(part) == base64.b64decode(PIXEL)
+
+
+def test_blob_resource_becomes_an_attachment():
+    blob = base64.b64encode(bytes(1000)).decode()
+    part = types.EmbeddedResource(
+        type="resource",
+        resource=types.BlobResourceContents(
+            uri="mem://x", blob=blob, mimeType="application/pdf"
+        ),
+    )
+    attachment = convert_content(part, attachments=True)
+    assert attachment.base64_content() is blob
+    assert attachment.type == "application/pdf"
+    # a model only ever sees the short repr, not a thousand escaped bytes
+    assert json.dumps([attachment], default=repr) == (
+        '["<application/pdf attachment, 1000 bytes>"]'
+    )
+
+
+def test_tool_returns_attachments(data_dir):
+    params = StdioServerParameters(
+        command=sys.executable, args=[str(data_dir / "image_server.py")]
+    )
+    config = ServerConfig(name="images", parameters=params)
+    pixel = convert_tool(config, MCPTool(name="pixel", inputSchema={}))
+    blob = convert_tool(
+        config,
+        MCPTool(
+            name="blob",
+            inputSchema={
+                "type": "object",
+                "properties": {"size": {"type": "integer"}},
+            },
+        ),
+    )
+
+    image = pixel.implementation()
+    assert isinstance(image, BlobAttachment)
+    assert image.base64_content() == PIXEL
+    assert image.resolve_type() == "image/png"
+
+    zeros = blob.implementation(size=4096)
+    assert zeros.type == "application/octet-stream"
+    assert zeros.content_bytes() == bytes(4096)
+
+
+def test_attachments_are_recorded_and_replayed(tmp_path, monkeypatch):
+    monkeypatch.setenv(replay.FILE_ENV_VAR, str(tmp_path / "calls.db"))
+    monkeypatch.setenv(replay.MODE_ENV_VAR, "record")
+    attachment = BlobAttachment(type="image/png", data=PIXEL)
+    assert replay.call("srv", "img", {}, lambda: [attachment]) == [attachment]
+    replay.close_all()
+
+    monkeypatch.setenv(replay.MODE_ENV_VAR, "replay")
+    try:
+        (replayed,) = replay.call("srv", "img", {}, lambda: None)
+    finally:
+        replay.close_all()
+    assert isinstance(replayed, BlobAttachment)
+    assert replayed.base64_content() == PIXEL
+    assert replayed.type == "image/png"
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from mcp.shared.exceptions import McpError
+from mcp.types import ErrorData
+from pydantic import AnyUrl
+
+from llm_mcp.schema import RemoteServerParameters
+from llm_mcp.transport import http, pagination
+from llm_mcp.transport.balancer import Balancer, get_balancer
+from llm_mcp.utils import parse_params
+
+URLS = ["http://a.test/mcp", "http://b.test/mcp", "http://c.test/mcp"]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _fail(balancer: Balancer, url: str) -> None:
+    endpoint = next(e for e in balancer.endpoints if e.url == url)
+    endpoint.outstanding += 1
+    balancer.release(endpoint, 0.1, ok=False)
+
+
+def test_round_robin_spreads_calls():
+    balancer = Balancer(URLS)
+    picked = []
+    for _ in range(6):
+        with balancer.route() as url:
+            picked.append(url)
+    assert sorted(picked) == sorted(URLS * 2)
+
+
+def test_least_outstanding_avoids_busy_endpoint():
+    balancer = Balancer(URLS, routing="least_outstanding")
+    busy_a = balancer.acquire()
+    busy_b = balancer.acquire()
+    third = balancer.acquire()
+    assert {busy_a.url, busy_b.url, third.url} == set(URLS)
+
+
+def test_ewma_prefers_fast_endpoint():
+    balancer = Balancer(URLS[:2], routing="ewma")
+    slow, fast = balancer.endpoints
+    slow.outstanding = fast.outstanding = 1
+    balancer.release(slow, 2.0, ok=True)
+    balancer.release(fast, 0.1, ok=True)
+    assert all(balancer.acquire().url == fast.url for _ in range(3))
+
+
+def test_ejection_and_readmission():
+    clock = FakeClock()
+    balancer = Balancer(URLS[:2], eject_after=2, eject_seconds=10, clock=clock)
+    _fail(balancer, URLS[0])
+    _fail(balancer, URLS[0])
+
+    # ejected endpoint is skipped while its penalty lasts
+    assert {balancer.acquire().url for _ in range(4)} == {URLS[1]}
+
+    # re-admitted after the penalty expires
+    clock.now += 11
+    assert URLS[0] in {balancer.acquire().url for _ in range(4)}
+
+
+def test_all_ejected_still_routes():
+    clock = FakeClock()
+    balancer = Balancer(URLS[:2], eject_after=1, clock=clock)
+    _fail(balancer, URLS[0])
+    clock.now += 1
+    _fail(balancer, URLS[1])
+    assert balancer.acquire().url == URLS[0]
+
+
+def test_route_health_accounting():
+    balancer = Balancer(URLS[:1], eject_after=1)
+    endpoint = balancer.endpoints[0]
+
+    with pytest.raises(McpError), balancer.route():
+        raise McpError(ErrorData(code=-1, message="tool failed"))
+    assert endpoint.failures == 0
+
+    with pytest.raises(ConnectionError), balancer.route():
+        raise ConnectionError("down")
+    assert endpoint.failures == 1
+    assert endpoint.outstanding == 0
+    assert balancer.snapshot()[0]["healthy"] is False
+
+
+def test_protocol_error_in_session_keeps_endpoint(live_url):
+    params = RemoteServerParameters(url=live_url)
+    balancer = Balancer([live_url], eject_after=1)
+
+    async def _run() -> None:
+        with balancer.route() as url:
+            async with http._connect(params, url) as session:
+                # not supported by the server: an McpError in a task group
+                await session.subscribe_resource(AnyUrl("file:///x"))
+
+    with pytest.raises(BaseException) as raised:
+        asyncio.run(_run())
+    assert raised.group_contains(McpError)
+    (stats,) = balancer.snapshot()
+    assert stats["healthy"] is True
+    assert stats["errors"] == 0
+
+
+def test_listing_failure_counts_against_endpoint(live_url, monkeypatch):
+    monkeypatch.setenv(pagination.PAGE_TIMEOUT_ENV_VAR, "0.000001")
+    params = RemoteServerParameters(url=live_url, eject_after=1)
+    with pytest.raises(pagination.PageTimeout):
+        asyncio.run(http.list_tools(params))
+    (stats,) = get_balancer(params).snapshot()
+    assert stats["healthy"] is False
+    assert stats["errors"] == 1
+
+
+def test_get_balancer_is_shared_per_endpoint_set():
+    params = parse_params(" ".join(URLS))
+    assert isinstance(params, RemoteServerParameters)
+    assert params.urls == URLS
+    assert get_balancer(params) is get_balancer(params.model_copy())
+
+
+def test_invalid_endpoint_rejected():
+    with pytest.raises(ValueError, match="Invalid URL"):
+        RemoteServerParameters(url=URLS[0], endpoints=["ftp://nope"])
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+from mcp import McpError, types
+
+from llm_mcp import bench
+from llm_mcp.schema import ServerConfig, StdioServerParameters
+
+
+@pytest.fixture
+def config():
+    return ServerConfig(
+        name="demo",
+        parameters=StdioServerParameters(command="demo"),
+        tools=[],
+    )
+
+
+def _fake_call(seen: list, delay: float = 0.001, fail_every: int = 0):
+    async def call(config, tool_name, arguments):
+        seen.append(arguments)
+        await asyncio.sleep(delay)
+        if fail_every and arguments["n"] % fail_every == 0:
+            raise McpError(types.ErrorData(code=-1, message="boom\nmore"))
+        return "ok"
+
+    return call
+
+
+def test_render_arguments():
+    template = {"n": "$i", "path": "out/$i.txt", "tags": ["$i", 1, "$x"]}
+    assert bench.render_arguments(template, 7) == {
+        "n": 7,
+        "path": "out/7.txt",
+        "tags": [7, 1, "$x"],
+    }
+
+
+def test_load_argument_sets():
+    assert bench.load_argument_sets(['{"a": 1}', "", '{"a": 2}\n']) == [
+        {"a": 1},
+        {"a": 2},
+    ]
+    with pytest.raises(TypeError, match="line 1"):
+        bench.load_argument_sets(["[1]"])
+
+
+def test_closed_loop_counts_calls_and_errors(config):
+    seen: list = []
+    result = asyncio.run(
+        bench.run_bench(
+            config,
+            "echo",
+            [{"n": "$i"}],
+            concurrency=4,
+            duration=5,
+            max_calls=20,
+            call=_fake_call(seen, fail_every=5),
+        )
+    )
+    assert result.calls == 20
+    assert sorted(a["n"] for a in seen) == list(range(20))
+    assert len(result.latencies) == 16
+    assert result.errors == {"McpError: boom": 4}
+
+    report = result.as_dict()
+    assert report["ok"] == 16
+    assert set(report["latency_ms"]) == {"p50", "p90", "p99", "mean", "max"}
+    assert report["processes"] == {"opened": 0, "peak": 0}
+
+
+def test_open_loop_follows_the_rate(config):
+    seen: list = []
+    result = asyncio.run(
+        bench.run_bench(
+            config,
+            "echo",
+            [{"n": "$i"}, {"n": "$i", "other": True}],
+            rate=100,
+            duration=0.2,
+            call=_fake_call(seen),
+        )
+    )
+    assert 15 <= result.calls <= 21
+    assert [len(a) for a in seen[:4]] == [1, 2, 1, 2]
+    assert result.elapsed >= 0.19
+
+
+def test_percentile():
+    data = [float(i) for i in range(101)]
+    assert bench.percentile(data, 50) == 50
+    assert bench.percentile(data, 99) == 99
+    assert bench.percentile([], 99) == 0.0
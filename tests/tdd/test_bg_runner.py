@@ -1,4 +1,7 @@
 import asyncio
+import json
+import threading
+import time
 from collections.abc import Generator
 from typing import Any
 
@@ -25,33 +28,121 @@ def test_run_async_inside_loop() -> None:
     assert asyncio.run(_inner()) == 5
 
 
+def _run_in_loop(coro):
+    """Call run_async from inside a running loop (background path)."""
+
+    async def _inner():
+        return bg_runner.run_async(coro)
+
+    return asyncio.run(_inner())
+
+
 def test_background_loop_singleton() -> None:
     """Multiple calls share the same background loop & thread."""
     # First call - initialises the loop/thread.
-    bg_runner.run_async(_add(0, 0))
-    loop1 = bg_runner._bg_loop  # type: ignore[attr-defined]
-    thread1 = bg_runner._bg_thread  # type: ignore[attr-defined]
+    _run_in_loop(_add(0, 0))
+    shard1 = bg_runner._shards[0]  # type: ignore[attr-defined]
 
     # Second call - should reuse the same resources.
-    bg_runner.run_async(_add(1, 1))
-    assert bg_runner._bg_loop is loop1  # type: ignore[attr-defined]
-    assert bg_runner._bg_thread is thread1  # type: ignore[attr-defined]
+    _run_in_loop(_add(1, 1))
+    assert bg_runner._shards[0] is shard1  # type: ignore[attr-defined]
+    assert shard1.thread.name == "llm-mcp-bg"
+    assert shard1.thread.is_alive()
 
 
 def test_shutdown_resets_globals() -> None:
+    _run_in_loop(_add(0, 0))
+    shard = bg_runner._shards[0]  # type: ignore[attr-defined]
     bg_runner.shutdown()
-    assert bg_runner._bg_loop is None  # type: ignore[attr-defined]
-    assert bg_runner._bg_thread is None  # type: ignore[attr-defined]
+    assert bg_runner._shards == {}  # type: ignore[attr-defined]
+    assert not shard.thread.is_alive()
 
     # It should be possible to use run_async() again afterwards.
     assert bg_runner.run_async(_add(4, 5)) == 9
+    assert _run_in_loop(_add(4, 5)) == 9
 
     # Clean up once more so we leave no dangling threads for other tests.
     bg_runner.shutdown()
 
 
+def test_sharded_runner_is_key_affine() -> None:
+    bg_runner.configure(shards=4)
+    try:
+
+        async def _thread_name() -> str:
+            return threading.current_thread().name
+
+        names = {_run_in_loop(_thread_name()) for _ in range(8)}
+        assert len(names) == 4
+
+        for key in ("filesystem", "gitmcp_llm", "sqlite"):
+            keyed = {
+                asyncio.run(_keyed(_thread_name(), key)) for _ in range(5)
+            }
+            assert len(keyed) == 1
+
+        stats = bg_runner.stats()
+        assert stats["shard_count"] == 4
+        assert len(stats["shards"]) == 4
+        assert stats["submitted"] == sum(
+            s["submitted"] for s in stats["shards"]
+        )
+    finally:
+        bg_runner.configure(shards=1)
+
+    assert bg_runner._shards == {}  # type: ignore[attr-defined]
+
+
+async def _keyed(coro, key: str):
+    return bg_runner.run_async(coro, key=key)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def _bg_cleanup() -> Generator[None, Any, None]:
     """Ensure the background loop is gone at the end of the test session."""
     yield
     bg_runner.shutdown()
+
+
+def test_stats_counts_submissions() -> None:
+    before = bg_runner.stats()["submitted"]
+
+    async def _inner() -> int:
+        return bg_runner.run_async(_add(1, 1))
+
+    assert asyncio.run(_inner()) == 2
+    stats = bg_runner.stats()
+    assert stats["shards"][0]["submitted"] >= 1
+    assert stats["submitted"] == before + 1
+    assert stats["queued"] == stats["in_flight"] == 0
+
+
+def test_monitor_reports_blocking_callback(tmp_path) -> None:
+    status_path = tmp_path / "status.json"
+    bg_runner.shutdown()
+    bg_runner.enable_monitor(
+        interval=0.01,
+        slow_threshold=0.05,
+        status_every=0.01,
+        status_path=status_path,
+    )
+
+    async def _blocking() -> None:
+        time.sleep(0.3)  # CPU-bound work stalls every other call
+
+    async def _inner() -> None:
+        bg_runner.run_async(_blocking())
+
+    try:
+        asyncio.run(_inner())
+        time.sleep(0.05)
+        report = bg_runner.stats()["shards"][0]["monitor"]
+        assert report["lag_ms"]["max"] >= 200
+        assert "_blocking" in report["slow_callbacks"][-1]["stack"]
+        assert json.loads(status_path.read_text())["shard_count"] == 1
+    finally:
+        bg_runner.disable_monitor()
+        bg_runner.shutdown()
+
+    assert not status_path.exists()
+    assert bg_runner.stats()["shards"] == []
@@ -0,0 +1,110 @@
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from llm_mcp import store
+from llm_mcp.bridge import Bridge, SessionPool
+from llm_mcp.schema import (
+    RemoteServerParameters,
+    ServerConfig,
+    StdioServerParameters,
+)
+from llm_mcp.transport import dispatch, http
+
+
+@pytest.fixture
+def calc(data_dir, llm_user_dir):
+    params = StdioServerParameters(
+        command=sys.executable, args=[str(data_dir / "tool_server.py")]
+    )
+    config = ServerConfig(
+        name="calc", parameters=params, tools=dispatch.list_tools_sync(params)
+    )
+    store.save_server(config)
+    yield config
+    store.remove_server("calc")
+
+
+async def _pid(pool: SessionPool) -> str:
+    result = await pool.call_tool("pid")
+    return result.content[0].text
+
+
+@pytest.mark.asyncio
+async def test_pool_opens_sessions_while_busy(calc):
+    pool = SessionPool(calc, size=2)
+    try:
+        async with pool.session() as first, pool.session() as second:
+            assert first is not second
+            # both are busy and the pool is full: share the least busy
+            async with pool.session() as third:
+                assert third in (first, second)
+                assert pool.stats()["in_flight"] == 3
+        assert pool.stats() == {"sessions": 2, "in_flight": 0, "calls": 3}
+        pids = {await _pid(pool) for _ in range(3)}
+        assert len(pids) == 1  # idle sessions are reused, not multiplied
+    finally:
+        await pool.aclose()
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_closed_session(calc):
+    pool = SessionPool(calc, size=1)
+    try:
+        async with pool.session() as pooled:
+            before = await _pid(pool)
+        await pooled.close()
+        assert await _pid(pool) != before
+    finally:
+        await pool.aclose()
+
+
+def test_bridge_rejects_remote_server():
+    config = ServerConfig(
+        name="remote",
+        parameters=RemoteServerParameters(url="https://example.com/mcp"),
+    )
+    with pytest.raises(TypeError, match="not a stdio server"):
+        Bridge(config)
+
+
+def test_bridge_serves_http_end_to_end(calc, llm_user_dir):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    process = subprocess.Popen(  # noqa: S603
+        [
+            sys.executable,
+            "-m",
+            "llm_mcp",
+            "bridge",
+            "calc",
+            "--port",
+            str(port),
+            "--sessions",
+            "2",
+        ],
+        env={**os.environ, "LLM_USER_PATH": str(llm_user_dir)},
+    )
+    try:
+        for _ in range(100):
+            with (
+                contextlib.suppress(OSError),
+                socket.create_connection(("127.0.0.1", port), timeout=0.1),
+            ):
+                break
+            time.sleep(0.1)
+        remote = RemoteServerParameters(url=f"http://127.0.0.1:{port}/mcp")
+        tools = asyncio.run(http.list_tools(remote))
+        assert [tool.name for tool in tools] == ["add", "pid", "fail"]
+        result = asyncio.run(http.call_tool(remote, "add", {"a": 2, "b": 3}))
+        assert result == 5
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
@@ -0,0 +1,166 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from llm_mcp.bridge import SessionPool
+from llm_mcp.schema import CallLimits, ServerConfig, StdioServerParameters
+from llm_mcp.transport import bg_runner, cancellation, dispatch, stdio
+from llm_mcp.transport.cancellation import DeadlineExceeded, deadline
+
+
+@pytest.fixture
+def slow(data_dir):
+    return StdioServerParameters(
+        command=sys.executable, args=[str(data_dir / "slow_server.py")]
+    )
+
+
+def _wait_for(marker, text: str, seconds: float = 10) -> bool:
+    stop = time.monotonic() + seconds
+    while time.monotonic() < stop:
+        if marker.exists() and marker.read_text().startswith(text):
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def _stopped(marker, seconds: float = 10) -> bool:
+    """The server handling the call was told to stop or has exited."""
+    assert _wait_for(marker, "", seconds)
+    text = marker.read_text()
+    if text == "cancelled":
+        return True
+    pid = int(text.split()[1])
+    stop = time.monotonic() + seconds
+    while time.monotonic() < stop:
+        if marker.read_text() == "cancelled":
+            return True
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_deadline_cancels_call_on_server(slow, tmp_path):
+    marker = tmp_path / "marker"
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded, match="within 3s"):
+        stdio.call_tool_sync(
+            slow, "sleep", {"seconds": 60, "marker": str(marker)}, timeout=3
+        )
+    assert time.monotonic() - start < 10
+    assert _stopped(marker)
+
+
+class _Session:
+    """Stand-in session whose calls run *handler*."""
+
+    _request_id = 7
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.notified: list[object] = []
+
+    async def call_tool(self, name, arguments):
+        return await self.handler()
+
+    async def send_notification(self, notification):
+        self.notified.append(notification)
+
+
+async def _own_timeout():
+    raise TimeoutError("read timed out")
+
+
+@pytest.mark.asyncio
+async def test_timeout_without_deadline_is_not_a_cancellation():
+    session = _Session(_own_timeout)
+    with pytest.raises(TimeoutError, match="read timed out"):
+        await cancellation.call_tool(session, "sleep")  # type: ignore[arg-type]
+    assert session.notified == []
+
+
+@pytest.mark.asyncio
+async def test_own_timeout_inside_a_deadline_is_not_the_deadline():
+    session = _Session(_own_timeout)
+    with (
+        pytest.raises(TimeoutError, match="read timed out") as raised,
+        deadline(30),
+    ):
+        await cancellation.call_tool(session, "sleep")  # type: ignore[arg-type]
+    assert not isinstance(raised.value, DeadlineExceeded)
+    assert session.notified == []
+
+
+@pytest.mark.asyncio
+async def test_calls_do_not_extend_the_deadline():
+    async def quick():
+        return "done"
+
+    session = _Session(quick)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded), deadline(0.3):
+        for _ in range(3):
+            await cancellation.call_tool(session, "quick")  # type: ignore[arg-type]
+        await asyncio.sleep(10)
+    assert time.monotonic() - start < cancellation.NOTIFY_SECONDS
+    assert session.notified == []
+
+
+@pytest.mark.asyncio
+async def test_abandoned_background_call_is_cancelled(slow, tmp_path):
+    # inside a running loop the call runs on the background loop
+    marker = tmp_path / "marker"
+    coro = stdio.call_tool(
+        slow, "sleep", {"seconds": 60, "marker": str(marker)}
+    )
+    with pytest.raises(DeadlineExceeded):
+        bg_runner.run_async(coro, timeout=3)
+    assert _stopped(marker)
+
+
+@pytest.mark.asyncio
+async def test_deadline_covers_waiting_for_a_slot(slow, tmp_path):
+    config = ServerConfig(
+        name="slow", parameters=slow, limits=CallLimits(max_concurrency=1)
+    )
+    arguments = {"seconds": 60, "marker": str(tmp_path / "marker")}
+    busy = asyncio.ensure_future(
+        dispatch.call_tool(config, "sleep", arguments, timeout=3)
+    )
+    await asyncio.sleep(0.2)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        await dispatch.call_tool(config, "sleep", arguments, timeout=0.5)
+    assert time.monotonic() - start < 2
+    with pytest.raises(DeadlineExceeded):
+        await busy
+
+
+@pytest.mark.asyncio
+async def test_pool_recovers_after_cancelled_call(slow, tmp_path):
+    config = ServerConfig(name="slow", parameters=slow)
+    pool = SessionPool(config, size=1)
+    marker = tmp_path / "marker"
+    quick = {"seconds": 0, "marker": str(marker)}
+    try:
+        await pool.call_tool("sleep", quick)  # spawn before the deadline
+        with pytest.raises(DeadlineExceeded), deadline(0.5):
+            await pool.call_tool(
+                "sleep", {"seconds": 60, "marker": str(marker)}
+            )
+        assert await asyncio.to_thread(_wait_for, marker, "cancelled")
+
+        # the Python SDK's server stops answering after a cancellation: the
+        # pool notices and replaces the session
+
+        result = await pool.call_tool("sleep", quick)
+        assert result.content[0].text == "done"
+        assert pool.stats()["sessions"] == 1
+    finally:
+        await pool.aclose()
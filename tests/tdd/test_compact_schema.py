@@ -0,0 +1,158 @@
+import pytest
+
+from llm_mcp import manager, store
+from llm_mcp.schema import (
+    MCPTool,
+    SchemaCompaction,
+    ServerConfig,
+    StdioServerParameters,
+)
+from llm_mcp.transport import convert_tool
+from llm_mcp.utils import (
+    InvalidArguments,
+    compact_schema,
+    compact_tool,
+    tools_bytes,
+)
+
+BLOATED = {
+    "$schema": "http://json-schema.org/draft-07/schema#",
+    "title": "search_arguments",
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "title": {"title": "Title", "type": "string", "examples": ["x"]},
+        "filter": {"$ref": "#/$defs/Filter", "description": "Narrow it."},
+        "tree": {"$ref": "#/$defs/Node"},
+        "labels": {
+            "type": "object",
+            "additionalProperties": {"type": "string", "title": "Label"},
+        },
+    },
+    "$defs": {
+        "Filter": {
+            "title": "Filter",
+            "type": "object",
+            "properties": {"kind": {"$ref": "#/$defs/Kind"}},
+        },
+        "Kind": {"title": "Kind", "enum": ["a", "b"]},
+        "Node": {
+            "type": "object",
+            "properties": {
+                "children": {
+                    "type": "array",
+                    "items": {"$ref": "#/$defs/Node"},
+                }
+            },
+        },
+    },
+}
+
+
+def test_compact_schema_strips_and_inlines():
+    compacted = compact_schema(BLOATED, SchemaCompaction())
+    assert compacted == {
+        "type": "object",
+        # false still tells the model not to invent arguments
+        "additionalProperties": False,
+        "properties": {
+            # a property called "title" is not a title keyword
+            "title": {"type": "string"},
+            "filter": {
+                "type": "object",
+                "properties": {"kind": {"enum": ["a", "b"]}},
+                "description": "Narrow it.",
+            },
+            "tree": {"$ref": "#/$defs/Node"},
+            "labels": {
+                "type": "object",
+                "additionalProperties": {"type": "string"},
+            },
+        },
+        # recursive definitions stay, inlined ones are gone
+        "$defs": {
+            "Node": {
+                "type": "object",
+                "properties": {
+                    "children": {
+                        "type": "array",
+                        "items": {"$ref": "#/$defs/Node"},
+                    }
+                },
+            },
+        },
+    }
+    assert compact_schema(compacted, SchemaCompaction()) == compacted
+
+
+def test_redundant_additional_properties_are_dropped():
+    schema = {"type": "object", "additionalProperties": True}
+    assert compact_schema(schema, SchemaCompaction()) == {"type": "object"}
+
+
+def test_compaction_is_configurable():
+    compaction = SchemaCompaction(
+        drop_titles=False,
+        drop_additional_properties=False,
+        inline_ref_bytes=0,
+    )
+    compacted = compact_schema(BLOATED, compaction)
+    assert compacted["title"] == "search_arguments"
+    assert compacted["additionalProperties"] is False
+    assert compacted["properties"]["filter"]["$ref"] == "#/$defs/Filter"
+    assert set(compacted["$defs"]) == {"Filter", "Kind", "Node"}
+    assert "$schema" not in compacted
+
+
+def test_descriptions_are_shortened():
+    tool = MCPTool(
+        name="fetch",
+        description="Fetch a page. " + "Mention every option here. " * 80,
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "url": {"type": "string", "description": "word " * 100}
+            },
+        },
+    )
+    compaction = SchemaCompaction(max_tool_description=100)
+    compacted = compact_tool(tool, compaction)
+
+    assert len(compacted.description) <= 100
+    assert compacted.description.endswith(".")
+    url = compacted.inputSchema["properties"]["url"]["description"]
+    assert len(url) <= 200
+    assert url.endswith("word…")
+    assert tools_bytes([compacted]) < tools_bytes([tool]) / 4
+    assert compact_tool(compacted, compaction) == compacted
+
+
+def test_compact_server_persists_and_reports(llm_user_dir):
+    # never contacted: the stored tools are compacted for the model only
+    params = StdioServerParameters(command="no-such-server")
+    tool = MCPTool(name="search", description="Search.", inputSchema=BLOATED)
+    config = ServerConfig(name="calc", parameters=params, tools=[tool])
+    before, after = manager.compact_server(config)
+    assert after < before
+
+    loaded = store.load_server("calc")
+    assert loaded.compaction == SchemaCompaction()
+    assert loaded.get_tool("search").inputSchema == BLOATED
+    assert tools_bytes(map(loaded.model_tool, loaded.tools)) == after
+    store.remove_server("calc")
+
+
+def test_model_sees_compacted_schema_and_arguments_meet_the_full_one():
+    params = StdioServerParameters(command="no-such-server")
+    tool = MCPTool(name="search", description="Search.", inputSchema=BLOATED)
+    config = ServerConfig(
+        name="calc",
+        parameters=params,
+        tools=[tool],
+        compaction=SchemaCompaction(),
+    )
+    llm_tool = convert_tool(config, tool)
+    assert "$schema" not in llm_tool.input_schema
+    assert "title" not in llm_tool.input_schema
+    with pytest.raises(InvalidArguments, match="unexpected"):
+        llm_tool.implementation(title="x", unexpected=1)
@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from llm_mcp.transport.balancer import Balancer
+from llm_mcp.transport.hedging import get_budget, hedged
+
+URLS = ["http://a.test/mcp", "http://b.test/mcp"]
+
+
+def _warm(balancer: Balancer, latency: float = 0.01, count: int = 50):
+    """Record *count* fast calls so the latency percentile is known."""
+    for _ in range(count):
+        balancer.release(balancer.acquire(), latency, ok=True)
+
+
+def _make_attempt(balancer: Balancer, delays: dict[str, float], log: list):
+    async def attempt(used: set[str]) -> str:
+        with balancer.route(exclude=frozenset(used)) as url:
+            used.add(url)
+            log.append(url)
+            try:
+                await asyncio.sleep(delays[url])
+            except asyncio.CancelledError:
+                log.append(f"cancelled {url}")
+                raise
+            return url
+
+    return attempt
+
+
+def test_slow_primary_is_hedged_and_cancelled():
+    balancer = Balancer(URLS)
+    _warm(balancer)
+    log: list[str] = []
+    attempt = _make_attempt(balancer, {URLS[0]: 5.0, URLS[1]: 0.0}, log)
+
+    # force the first attempt onto the slow replica
+    balancer._cursor = len(URLS) - 1
+
+    async def run() -> str:
+        winner = await hedged(attempt, balancer, percentile=90, budget=100)
+        await asyncio.sleep(0)
+        return winner
+
+    assert asyncio.run(run()) == URLS[1]
+    assert log == [URLS[0], URLS[1], f"cancelled {URLS[0]}"]
+    assert get_budget(balancer).hedges == 1
+    assert all(e.outstanding == 0 for e in balancer.endpoints)
+
+
+def test_fast_primary_is_not_hedged():
+    balancer = Balancer(URLS)
+    _warm(balancer, latency=1.0)
+    log: list[str] = []
+    attempt = _make_attempt(balancer, dict.fromkeys(URLS, 0.0), log)
+    asyncio.run(hedged(attempt, balancer, percentile=90, budget=100))
+    assert len(log) == 1
+
+
+@pytest.mark.parametrize("warm, budget", [(False, 100), (True, 0)])
+def test_no_hedge_without_samples_or_budget(warm: bool, budget: float):
+    balancer = Balancer(URLS)
+    if warm:
+        _warm(balancer)
+    log: list[str] = []
+    attempt = _make_attempt(balancer, dict.fromkeys(URLS, 0.05), log)
+    asyncio.run(hedged(attempt, balancer, percentile=50, budget=budget))
+    assert len(log) == 1
+    assert get_budget(balancer).hedges == 0
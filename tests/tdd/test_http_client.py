@@ -0,0 +1,176 @@
+import asyncio
+import gzip
+import inspect
+
+import httpx
+import pytest
+from mcp.client.streamable_http import StreamableHTTPTransport
+
+from llm_mcp.schema import RemoteServerParameters
+from llm_mcp.transport import bg_runner, http, http_client
+
+BODY = b'{"jsonrpc": "2.0", "method": "tools/call", "params": "' + b"x" * 4000
+
+
+def _echo(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(
+        200,
+        content=request.content,
+        headers={"X-Encoding": request.headers.get("content-encoding", "")},
+    )
+
+
+async def _post(transport: httpx.AsyncBaseTransport, body: bytes):
+    async with httpx.AsyncClient(transport=transport) as client:
+        return await client.post("http://mcp.test/", content=body)
+
+
+def test_large_request_bodies_are_compressed():
+    transport = http_client.CompressingTransport(
+        httpx.MockTransport(_echo), "gzip"
+    )
+    response = asyncio.run(_post(transport, BODY))
+    assert response.headers["X-Encoding"] == "gzip"
+    assert len(response.content) < len(BODY) / 10
+    assert gzip.decompress(response.content) == BODY
+
+    response = asyncio.run(_post(transport, b"{}"))
+    assert response.headers["X-Encoding"] == ""
+    assert response.content == b"{}"
+
+
+def test_brotli_request_bodies():
+    brotli = pytest.importorskip("brotli")
+    transport = http_client.CompressingTransport(
+        httpx.MockTransport(_echo), "br"
+    )
+    response = asyncio.run(_post(transport, BODY))
+    assert response.headers["X-Encoding"] == "br"
+    assert brotli.decompress(response.content) == BODY
+
+
+def test_shared_client_per_loop_and_configuration():
+    options = {
+        "http2": False,
+        "compression": "gzip",
+        "compress_requests": False,
+        "plain_http": True,
+        "timeout": httpx.Timeout(30),
+    }
+
+    async def clients():
+        first = http_client.shared_client(**options)
+        second = http_client.shared_client(**options)
+        other = http_client.shared_client(**{**options, "compression": None})
+        return first, second, other
+
+    first, second, other = asyncio.run(clients())
+    assert first is second
+    assert first is not other
+    assert first.headers["Accept-Encoding"] == "gzip"
+    (again, *_) = asyncio.run(clients())
+    assert again is not first
+
+
+def _client_options() -> dict:
+    return {
+        "http2": False,
+        "compression": None,
+        "compress_requests": False,
+        "plain_http": True,
+        "timeout": httpx.Timeout(30),
+    }
+
+
+def test_clients_close_with_a_temporary_loop():
+    async def client():
+        return http_client.shared_client(**_client_options())
+
+    # no running loop: run_async uses (and closes) a loop of its own
+    shared = bg_runner.run_async(client())
+    assert shared.is_closed
+
+
+def test_clients_close_with_a_background_loop():
+    async def client():
+        return http_client.shared_client(**_client_options())
+
+    try:
+        shared = bg_runner.submit(client()).result(timeout=5)
+        assert not shared.is_closed
+    finally:
+        bg_runner.shutdown()
+    assert shared.is_closed
+
+
+def test_cancelled_request_finishes_in_background():
+    finished = []
+
+    async def slow(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(0.1)
+        finished.append(request.url.path)
+        return httpx.Response(200, content=b"done")
+
+    async def main():
+        transport = http_client.ShieldedTransport(httpx.MockTransport(slow))
+        call = asyncio.ensure_future(_post(transport, b"{}"))
+        await asyncio.sleep(0.01)
+        call.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await call
+        assert finished == []
+        await asyncio.sleep(0.2)
+        assert finished == ["/"]
+        assert (await _post(transport, b"{}")).content == b"done"
+
+    asyncio.run(main())
+
+
+def test_transport_options_are_not_passed_upstream():
+    params = RemoteServerParameters(
+        url="https://mcp.test/mcp",
+        http2=True,
+        compression="br",
+        compress_requests=True,
+    )
+    assert set(params.as_kwargs()) == {
+        "headers",
+        "timeout",
+        "sse_read_timeout",
+        "terminate_on_close",
+    }
+
+
+def test_copied_transport_wiring_matches_the_sdk():
+    # shared_streamablehttp_client wires these up like mcp 1.9's
+    # streamablehttp_client does; a changed SDK must fail here
+    expected = {
+        "__init__": ["self", "url", "headers", "timeout", "sse_read_timeout"],
+        "post_writer": [
+            "self",
+            "client",
+            "write_stream_reader",
+            "read_stream_writer",
+            "write_stream",
+            "start_get_stream",
+            "tg",
+        ],
+        "handle_get_stream": ["self", "client", "read_stream_writer"],
+        "terminate_session": ["self", "client"],
+        "get_session_id": ["self"],
+    }
+    for name, parameters in expected.items():
+        signature = inspect.signature(getattr(StreamableHTTPTransport, name))
+        assert list(signature.parameters) == parameters, name
+    assert StreamableHTTPTransport("http://mcp.test/").session_id is None
+
+
+def test_shared_client_sessions_call_a_live_server(live_url):
+    params = RemoteServerParameters(url=live_url, compression="gzip")
+
+    async def _run():
+        tools = await http.list_tools(params)
+        result = await http.call_tool(params, "add", {"a": 2, "b": 3})
+        return [tool.name for tool in tools], result
+
+    assert asyncio.run(_run()) == (["add"], 5)
@@ -0,0 +1,168 @@
+import asyncio
+import json
+import sys
+import threading
+import weakref
+
+import pytest
+from click.testing import CliRunner
+
+from llm_mcp import journal
+from llm_mcp.cli import mcp
+from llm_mcp.schema import ServerConfig, StdioServerParameters
+from llm_mcp.transport import dispatch
+from llm_mcp.utils import BlobAttachment
+
+
+@pytest.fixture
+def path(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    journal.enable(path)
+    yield path
+    journal.disable()
+
+
+async def _value(value):
+    return value
+
+
+async def _fail():
+    raise ValueError("boom")
+
+
+def _lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_disabled_journal_writes_nothing(tmp_path):
+    assert not journal.enabled()
+    assert asyncio.run(journal.journaled("s", "t", {}, _value(1))) == 1
+    assert journal.flush()
+
+
+def test_calls_are_journaled_in_the_background(path):
+    result = asyncio.run(
+        journal.journaled("srv", "get", {"q": "é"}, _value({"n": 12}))
+    )
+    assert result == {"n": 12}
+    with pytest.raises(ValueError):
+        asyncio.run(journal.journaled("srv", "put", None, _fail()))
+    assert journal.flush(timeout=5)
+
+    ok, failed = _lines(path)
+    assert ok[1:5] == ["srv", "get", len('{"q":"é"}'.encode()), 8]
+    assert ok[5] >= 0
+    assert ok[6] is None
+    assert failed[1:3] == ["srv", "put"]
+    assert failed[4] == 0
+    assert failed[6] == "ValueError"
+
+
+def test_queued_calls_do_not_keep_large_results(tmp_path, monkeypatch):
+    stalled, release = threading.Event(), threading.Event()
+    encode = journal._encode
+
+    def slow_encode(entry):
+        stalled.set()
+        release.wait(5)
+        return encode(entry)
+
+    monkeypatch.setattr(journal, "_encode", slow_encode)
+    calls = journal.CallJournal(tmp_path / "calls.jsonl")
+    calls.record("srv", "first", {}, "x", 0.001)
+    assert stalled.wait(5)  # the writer is stuck on the first call
+
+    blob = BlobAttachment(type="image/png", data="AAAA" * 250_000)
+    collected = weakref.ref(blob)
+    calls.record("srv", "img", {}, blob, 0.001)
+    calls.record("srv", "text", {}, "é" * 10, 0.001)
+    del blob
+    assert collected() is None
+
+    release.set()
+    calls.close()
+    sizes = {line[2]: line[4] for line in _lines(tmp_path / "calls.jsonl")}
+    assert sizes == {"first": 1, "img": 750_000, "text": 20}
+
+
+def test_rotation_keeps_every_line_for_stats(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    calls = journal.CallJournal(path, max_bytes=200, backups=2)
+    for n in range(30):
+        calls.record("srv", "tool", {}, "x" * n, n / 1000)
+        assert calls.flush(timeout=5)
+    calls.close()
+
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "calls.jsonl",
+        "calls.jsonl.1",
+        "calls.jsonl.2",
+    ]
+    assert path.stat().st_size < 200
+    # older lines were rotated out, the rest are all counted
+    tool_stats = journal.stats(path)[("srv", "tool")]
+    kept = sum(1 for p in tmp_path.iterdir() for _ in p.open())
+    assert tool_stats.calls == kept
+    assert tool_stats.max_ms == 29.0
+    assert tool_stats.percentile(0.5) <= tool_stats.max_ms
+
+
+def test_writers_follow_a_rotation_by_another_process(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    first = journal.CallJournal(path, max_bytes=100, backups=2)
+    second = journal.CallJournal(path, max_bytes=10_000, backups=2)
+    second.record("srv", "before", {}, "", 0.001)
+    assert second.flush(timeout=5)
+    for _ in range(5):
+        first.record("srv", "tool", {}, "x" * 50, 0.001)
+        assert first.flush(timeout=5)
+    assert path.with_name("calls.jsonl.1").exists()
+
+    second.record("srv", "after", {}, "", 0.001)
+    assert second.flush(timeout=5)
+    first.close()
+    second.close()
+    assert b'"after"' in path.read_bytes()
+
+
+def test_stats_aggregate_per_tool(tmp_path):
+    path = tmp_path / "calls.jsonl"
+    lines = [[100.0, "a", "x", 10, 100, ms, None] for ms in range(1, 101)] + [
+        [200.0, "b", "y", 1, 0, 5.0, "DeadlineExceeded"]
+    ]
+    path.write_text(
+        "".join(json.dumps(line) + "\n" for line in lines) + '[1, "cut'
+    )
+
+    totals = journal.stats(path)
+    x = totals[("a", "x")]
+    assert (x.calls, x.errors, x.arg_bytes, x.result_bytes) == (
+        100,
+        0,
+        1000,
+        10000,
+    )
+    assert x.percentile(0.5) == pytest.approx(50, rel=0.1)
+    assert x.percentile(0.99) == pytest.approx(99, rel=0.1)
+    assert totals[("b", "y")].errors == 1
+    assert set(journal.stats(path, since=150)) == {("b", "y")}
+
+
+def test_dispatch_and_cli(path, data_dir):
+    params = StdioServerParameters(
+        command=sys.executable, args=[str(data_dir / "tool_server.py")]
+    )
+    config = ServerConfig(name="calc", parameters=params)
+    assert dispatch.call_tool_sync(config, "add", {"a": 2, "b": 3}) == 5
+    assert journal.flush(timeout=5)
+
+    [line] = _lines(path)
+    assert line[1:5] == ["calc", "add", len('{"a":2,"b":3}'), 1]
+
+    result = CliRunner().invoke(mcp, ["journal", "stats", str(path)])
+    assert result.exit_code == 0, result.output
+    assert "calc.add" in result.output
+
+    result = CliRunner().invoke(mcp, ["journal", "stats", str(path), "--json"])
+    [row] = json.loads(result.output)
+    assert (row["server"], row["tool"], row["calls"]) == ("calc", "add", 1)
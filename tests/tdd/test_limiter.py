@@ -0,0 +1,117 @@
+import asyncio
+import time
+
+import pytest
+
+from llm_mcp.schema import CallLimits, ServerConfig, StdioServerParameters
+from llm_mcp.transport.limiter import (
+    Limiter,
+    LimitTimeout,
+    get_limiter,
+    limited,
+)
+
+
+def _config(**kwargs) -> ServerConfig:
+    return ServerConfig(
+        name="limited",
+        parameters=StdioServerParameters(command="demo"),
+        **kwargs,
+    )
+
+
+def test_rate_limit_spaces_calls():
+    limiter = Limiter(CallLimits(rate=50, burst=2))
+
+    async def _run() -> list[float]:
+        starts = []
+
+        async def one() -> None:
+            async with limiter.slot():
+                starts.append(time.monotonic())
+
+        await asyncio.gather(*[one() for _ in range(6)])
+        return starts
+
+    starts = asyncio.run(_run())
+    # two burst calls, then one every 20 ms
+    assert starts[-1] - starts[0] >= 0.07
+    assert limiter.active == 0
+
+
+def test_concurrency_limit_queues_callers():
+    limiter = Limiter(CallLimits(max_concurrency=2))
+    peak = 0
+
+    async def one() -> None:
+        nonlocal peak
+        async with limiter.slot():
+            peak = max(peak, limiter.active)
+            await asyncio.sleep(0.01)
+
+    async def _run() -> None:
+        await asyncio.gather(*[one() for _ in range(7)])
+
+    asyncio.run(_run())
+    assert peak == 2
+    assert limiter.active == 0
+
+
+def test_waiting_past_queue_timeout_fails():
+    limiter = Limiter(CallLimits(max_concurrency=1, queue_timeout=0.05))
+
+    async def _run() -> None:
+        async with limiter.slot():
+            await limiter.acquire()
+
+    with pytest.raises(LimitTimeout, match=r"within 0\.05s"):
+        asyncio.run(_run())
+
+
+def test_limits_are_shared_across_event_loops():
+    limiter = Limiter(CallLimits(max_concurrency=1))
+    released = []
+
+    async def holder() -> None:
+        async with limiter.slot():
+            await asyncio.sleep(0.05)
+            released.append(time.monotonic())
+
+    async def waiter() -> float:
+        await asyncio.sleep(0.01)
+        async with limiter.slot():
+            return time.monotonic()
+
+    async def _run() -> float:
+        loop = asyncio.get_running_loop()
+        other = loop.run_in_executor(None, asyncio.run, waiter())
+        await holder()
+        return await other
+
+    entered = asyncio.run(_run())
+    assert entered >= released[0]
+
+
+def test_server_and_tool_limiters():
+    config = _config(
+        limits=CallLimits(max_concurrency=3),
+        tool_limits={"slow": CallLimits(max_concurrency=1)},
+    )
+    server = get_limiter(config)
+    tool = get_limiter(config, "slow")
+    assert server is get_limiter(config)
+    assert tool is not None and tool.limits.max_concurrency == 1
+    assert get_limiter(config, "fast") is None
+    assert get_limiter(_config()) is None
+
+    async def _run() -> None:
+        async with limited(config, "slow"):
+            assert (tool.active, server.active) == (1, 1)
+            async with limited(config, "fast"):
+                assert (tool.active, server.active) == (1, 2)
+
+    asyncio.run(_run())
+    assert (tool.active, server.active) == (0, 0)
+
+    changed = config.model_copy(update={"limits": CallLimits(rate=1)})
+    assert get_limiter(changed) is not server
@@ -0,0 +1,86 @@
+import sys
+
+import pytest
+from mcp.shared.exceptions import McpError
+
+from llm_mcp import manager, store
+from llm_mcp.schema import StdioServerParameters
+from llm_mcp.transport import dispatch, pagination
+
+
+def _params(data_dir, *args) -> StdioServerParameters:
+    return StdioServerParameters(
+        command=sys.executable,
+        args=[str(data_dir / "paged_server.py"), *map(str, args)],
+    )
+
+
+def test_every_page_is_listed(data_dir):
+    tools = dispatch.list_tools_sync(_params(data_dir, 25, 10))
+    assert [t.name for t in tools] == [f"tool_{n}" for n in range(25)]
+
+
+def test_pages_are_streamed_from_a_cursor(data_dir):
+    pages = []
+    count = dispatch.list_tool_pages_sync(
+        _params(data_dir, 25, 10),
+        lambda page, cursor: pages.append((len(page), cursor)),
+        cursor="10",
+    )
+    assert count == 15
+    assert pages == [(10, "20"), (5, None)]
+
+
+def test_slow_page_times_out(data_dir, monkeypatch):
+    monkeypatch.setenv(pagination.PAGE_TIMEOUT_ENV_VAR, "0.5")
+    with pytest.raises(pagination.PageTimeout, match="Page 2 "):
+        dispatch.list_tools_sync(_params(data_dir, 25, 10, "--slow", 2))
+
+
+def test_repeated_cursor_is_an_error(data_dir):
+    with pytest.raises(pagination.CursorLoop, match="'0'"):
+        dispatch.list_tools_sync(_params(data_dir, 25, 10, "--loop"))
+
+
+def test_add_server_resumes_after_a_failure(data_dir, llm_user_dir, tmp_path):
+    log = tmp_path / "cursors.log"
+    marker = tmp_path / "crashed"
+    command = (
+        f"{sys.executable} {data_dir / 'paged_server.py'} 45 10"
+        f" --log {log} --crash-once {marker}"
+    )
+
+    with pytest.raises(McpError):
+        manager.add_server(command, name="paged")
+    assert store.load_server("paged") is None
+    progress = store.tools_progress_path("paged")
+    assert progress.is_file()
+    assert log.read_text().split() == ["None", "10", "20"]
+
+    cfg = manager.add_server(command, name="paged")
+    assert [t.name for t in cfg.tools] == [f"tool_{n}" for n in range(45)]
+    # the second run started at the first page it had not recorded
+    assert log.read_text().split()[3:] == ["20", "30", "40"]
+    assert not progress.exists()
+    assert len(store.load_server("paged").tools) == 45
+
+
+def test_tools_progress_survives_a_torn_write(data_dir, llm_user_dir):
+    params = _params(data_dir, 25, 10)
+    tools = dispatch.list_tools_sync(params)
+    store.start_tools_progress("paged", params)
+    store.append_tools_page("paged", tools[:10], "10")
+    with store.tools_progress_path("paged").open("a") as f:
+        f.write('{"tools": [{"na')
+    assert store.load_tools_progress("paged", params) == (
+        tools[:10],
+        "10",
+        False,
+    )
+
+    store.append_tools_page("paged", tools[10:], None)
+    assert store.load_tools_progress("paged", params) == (tools, None, True)
+    # a recording of other parameters is not resumed
+    assert store.load_tools_progress("paged", _params(data_dir, 9, 3)) is None
+    store.remove_server("paged")
+    assert not store.tools_progress_path("paged").exists()
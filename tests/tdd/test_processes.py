@@ -0,0 +1,95 @@
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+
+from llm_mcp.schema import ProcessLimits, StdioServerParameters
+from llm_mcp.transport import launcher, processes, stdio
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="rlimits are POSIX only"
+)
+
+PROBE = (
+    "import os, resource; "
+    "print(os.getpid(), resource.getrlimit(resource.RLIMIT_NOFILE)[0], "
+    "os.nice(0))"
+)
+
+
+def test_launcher_applies_limits_and_reports_pid(tmp_path):
+    pid_file = tmp_path / "server.pid"
+    argv = launcher.command(
+        [sys.executable, "-c", PROBE],
+        str(pid_file),
+        rlimits={"nofile": 64},
+        nice=3,
+    )
+    out = subprocess.run(  # noqa: S603
+        argv, capture_output=True, text=True, check=True
+    ).stdout.split()
+    pid, nofile, nice = map(int, out)
+    assert pid_file.read_text() == str(pid)
+    assert nofile == 64
+    assert nice == os.nice(0) + 3
+
+
+def test_launcher_reports_missing_command(tmp_path):
+    argv = launcher.command(
+        ["no-such-mcp-server"], str(tmp_path / "pid"), rlimits={}
+    )
+    result = subprocess.run(  # noqa: S603
+        argv, capture_output=True, text=True, check=False
+    )
+    assert result.returncode == 127
+    assert "cannot run 'no-such-mcp-server'" in result.stderr
+
+
+def test_read_usage():
+    rss, cpu = processes.read_usage(os.getpid())
+    assert rss > 0
+    assert cpu > 0
+
+    child = subprocess.Popen([sys.executable, "-c", "pass"])
+    child.wait()
+    assert processes.read_usage(child.pid) is None
+
+
+def test_recycle_due():
+    process = processes.ServerProcess(1, "srv", recycle_rss=100)
+    assert not process.recycle_due
+    process.rss = 101
+    assert process.recycle_due
+    assert not processes.ServerProcess(1, "srv", rss=10**9).recycle_due
+
+
+def test_limited_server_is_tracked(data_dir, llm_user_dir):
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(data_dir / "resource_server.py")],
+        process_limits=ProcessLimits(max_open_files=256, recycle_rss_mb=1),
+    )
+
+    async def session_usage():
+        async with stdio.open_session(params, server="limited") as session:
+            process = stdio.process_of(session)
+            for _ in range(50):  # the status thread writes on start-up
+                statuses = processes.read_status()
+                if statuses:
+                    break
+                await asyncio.sleep(0.05)
+            return process, processes.snapshot(), statuses
+
+    process, live, statuses = asyncio.run(session_usage())
+    assert process.server == "limited"
+    assert process.rss > 2**20
+    assert process.recycle_due
+    assert [p["pid"] for p in live["processes"]] == [process.pid]
+    assert [s["pid"] for s in statuses] == [os.getpid()]
+
+    totals = processes.snapshot()["servers"]["limited"]
+    assert totals["spawned"] == totals["exited"] >= 1
+    assert totals["recycled"] >= 1
+    assert totals["peak_rss"] >= process.rss
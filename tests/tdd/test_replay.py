@@ -0,0 +1,150 @@
+import sys
+
+import pytest
+from click.testing import CliRunner
+
+from llm_mcp import replay
+from llm_mcp.cli import mcp
+
+
+@pytest.fixture
+def journal_file(tmp_path, monkeypatch):
+    path = tmp_path / "calls.db"
+    monkeypatch.setenv(replay.FILE_ENV_VAR, str(path))
+    yield path
+    replay.close_all()
+
+
+def _live(results: list):
+    calls = iter(results)
+    seen = []
+
+    def live():
+        seen.append(1)
+        return next(calls)
+
+    return live, seen
+
+
+def test_disabled_calls_live(journal_file):
+    live, seen = _live(["a"])
+    assert replay.call("srv", "tool", {}, live) == "a"
+    assert seen == [1]
+    assert not journal_file.exists()
+
+
+def test_record_then_replay(journal_file, monkeypatch):
+    monkeypatch.setenv(replay.MODE_ENV_VAR, "record")
+    live, _ = _live([{"n": 1}, b"\x00png", {"n": 2}])
+    assert replay.call("srv", "get", {"a": 1, "b": 2}, live) == {"n": 1}
+    assert replay.call("srv", "img", None, live) == b"\x00png"
+    assert replay.call("srv", "get", {"b": 2, "a": 1}, live) == {"n": 2}
+    replay.close_all()
+
+    monkeypatch.setenv(replay.MODE_ENV_VAR, "replay")
+    live, seen = _live([])
+    # occurrences replay in order; extra calls repeat the last result
+    assert replay.call("srv", "get", {"a": 1, "b": 2}, live) == {"n": 1}
+    assert replay.call("srv", "get", {"a": 1, "b": 2}, live) == {"n": 2}
+    assert replay.call("srv", "get", {"a": 1, "b": 2}, live) == {"n": 2}
+    assert replay.call("srv", "img", {}, live) == b"\x00png"
+    assert seen == []
+
+    with pytest.raises(replay.ReplayMiss, match=r"srv\.get"):
+        replay.call("srv", "get", {"a": 3}, live)
+
+    journal = replay.open_journal(journal_file)
+    assert journal.stats() == [("srv", "get", 2), ("srv", "img", 1)]
+
+
+def test_invalid_mode(journal_file, monkeypatch):
+    monkeypatch.setenv(replay.MODE_ENV_VAR, "rewind")
+    with pytest.raises(ValueError, match="LLM_MCP_REPLAY"):
+        replay.call("srv", "tool", {}, lambda: None)
+
+
+def test_journals_of_several_processes_append(journal_file):
+    first = replay.Journal(journal_file)
+    first.record("srv", "get", {}, "first-run")
+    first.close()
+    second = replay.Journal(journal_file)
+    second.record("srv", "get", {}, "second-run")
+    second.close()
+
+    journal = replay.Journal(journal_file)
+    assert journal.lookup("srv", "get", {}) == "first-run"
+    assert journal.lookup("srv", "get", {}) == "second-run"
+    assert journal.stats() == [("srv", "get", 2)]
+    journal.close()
+
+
+def test_processes_of_one_run_share_occurrences(journal_file):
+    recorder = replay.Journal(journal_file)
+    for result in ("first", "second", "third"):
+        recorder.record("srv", "get", {}, result)
+    recorder.close()
+
+    first = replay.Journal(journal_file, run="run-1")
+    assert first.lookup("srv", "get", {}) == "first"
+    first.close()
+    second = replay.Journal(journal_file, run="run-1")
+    assert second.lookup("srv", "get", {}) == "second"
+    other = replay.Journal(journal_file, run="run-2")
+    assert other.lookup("srv", "get", {}) == "first"
+    second.end_run()
+    assert second.lookup("srv", "get", {}) == "first"
+    second.close()
+    other.close()
+
+
+def test_replay_cli_continues_across_processes(journal_file, tmp_path):
+    recorder = replay.Journal(journal_file)
+    recorder.record("srv", "get", {}, "first")
+    recorder.record("srv", "get", {}, "second")
+    recorder.close()
+
+    out = tmp_path / "out.txt"
+    child = (
+        "from llm_mcp import replay; "
+        f"open({str(out)!r}, 'a').write("
+        "replay.call('srv', 'get', {}, None) + '\\n')"
+    )
+    script = (
+        "import subprocess, sys\n"
+        "for _ in range(2):\n"
+        f"    subprocess.run([sys.executable, '-c', {child!r}], check=True)\n"
+    )
+    result = CliRunner().invoke(
+        mcp,
+        [
+            "replay",
+            "run",
+            str(journal_file),
+            "--",
+            sys.executable,
+            "-c",
+            script,
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert out.read_text().split() == ["first", "second"]
+
+
+def test_record_cli_starts_a_new_journal_unless_appending(
+    journal_file, monkeypatch
+):
+    monkeypatch.delenv(replay.FILE_ENV_VAR)
+    old = replay.Journal(journal_file)
+    old.record("srv", "get", {}, "old")
+    old.close()
+
+    runner = CliRunner()
+    command = [sys.executable, "-c", "pass"]
+    args = ["replay", "record", str(journal_file)]
+    result = runner.invoke(mcp, [*args, "--append", "--", *command])
+    assert result.exit_code == 0, result.output
+    assert replay.open_journal(journal_file).stats() == [("srv", "get", 1)]
+
+    result = runner.invoke(mcp, [*args, "--", *command])
+    assert result.exit_code == 0, result.output
+    assert replay.open_journal(journal_file).stats() == []
@@ -0,0 +1,133 @@
+import asyncio
+import json
+import shutil
+import sys
+
+import pytest
+
+from llm_mcp.schema import ResolvedLaunch, StdioServerParameters
+from llm_mcp.transport import stdio
+from llm_mcp.utils import resolve_launch, resolved_params
+
+module = sys.modules[resolve_launch.__module__]
+
+
+def test_other_commands_are_not_resolved():
+    params = StdioServerParameters(command="python", args=["server.py"])
+    assert resolve_launch(params) is None
+
+
+def test_npx_call_option_is_not_resolved():
+    params = StdioServerParameters(command="npx", args=["-c", "echo hi"])
+    assert resolve_launch(params) is None
+
+
+def test_npx_picks_the_package_bin(monkeypatch):
+    calls = []
+
+    def run(argv, params):
+        calls.append(argv)
+        bins = {"server-x": "/npx/x/cli.js", "helper": "/npx/x/helper.js"}
+        return json.dumps({"node": "/usr/bin/node", "bins": bins})
+
+    monkeypatch.setattr(module, "_run", run)
+    params = StdioServerParameters(
+        command="npx", args=["-y", "@scope/server-x@1.2", "/data"]
+    )
+    resolved = resolve_launch(params)
+
+    assert calls[0][:4] == ["npx", "-y", "--package", "@scope/server-x@1.2"]
+    assert resolved == ResolvedLaunch(
+        source="npx",
+        command="/usr/bin/node",
+        args=["/npx/x/cli.js", "/data"],
+        paths=["/usr/bin/node", "/npx/x/cli.js"],
+    )
+
+
+def test_uvx_resolves_the_tool_executable(monkeypatch, tmp_path):
+    (tmp_path / "python").touch()
+    (tmp_path / "mcp-server-y").touch()
+    calls = []
+
+    def run(argv, params):
+        calls.append(argv)
+        return f"{tmp_path / 'python'}\n"
+
+    monkeypatch.setattr(module, "_run", run)
+    params = StdioServerParameters(
+        command="uvx",
+        args=["--python", "3.12", "mcp-server-y@latest", "--db", "x.db"],
+    )
+    resolved = resolve_launch(params)
+
+    assert calls[0][:5] == [
+        "uvx",
+        "--python=3.12",
+        "--from",
+        "mcp-server-y@latest",
+        "python",
+    ]
+    assert resolved is not None
+    assert resolved.command == str(tmp_path / "mcp-server-y")
+    assert resolved.args == ["--db", "x.db"]
+
+
+@pytest.mark.skipif(shutil.which("npx") is None, reason="needs npx")
+def test_npx_resolves_local_package(tmp_path):
+    package = tmp_path / "fake-server"
+    package.mkdir()
+    (package / "package.json").write_text(
+        json.dumps({
+            "name": "fake-server",
+            "version": "1.0.0",
+            "bin": "main.js",
+        })
+    )
+    (package / "main.js").write_text("console.log(process.argv[2]);\n")
+    params = StdioServerParameters(
+        command="npx", args=["-y", "--offline", str(package), "hello"]
+    )
+    resolved = resolve_launch(params)
+
+    assert resolved is not None
+    assert resolved.args[1:] == ["hello"]
+    assert resolved.args[0].endswith("main.js")
+
+
+def test_resolved_params_fall_back_when_gone(tmp_path):
+    script = tmp_path / "server.js"
+    script.touch()
+    params = StdioServerParameters(
+        command="npx",
+        args=["-y", "server"],
+        env={"TOKEN": "1"},
+        resolved=ResolvedLaunch(
+            source="npx",
+            command="/usr/bin/node",
+            args=[str(script)],
+            env={"NODE_OPTIONS": "--no-warnings"},
+            paths=[str(script)],
+        ),
+    )
+    launched = resolved_params(params)
+    assert launched.command == "/usr/bin/node"
+    assert launched.env == {"TOKEN": "1", "NODE_OPTIONS": "--no-warnings"}
+
+    script.unlink()
+    assert resolved_params(params) is params
+
+
+def test_stdio_launches_resolved_command(data_dir, tmp_path):
+    server = str(data_dir / "tool_server.py")
+    params = StdioServerParameters(
+        command="no-such-package-manager",
+        resolved=ResolvedLaunch(
+            source="uvx",
+            command=sys.executable,
+            args=[server],
+            paths=[sys.executable, server],
+        ),
+    )
+    tools = asyncio.run(stdio.list_tools(params))
+    assert {tool.name for tool in tools} >= {"add", "pid"}
@@ -0,0 +1,63 @@
+import asyncio
+import sys
+import time
+
+import pytest
+
+from llm_mcp.schema import ServerConfig, StdioServerParameters
+from llm_mcp.transport import pool, resources
+
+
+@pytest.fixture
+def config(data_dir):
+    script = data_dir / "resource_server.py"
+    yield ServerConfig(
+        name="resources",
+        parameters=StdioServerParameters(
+            command=sys.executable, args=[str(script)]
+        ),
+    )
+    pool.close_all()
+    resources.clear_cache()
+
+
+def _text(contents) -> str:
+    (content,) = contents
+    return content.text
+
+
+def test_list_resources(config):
+    found = resources.list_resources_sync(config)
+    assert [str(r.uri) for r in found] == ["memo://counter", "memo://static"]
+    assert pool.sessions() == ["resources"]
+
+
+def test_subscribed_reads_are_cached_until_updated(config):
+    read = resources.read_resource_sync
+    assert _text(read(config, "memo://counter")).endswith("read 1 times")
+    assert _text(read(config, "memo://counter")).endswith("read 1 times")
+    assert resources.cache_stats()["entries"] == 1
+
+    # the server announces an update after subscribing
+    deadline = time.monotonic() + 5
+    while resources.cache_stats()["entries"] and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert _text(read(config, "memo://counter")).endswith("read 2 times")
+
+
+def test_unsubscribable_reads_are_not_cached(config):
+    read = resources.read_resource_sync
+    assert _text(read(config, "memo://static")).endswith("read 1 times")
+    assert _text(read(config, "memo://static")).endswith("read 2 times")
+    assert resources.cache_stats()["entries"] == 0
+
+
+def test_async_read_and_close_invalidates(config):
+    async def _read() -> str:
+        return _text(await resources.read_resource(config, "memo://counter"))
+
+    assert asyncio.run(_read()).endswith("read 1 times")
+    assert resources.cache_stats()["entries"] == 1
+    pool.close_all()
+    assert resources.cache_stats()["entries"] == 0
+    assert pool.sessions() == []
@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+from llm_mcp.transport import scheduler
+from llm_mcp.transport.scheduler import Overloaded, Scheduler
+
+
+async def _occupy(sched: Scheduler, release: asyncio.Event) -> None:
+    async with sched.slot("normal", "holder"):
+        await release.wait()
+
+
+async def _record(sched, order, priority, caller, label=None) -> None:
+    async with sched.slot(priority, caller):
+        order.append(label or caller)
+
+
+def test_higher_priority_runs_first():
+    sched = Scheduler("demo", max_in_flight=1, max_queued=10)
+    order: list[str] = []
+
+    async def _run() -> None:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_occupy(sched, release))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(_record(sched, order, p, p))
+            for p in ("batch", "normal", "interactive")
+        ]
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *waiters)
+
+    asyncio.run(_run())
+    assert order == ["interactive", "normal", "batch"]
+    assert sched.stats()["active"] == 0
+
+
+def test_callers_share_a_priority_fairly():
+    sched = Scheduler("demo", max_in_flight=1, max_queued=10)
+    order: list[str] = []
+
+    async def _run() -> None:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_occupy(sched, release))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.create_task(_record(sched, order, "batch", "bulk"))
+            for _ in range(3)
+        ]
+        waiters.append(
+            asyncio.create_task(_record(sched, order, "batch", "small"))
+        )
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *waiters)
+
+    asyncio.run(_run())
+    assert order == ["bulk", "small", "bulk", "bulk"]
+
+
+def test_async_callers_take_turns(monkeypatch):
+    sched = Scheduler("demo", max_in_flight=1, max_queued=10)
+    monkeypatch.setattr(scheduler, "get_scheduler", lambda name: sched)
+    order: list[str] = []
+
+    async def call(label: str) -> None:
+        # no caller given: each task is a caller of its own
+        async with scheduler.scheduled("demo", "normal"):
+            order.append(label)
+
+    async def bulk() -> None:
+        # fanned out calls stay one caller's
+        with scheduler.acting_as("bulk"):
+            await asyncio.gather(*(call("bulk") for _ in range(3)))
+
+    async def _run() -> None:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_occupy(sched, release))
+        await asyncio.sleep(0)
+        callers = [asyncio.create_task(bulk())]
+        await asyncio.sleep(0)
+        callers.append(asyncio.create_task(call("small")))
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, *callers)
+
+    asyncio.run(_run())
+    assert order == ["bulk", "small", "bulk", "bulk"]
+
+
+def test_async_callers_are_told_apart():
+    async def _caller() -> str:
+        return scheduler.current_caller()
+
+    async def _run() -> list[str]:
+        return await asyncio.gather(_caller(), _caller())
+
+    first, second = asyncio.run(_run())
+    assert first.startswith("task-") and second.startswith("task-")
+    assert first != second
+    assert scheduler.current_caller().startswith("thread-")
+    with scheduler.acting_as("report"):
+        assert scheduler.current_caller() == "report"
+        assert asyncio.run(_caller()) == "report"
+
+
+def test_full_queue_is_rejected_fast():
+    sched = Scheduler("demo", max_in_flight=1, max_queued=1)
+
+    async def _run() -> None:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_occupy(sched, release))
+        await asyncio.sleep(0)
+        queued = asyncio.create_task(sched.acquire("batch", "a"))
+        await asyncio.sleep(0)
+        with pytest.raises(Overloaded, match="1 batch calls already queued"):
+            await sched.acquire("batch", "b")
+        # other classes have queues of their own
+        interactive = asyncio.create_task(sched.acquire("interactive", "c"))
+        await asyncio.sleep(0)
+        assert sched.stats()["queued"] == {
+            "interactive": 1,
+            "normal": 0,
+            "batch": 1,
+        }
+        queued.cancel()
+        release.set()
+        await holder
+        await interactive
+        sched.release()
+
+    asyncio.run(_run())
+    assert sched.stats() == {
+        "active": 0,
+        "queued": {"interactive": 0, "normal": 0, "batch": 0},
+        "rejected": 1,
+    }
+
+
+def test_cancelled_waiter_frees_its_slot():
+    sched = Scheduler("demo", max_in_flight=1, max_queued=5)
+
+    async def _run() -> None:
+        release = asyncio.Event()
+        holder = asyncio.create_task(_occupy(sched, release))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(sched.acquire("normal", "a"))
+        await asyncio.sleep(0)
+        release.set()
+        await holder
+        # the slot was granted to the waiter, which is cancelled right away
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(sched.acquire("normal", "b"), 1)
+        sched.release()
+
+    asyncio.run(_run())
+    assert sched.stats()["active"] == 0
+
+
+def test_default_priority_from_env(monkeypatch):
+    assert scheduler.default_priority() == "normal"
+    monkeypatch.setenv(scheduler.PRIORITY_ENV_VAR, "batch")
+    assert scheduler.default_priority() == "batch"
+    monkeypatch.setenv(scheduler.PRIORITY_ENV_VAR, "urgent")
+    with pytest.raises(ValueError, match="LLM_MCP_PRIORITY"):
+        scheduler.default_priority()
+
+
+def test_configure_replaces_schedulers():
+    first = scheduler.get_scheduler("demo")
+    assert scheduler.get_scheduler("demo") is first
+    scheduler.configure(max_in_flight=4)
+    try:
+        assert scheduler.get_scheduler("demo").max_in_flight == 4
+        assert "demo" in scheduler.stats()
+    finally:
+        scheduler.configure(max_in_flight=32)
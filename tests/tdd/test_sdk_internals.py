@@ -0,0 +1,53 @@
+import asyncio
+
+import anyio
+import pytest
+from mcp import types
+from mcp.client.session import ClientSession
+from mcp.shared.exceptions import McpError
+from mcp.shared.message import SessionMessage
+
+from llm_mcp.transport import sdk_internals
+
+
+@pytest.mark.asyncio
+async def test_next_request_id_is_the_id_sent():
+    to_client, client_reads = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](1)
+    client_writes, sent = anyio.create_memory_object_stream[SessionMessage](1)
+    async with (
+        to_client,
+        sent,
+        ClientSession(client_reads, client_writes) as session,
+    ):
+        for _ in range(2):
+            predicted = sdk_internals.next_request_id(session)
+            assert predicted is not None
+            with anyio.move_on_after(0.5):
+                await session.send_ping()
+            message = await sent.receive()
+            assert message.message.root.id == predicted
+
+
+@pytest.mark.asyncio
+async def test_fail_pending_answers_waiting_requests():
+    to_client, client_reads = anyio.create_memory_object_stream[
+        SessionMessage | Exception
+    ](1)
+    client_writes, sent = anyio.create_memory_object_stream[SessionMessage](1)
+    error = types.ErrorData(code=-32000, message="server exited")
+    async with (
+        to_client,
+        sent,
+        ClientSession(client_reads, client_writes) as session,
+    ):
+
+        async def server_dies() -> None:
+            await sent.receive()  # the ping is waiting for an answer
+            sdk_internals.fail_pending(session, error)
+
+        dying = asyncio.create_task(server_dies())
+        with anyio.fail_after(5), pytest.raises(McpError, match="exited"):
+            await session.send_ping()
+        await dying
@@ -0,0 +1,92 @@
+import sys
+
+import pytest
+from mcp.shared.memory import create_connected_server_and_client_session
+
+from llm_mcp import serve, store
+from llm_mcp.schema import ServerConfig, StdioServerParameters
+from llm_mcp.transport import dispatch, pool
+
+
+@pytest.fixture
+def servers(data_dir, llm_user_dir):
+    params = StdioServerParameters(
+        command=sys.executable, args=[str(data_dir / "tool_server.py")]
+    )
+    tools = dispatch.list_tools_sync(params)
+    for name in ("calc", "calc2"):
+        store.save_server(
+            ServerConfig(name=name, parameters=params, tools=tools)
+        )
+    yield
+    for name in ("calc", "calc2", "calc3"):
+        store.remove_server(name)
+    pool.close_all()
+
+
+def _text(result) -> str:
+    (content,) = result.content
+    return content.text
+
+
+@pytest.mark.asyncio
+async def test_tools_are_namespaced(servers):
+    aggregator = serve.Aggregator(["calc", "calc2"])
+    async with create_connected_server_and_client_session(
+        aggregator.server
+    ) as client:
+        names = [tool.name for tool in (await client.list_tools()).tools]
+        assert names == [
+            "calc__add",
+            "calc__pid",
+            "calc__fail",
+            "calc2__add",
+            "calc2__pid",
+            "calc2__fail",
+        ]
+        result = await client.call_tool("calc__add", {"a": 2, "b": 3})
+        assert _text(result) == "5"
+
+        result = await client.call_tool("calc__fail", {"message": "boom"})
+        assert result.isError
+        assert "boom" in _text(result)
+
+        result = await client.call_tool("nope__add", {"a": 1, "b": 1})
+        assert result.isError
+        assert _text(result) == "Unknown tool: 'nope__add'"
+
+
+@pytest.mark.asyncio
+async def test_clients_share_backend_sessions(servers):
+    aggregator = serve.Aggregator(["calc"])
+    pids = []
+    for _ in range(2):
+        async with create_connected_server_and_client_session(
+            aggregator.server
+        ) as client:
+            pids.append(_text(await client.call_tool("calc__pid", {})))
+    assert pids[0] == pids[1]
+    assert pool.sessions() == ["calc"]
+
+
+@pytest.mark.asyncio
+async def test_closing_releases_backend_sessions(servers):
+    aggregator = serve.Aggregator(["calc", "calc2"])
+    await aggregator.call_tool("calc__add", {"a": 1, "b": 2})
+    assert pool.sessions() == ["calc"]
+    await aggregator.aclose()
+    assert pool.sessions() == []
+
+
+def test_tool_list_follows_manifests(servers):
+    aggregator = serve.Aggregator()
+    assert len(aggregator.tools()) == 6
+    config = store.load_server("calc")
+    store.save_server(config.model_copy(update={"name": "calc3"}))
+    assert len(aggregator.tools()) == 9
+    assert aggregator.route("calc3__add")[1] == "add"
+
+
+def test_single_server_keeps_tool_names(servers):
+    aggregator = serve.Aggregator(["calc"], namespaced=False)
+    assert [t.name for t in aggregator.tools()] == ["add", "pid", "fail"]
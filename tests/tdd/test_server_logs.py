@@ -0,0 +1,87 @@
+import sys
+import time
+
+import pytest
+from click.testing import CliRunner
+from mcp.shared.exceptions import McpError
+
+from llm_mcp import store
+from llm_mcp.bridge import SessionPool
+from llm_mcp.cli import mcp
+from llm_mcp.schema import ServerConfig, StdioServerParameters
+from llm_mcp.transport import dispatch, server_logs, stdio
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="stderr is inherited on Windows"
+)
+
+
+@pytest.fixture
+def noisy(data_dir):
+    params = StdioServerParameters(
+        command=sys.executable, args=[str(data_dir / "noisy_server.py")]
+    )
+    return ServerConfig(name="noisy", parameters=params)
+
+
+def _wait_for(check, seconds: float = 10) -> bool:
+    stop = time.monotonic() + seconds
+    while time.monotonic() < stop:
+        if check():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def test_flood_is_drained_into_a_bounded_buffer(noisy):
+    # far more than a pipe buffer: an undrained pipe would stall the server
+    result = stdio.call_tool_sync(
+        noisy.parameters, "shout", {"lines": 20_000}, timeout=30
+    )
+    assert result == "ok"
+
+    label = noisy.parameters.command
+    assert _wait_for(
+        lambda: server_logs.tail(label, 1)[0].startswith("line 19999 ")
+    )
+    assert len(server_logs.tail(label)) == 500
+
+
+def test_crashed_server_fails_the_call_with_its_stderr(noisy):
+    start = time.monotonic()
+    with pytest.raises(McpError, match="disk on fire") as raised:
+        dispatch.call_tool_sync(noisy, "crash", {}, timeout=30)
+    assert time.monotonic() - start < 10
+    assert "server process exited" in str(raised.value)
+    assert server_logs.tail("noisy", 1) == ["fatal: disk on fire"]
+
+
+@pytest.mark.asyncio
+async def test_pool_replaces_a_crashed_server(noisy):
+    pool = SessionPool(noisy, size=1)
+    try:
+        with pytest.raises(McpError, match="disk on fire"):
+            await pool.call_tool("crash")
+        result = await pool.call_tool("shout", {"lines": 1})
+        assert result.content[0].text == "ok"
+    finally:
+        await pool.aclose()
+
+
+def test_log_files_and_cli(noisy, llm_user_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv(server_logs.LOGS_ENV_VAR, str(tmp_path / "logs"))
+    store.save_server(noisy)
+    runner = CliRunner()
+    result = runner.invoke(mcp, ["servers", "logs", "noisy"])
+    assert "No logs of 'noisy'" in result.output
+
+    assert dispatch.call_tool_sync(noisy, "shout", {"lines": 3}) == "ok"
+    log = tmp_path / "logs" / "noisy.log"
+    assert _wait_for(lambda: log.exists() and "line 2 " in log.read_text())
+
+    result = runner.invoke(mcp, ["servers", "logs", "noisy", "-n", "2"])
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert len(lines) == 2
+    assert "line 1 " in lines[0]
+    assert "line 2 " in lines[1]
@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from llm_mcp.schema import OutputShaping
+from llm_mcp.utils import shape_output
+from llm_mcp.utils.shape_output import SPILL_DIR_ENV_VAR
+
+
+def _size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False).encode())
+
+
+def test_small_results_pass_through():
+    result = {"rows": [1, 2, 3]}
+    assert shape_output(result, OutputShaping(max_bytes=1000)) is result
+    assert shape_output(result, OutputShaping()) is result
+
+
+def test_json_structure_is_kept():
+    result = {
+        "total": 5000,
+        "rows": [{"id": i, "text": "x" * 500} for i in range(5000)],
+    }
+    shaped = shape_output(result, OutputShaping(max_tokens=1000))
+    assert _size(shaped) <= 4000
+    assert shaped["total"] == 5000
+    assert shaped["rows"][0]["id"] == 0
+    assert shaped["rows"][0]["text"].startswith("xxx")
+    assert "more characters]" in shaped["rows"][0]["text"]
+    assert shaped["rows"][-1].endswith("more items]")
+    assert shaped["_shaped"].startswith("result trimmed from")
+
+
+def test_text_is_cut_with_a_note():
+    shaped = shape_output("y" * 10_000, OutputShaping(max_bytes=1000))
+    assert len(shaped.encode()) <= 1000
+    assert shaped.endswith("to fit a 1000 byte budget]")
+
+
+def test_spill_keeps_the_full_result(tmp_path, monkeypatch):
+    monkeypatch.setenv(SPILL_DIR_ENV_VAR, str(tmp_path))
+    result = [{"n": i} for i in range(1000)]
+    shaped = shape_output(
+        result, OutputShaping(max_bytes=500, spill=True), label="srv.tool"
+    )
+    note = shaped[-1]["_shaped"]
+    (path,) = tmp_path.glob("srv.tool-*.json")
+    assert str(path) in note
+    assert json.loads(path.read_text()) == result
+
+
+def test_token_budget_uses_the_lower_limit():
+    assert OutputShaping(max_bytes=1000, max_tokens=100).budget == 400
+    assert OutputShaping(max_tokens=1000).budget == 4000
+    assert OutputShaping().budget is None
+    with pytest.raises(ValueError):
+        OutputShaping(max_bytes=10)
@@ -0,0 +1,90 @@
+import asyncio
+import sys
+import time
+
+import pytest
+from mcp.client.session import ClientSession
+
+from llm_mcp.schema import StdioServerParameters
+from llm_mcp.transport import stdio
+from llm_mcp.transport.stdio_framing import (
+    MAX_MESSAGE_ENV_VAR,
+    LineFramer,
+    MessageTooLarge,
+    buffered_stdio_client,
+)
+
+
+def test_frames_split_across_chunks():
+    framer = LineFramer(max_bytes=1024)
+    assert framer.feed(b'{"a"') == []
+    assert framer.feed(b': 1}\n{"b": 2}\n\n  \n{"c"') == [
+        b'{"a": 1}',
+        b'{"b": 2}',
+    ]
+    assert framer.feed(b": 3}\r\n") == [b'{"c": 3}\r']
+
+
+def test_oversized_message_is_dropped_once():
+    framer = LineFramer(max_bytes=8)
+    assert framer.feed(b"ok\n0123456") == [b"ok"]
+    assert framer.feed(b"789abc") == []
+    assert framer.feed(b"defghijklmnop") == []
+    error, frame = framer.feed(b"end\nnext\n")
+    assert isinstance(error, MessageTooLarge)
+    assert error.request_id is None
+    assert frame == b"next"
+
+
+def test_limit_applies_within_one_read():
+    framer = LineFramer(max_bytes=16)
+    error, frame = framer.feed(
+        b'{"jsonrpc": "2.0", "id": 7, "result": {}}\nok\n'
+    )
+    assert isinstance(error, MessageTooLarge)
+    assert error.request_id == 7
+    assert frame == b"ok"
+
+
+def test_request_id_of_dropped_response_is_found_at_either_end():
+    framer = LineFramer(max_bytes=16)
+    body = b'"' + b"x" * 1000 + b'"'
+    assert framer.feed(b'{"result": ' + body[:500]) == []
+    assert framer.feed(body[500:] + b', "jsonrpc": "2.0", "id": "a"}') == []
+    (error,) = framer.feed(b"\n")
+    assert isinstance(error, MessageTooLarge)
+    assert error.request_id == "a"
+
+
+def test_buffered_client_talks_to_a_server(data_dir):
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(data_dir / "resource_server.py")],
+        framing="buffered",
+    )
+
+    async def _run() -> list[str]:
+        async with (
+            buffered_stdio_client(params) as (read, write),
+            ClientSession(read, write) as session,
+        ):
+            await session.initialize()
+            result = await session.list_resources()
+            return [str(r.uri) for r in result.resources]
+
+    assert asyncio.run(_run()) == ["memo://counter", "memo://static"]
+
+
+def test_oversized_response_fails_its_call(data_dir, monkeypatch):
+    monkeypatch.setenv(MAX_MESSAGE_ENV_VAR, "2000")
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(data_dir / "image_server.py")],
+        framing="buffered",
+    )
+    start = time.monotonic()
+    with pytest.raises(MessageTooLarge, match="exceeds 2000 bytes"):
+        asyncio.run(
+            stdio.call_tool(params, "blob", {"size": 3_000_000}, timeout=30)
+        )
+    assert time.monotonic() - start < 20
@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+import pytest
+
+from llm_mcp import tracing
+from llm_mcp.transport import bg_runner
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    path = tmp_path / "trace.json"
+    tracing.clear()
+    tracing.enable(path)
+    yield path
+    tracing.disable()
+    tracing.clear()
+
+
+async def _work(name: str) -> str:
+    with tracing.span("stdio.call_tool", tool=name):
+        with tracing.span("session.call_tool"):
+            await asyncio.sleep(0.01)
+        return name
+
+
+def _events(path) -> list[dict]:
+    return json.loads(path.read_text())["traceEvents"]
+
+
+def test_disabled_span_is_noop():
+    assert not tracing.enabled()
+    assert tracing.span("x") is tracing.span("y")
+    assert tracing.flush() is None
+
+
+def test_nested_spans_share_a_lane(trace_path):
+    assert bg_runner.run_async(_work("a")) == "a"
+    assert tracing.flush() == trace_path
+
+    spans = {e["name"]: e for e in _events(trace_path) if e["ph"] == "X"}
+    assert set(spans) == {"run_async", "stdio.call_tool", "session.call_tool"}
+    assert len({e["tid"] for e in spans.values()}) == 1
+    outer, inner = spans["stdio.call_tool"], spans["session.call_tool"]
+    assert outer["ts"] <= inner["ts"]
+    assert inner["ts"] + inner["dur"] <= outer["ts"] + outer["dur"]
+    assert outer["args"]["tool"] == "a"
+
+
+def test_background_loop_queue_and_lanes(trace_path):
+    async def _blocking(name: str) -> str:
+        # a running loop routes run_async to the shared background loop
+        return bg_runner.run_async(_work(name))
+
+    async def _concurrent() -> list[str]:
+        loop = asyncio.get_running_loop()
+        return await asyncio.gather(*[
+            loop.run_in_executor(None, asyncio.run, _blocking(n))
+            for n in "abc"
+        ])
+
+    assert asyncio.run(_concurrent()) == ["a", "b", "c"]
+    tracing.flush()
+
+    events = _events(trace_path)
+    queued = [e for e in events if e["name"] == "bg_runner.queue"]
+    calls = [e for e in events if e["name"] == "stdio.call_tool"]
+    assert len(queued) == len(calls) == 3
+    assert len({e["tid"] for e in calls}) == 3
+    assert all(e["args"]["thread"] == "llm-mcp-bg" for e in calls)
+
+
+def test_errors_are_annotated(trace_path):
+    with pytest.raises(KeyError), tracing.span("convert_content"):
+        raise KeyError("boom")
+    tracing.flush()
+    (event,) = [e for e in _events(trace_path) if e["ph"] == "X"]
+    assert event["args"]["error"] == "KeyError"
@@ -1,11 +1,21 @@
+import asyncio
 import base64
+import importlib
+import json
+import threading
 from datetime import timedelta
 from types import SimpleNamespace
 
 import pytest
 
 from llm_mcp.schema import RemoteServerParameters, StdioServerParameters
-from llm_mcp.utils import convert_content, generate_server_name, parse_params
+from llm_mcp.utils import (
+    configure_offload,
+    convert_content,
+    convert_content_async,
+    generate_server_name,
+    parse_params,
+)
 
 
 def test_as_kwargs_timedelta_conversion():
@@ -192,3 +202,69 @@ def test_embedded_blob():
     raw = b"data-bytes"
     part = DummyEmbeddedResource(DummyBlobResourceContents(raw))
     assert convert_content(part) == raw
+
+
+# --------------------------------------------------------------------------- #
+# Tests - decoding large payloads off the event-loop                         #
+# --------------------------------------------------------------------------- #
+
+
+@pytest.fixture
+def decode_threads(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Record the thread each JSON payload is decoded on."""
+    module = importlib.import_module("llm_mcp.utils.convert_content")
+    threads: list[str] = []
+
+    for decoders in (module._INLINE, module._SLICED):
+
+        def _recording(text: str, _decode=decoders["json"]):
+            threads.append(threading.current_thread().name)
+            return _decode(text)
+
+        monkeypatch.setitem(decoders, "json", _recording)
+
+    yield threads
+    configure_offload(thread_bytes=256 * 1024, process_bytes=0)
+
+
+def test_small_payload_decoded_inline(decode_threads):
+    part = SimpleNamespace(text='{"answer": 42}')
+    assert asyncio.run(convert_content_async(part)) == {"answer": 42}
+    assert decode_threads == ["MainThread"]
+
+
+def test_large_payload_decoded_in_thread_pool(decode_threads):
+    configure_offload(thread_bytes=1024)
+    data = {"items": list(range(1000))}
+    part = SimpleNamespace(text=json.dumps(data))
+    assert asyncio.run(convert_content_async(part)) == data
+    assert decode_threads[0].startswith("llm-mcp-decode")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '[1, {"a": [2, 3]}, "x", null]',
+        ' { "a" : 1 , "b" : {"c": []}, "a": 2 } ',
+        "[]",
+        "{}",
+        "42",
+        "[1, 2,]",
+        '{"a" 1}',
+        "[1] trailing",
+        "not json",
+    ],
+)
+def test_sliced_json_matches_inline(text: str):
+    module = importlib.import_module("llm_mcp.utils.convert_content")
+    assert module._decode_text_sliced(text) == module._decode_text(text)
+
+
+def test_large_blob_decoded_in_process_pool():
+    configure_offload(thread_bytes=16, process_bytes=16)
+    try:
+        raw = b"x" * 64
+        part = DummyEmbeddedResource(DummyBlobResourceContents(raw))
+        assert asyncio.run(convert_content_async(part)) == raw
+    finally:
+        configure_offload(thread_bytes=256 * 1024, process_bytes=0)
@@ -0,0 +1,64 @@
+import pytest
+from mcp import types
+
+from llm_mcp.schema import ServerConfig, StdioServerParameters
+from llm_mcp.transport import convert_tool, dispatch
+from llm_mcp.utils import InvalidArguments, compile_validator
+
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "path": {"type": "string"},
+        "lines": {"type": "integer", "minimum": 1},
+        "tags": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["path"],
+    "additionalProperties": False,
+}
+
+
+def test_valid_arguments_pass():
+    validate = compile_validator("read_file", SCHEMA)
+    assert validate is not None
+    validate({"path": "a.txt", "lines": 3, "tags": ["x"]})
+
+
+def test_invalid_arguments_explain_what_to_fix():
+    validate = compile_validator("read_file", SCHEMA)
+    with pytest.raises(InvalidArguments) as e:
+        validate({"lines": 0, "tags": ["x", 2]})
+    message = str(e.value)
+    assert message.startswith("Invalid arguments for tool 'read_file':")
+    assert "- arguments: 'path' is a required property" in message
+    assert "- arguments.lines: 0 is less than the minimum of 1" in message
+    assert "- arguments.tags[1]: 2 is not of type 'string'" in message
+    assert message.endswith("Fix the arguments and call the tool again.")
+
+
+def test_nothing_to_validate():
+    assert compile_validator("t", {}) is None
+    assert compile_validator("t", None) is None
+    # a broken schema is left for the server to judge
+    assert compile_validator("t", {"type": "not-a-type"}) is None
+
+
+def test_convert_tool_rejects_before_calling(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        dispatch,
+        "call_tool_sync",
+        lambda *args, **_: calls.append(args) or "ok",
+    )
+    config = ServerConfig(
+        name="files", parameters=StdioServerParameters(command="files")
+    )
+    tool = convert_tool(
+        config,
+        types.Tool(name="read_file", inputSchema=SCHEMA),
+    )
+    with pytest.raises(InvalidArguments):
+        tool.implementation(path=1)
+    assert calls == []
+
+    assert tool.implementation(path="a.txt") == "ok"
+    assert calls == [(config, "read_file", {"path": "a.txt"})]